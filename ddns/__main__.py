@@ -4,33 +4,60 @@ DDNS
 @author: NewFuture, rufengsuixing
 """
 
+import signal
 import sys
 from io import TextIOWrapper
-from logging import getLogger
+from json import dumps as jsonencode
+from logging import basicConfig, getLogger
+from multiprocessing import Process, Queue
+from os import path
 from subprocess import check_output
+from tempfile import gettempdir
+from time import localtime, strftime, time
+
+try:  # python 3
+    from queue import Empty
+    from urllib.parse import urlsplit
+except ImportError:  # python 2
+    from Queue import Empty  # type: ignore[no-redef]
+    from urlparse import urlsplit  # type: ignore[no-redef]
 
 from . import ip
 from .__init__ import __description__, __version__, build_date
-from .cache import Cache
+from .cache import Cache, clear_failure, failure_key, get_backoff, record_failure
 from .config import Config, load_configs  # noqa: F401
 from .provider import SimpleProvider, get_provider_class  # noqa: F401
+from .util import metrics
+from .util.fileio import write_file_safely
+from .util.lock import FileLock
+from .util.pool import parallel_map
+from .util.profiler import profile_call
+from .util.timing import Stats, collect, current, monotonic, phase
 
 logger = getLogger()
 
+# 工作进程超过截止时间后, 父进程再等待的秒数, 之后强制终止
+WORKER_GRACE = 5
+
 
 class UpdateCancelled(Exception):
     """Raised when a caller cancels an in-progress DDNS update."""
 
+    def __init__(self, message="DDNS update cancelled.", skipped=()):
+        # type: (str, Iterable[tuple[str, str]]) -> None
+        super(UpdateCancelled, self).__init__(message)
+        self.skipped = list(skipped)  # type: list[tuple[str, str]] # 未更新的 (域名, 记录类型)
 
-def _raise_if_cancelled(cancelled):
-    # type: (object | None) -> None
+
+def _raise_if_cancelled(cancelled, skipped=()):
+    # type: (object | None, Iterable[tuple[str, str]]) -> None
     if cancelled is not None and cancelled():
-        raise UpdateCancelled("DDNS update cancelled.")
+        raise UpdateCancelled("DDNS update cancelled.", skipped)
 
 
-def _get_ip_from_rule(ip_type, rule):
+def _get_ip_from_rule(ip_type, rule, ssl=None):
     """
-    Resolve an IP address from a single rule.
+    Resolve an IP address from a single rule; `ssl` applies to public/url lookups.
     """
     rule_text = str(rule)
     if rule_text.isdigit():
@@ -40,13 +67,27 @@ def _get_ip_from_rule(ip_type, rule):
     if rule_text.startswith("shell:"):
         return str(check_output(rule_text[6:], shell=True).strip().decode("utf-8"))
     if rule_text.startswith("url:"):
-        return getattr(ip, "public_v" + ip_type)(rule_text[4:])
+        return getattr(ip, "public_v" + ip_type)(rule_text[4:], verify=ssl)
     if rule_text.startswith("regex:"):
         return getattr(ip, "regex_v" + ip_type)(rule_text[6:])
+    if rule_text == "public":
+        return getattr(ip, "public_v" + ip_type)(verify=ssl)
     return getattr(ip, rule_text + "_v" + ip_type)()
 
 
-def get_ip(ip_type, rules, cancelled=None):
+def _rule_label(rule):
+    # type: (str) -> str
+    """指标中的规则名, 命令与 URL 只保留类型与主机, 不暴露参数或凭据"""
+    text = str(rule)
+    kind = text.split(":", 1)[0]
+    if kind in ("cmd", "shell", "regex"):
+        return kind
+    if kind == "url":
+        return "url:" + (urlsplit(text[4:]).hostname or "")
+    return text
+
+
+def get_ip(ip_type, rules, cancelled=None, ssl=None):
     """
     get IP address
     """
@@ -54,12 +95,17 @@ def get_ip(ip_type, rules, cancelled=None):
         return False
     for rule in rules:
         _raise_if_cancelled(cancelled)
+        start = monotonic()
         try:
             logger.debug("get_ip:(%s, %s)", ip_type, rule)
-            result = _get_ip_from_rule(ip_type, rule)
+            with phase("ip:v{}:{}".format(ip_type, _rule_label(rule))):
+                result = _get_ip_from_rule(ip_type, rule, ssl)
         except Exception as e:
             logger.error("Failed to get %s address: %s", ip_type, e)
             continue
+        finally:
+            labels = {"family": "ipv" + ip_type, "rule": _rule_label(rule)}
+            metrics.observe("ddns_ip_detection_duration_seconds", labels, monotonic() - start)
 
         _raise_if_cancelled(cancelled)
         if result:
@@ -69,44 +115,163 @@ def get_ip(ip_type, rules, cancelled=None):
     return None
 
 
+def _extra_int(extra, name, default):
+    # type: (dict, str, int) -> int
+    """从 extra 中取出整数选项, 无效值记录警告并使用默认值"""
+    value = extra.pop(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        logger.warning("Invalid extra.%s value %r, using %s", name, value, default)
+        return default
+
+
+def _pending_domains(cache, domains, record_type, address, config, stats):
+    # type: (Cache | None, list[str], str, str, Config, Stats | None) -> tuple[list[str], bool]
+    """
+    过滤掉缓存命中与仍在退避期的域名
+
+    Returns:
+        tuple[list[str], bool]: (待更新的域名, 是否有缓存命中)
+    """
+    pending = []  # type: list[str]
+    cached = False
+    for domain in domains:
+        domain = domain.lower()
+        cache_key = "{}:{}".format(domain, record_type)
+        hit = bool(cache) and cache.get(cache_key) == address
+        if cache is not None:
+            metrics.inc("ddns_cache_lookups_total", {"provider": config.dns, "result": "hit" if hit else "miss"})
+        if hit:
+            logger.info("%s[%s] address not changed, using cache: %s", domain, record_type, address)
+            if stats:
+                stats.note(_domain_key(domain, record_type), cache="hit", result="cached")
+            cached = True
+            continue
+        if stats:
+            stats.note(_domain_key(domain, record_type), cache="miss" if cache is not None else "disabled")
+
+        backoff = None
+        if isinstance(cache, dict):
+            # 退避只针对失败时的地址, 公网地址变化后立即重试
+            backoff = get_backoff(cache, failure_key(config.dns, domain, record_type), address=address)
+        if backoff:
+            logger.warning(
+                "Skip %s[%s] after %d consecutive failures, next retry at %s",
+                domain,
+                record_type,
+                backoff["failures"],
+                strftime("%Y-%m-%d %H:%M:%S", localtime(backoff["retry_at"])),
+            )
+            if stats:
+                stats.note(_domain_key(domain, record_type), result="backoff")
+            continue
+        pending.append(domain)
+    return pending, cached
+
+
+def _apply_batch(dns, batch, address, record_type, config, extra, stats, cancelled=None):
+    # type: (SimpleProvider, list[str], str, str, Config, dict, Stats | None, object | None) -> dict[str, bool] | None
+    """
+    提交一批域名的更新, 批量服务商走 set_records; 已取消时返回 None, 剩余域名记为跳过
+    """
+    if cancelled is not None and cancelled():
+        return None
+    results = {}  # type: dict[str, bool]
+    try:
+        with collect(stats, [_domain_key(domain, record_type) for domain in batch]), phase("set_record"):
+            if len(batch) > 1:
+                results = dns.set_records(
+                    batch, address, record_type=record_type, ttl=config.ttl, line=config.line, **extra
+                )
+            else:
+                results[batch[0]] = dns.set_record(
+                    batch[0], address, record_type=record_type, ttl=config.ttl, line=config.line, **extra
+                )
+    except Exception as e:
+        logger.exception("Failed to update %s record for %s: %s", record_type, ",".join(batch), e)
+    return results
+
+
+def _record_results(cache, batch, results, record_type, address, config, stats):
+    # type: (Cache | None, list[str], dict[str, bool], str, str, Config, Stats | None) -> bool
+    """
+    记录一批更新的结果: 成功写入缓存并清除失败记录, 失败则累计退避
+
+    Returns:
+        bool: 是否有域名更新成功
+    """
+    ip_type = "4" if record_type == "A" else "6"
+    success = False
+    for domain in batch:
+        result = results.get(domain, False)
+        if stats:
+            stats.note(_domain_key(domain, record_type), result="updated" if result else "failed")
+        if result:
+            logger.warning("set %s[IPv%s]: %s successfully.", domain, ip_type, address)
+            success = True
+        elif results:
+            logger.error("Failed to update %s record for %s", record_type, domain)
+
+        if isinstance(cache, dict):
+            backoff_key = failure_key(config.dns, domain, record_type)
+            if result:
+                cache["{}:{}".format(domain, record_type)] = address
+                clear_failure(cache, backoff_key)
+            else:
+                state = record_failure(cache, backoff_key, address=address)
+                logger.info("%s[%s] will be retried in %d seconds", domain, record_type, state["retry_at"] - time())
+    return success
+
+
 def update_ip(dns, cache, index_rule, domains, record_type, config, cancelled=None):
     # type: (SimpleProvider, Cache | None, list[str]|bool, list[str], str, Config, object | None) -> bool | None
     """
     更新IP并变更DNS记录
     """
-    _raise_if_cancelled(cancelled)
+    _raise_if_cancelled(cancelled, [(domain.lower(), record_type) for domain in domains])
     if not domains:
         return None
 
     ip_type = "4" if record_type == "A" else "6"
-    address = get_ip(ip_type, index_rule, cancelled=cancelled)
+    try:
+        address = get_ip(ip_type, index_rule, cancelled=cancelled, ssl=config.ssl)
+    except UpdateCancelled:
+        raise UpdateCancelled("DDNS update cancelled.", [(domain.lower(), record_type) for domain in domains])
     if not address:
         logger.error("Fail to get %s address!", ip_type)
         return False
 
-    update_success = False
+    stats = current()
+    pending, update_success = _pending_domains(cache, domains, record_type, address, config, stats)
 
-    for domain in domains:
-        _raise_if_cancelled(cancelled)
-        domain = domain.lower()
-        cache_key = "{}:{}".format(domain, record_type)
-        if cache and cache.get(cache_key) == address:
-            logger.info("%s[%s] address not changed, using cache: %s", domain, record_type, address)
+    # 支持批量更新的服务商 (如 dyndns2) 一次请求提交多个域名, extra.batch_size 可调低上限
+    extra = dict(config.extra)
+    batch_size = max(dns.batch_size, 1) if isinstance(dns, SimpleProvider) else 1
+    batch_size = max(min(_extra_int(extra, "batch_size", batch_size), batch_size), 1)
+    # extra.concurrency 开启多线程并发更新, 不超过服务商的 max_concurrency
+    max_concurrency = max(dns.max_concurrency, 1) if isinstance(dns, SimpleProvider) else 1
+    concurrency = max(min(_extra_int(extra, "concurrency", 1), max_concurrency), 1)
+    batches = [pending[start : start + batch_size] for start in range(0, len(pending), batch_size)]
+
+    def apply(batch):
+        # type: (list[str]) -> dict[str, bool] | None
+        return _apply_batch(dns, batch, address, record_type, config, extra, stats, cancelled)
+
+    if concurrency > 1 and len(batches) > 1:
+        logger.debug("Updating %d %s batches with %d workers", len(batches), record_type, concurrency)
+        outcomes = zip(batches, parallel_map(apply, batches, concurrency))
+    else:
+        outcomes = ((batch, apply(batch)) for batch in batches)  # 逐个执行, 保持日志与更新交替
+
+    skipped = []  # type: list[tuple[str, str]]
+    for batch, results in outcomes:
+        if results is None:
+            skipped.extend((domain, record_type) for domain in batch)
+        elif _record_results(cache, batch, results, record_type, address, config, stats):
             update_success = True
-        else:
-            try:
-                result = dns.set_record(
-                    domain, address, record_type=record_type, ttl=config.ttl, line=config.line, **config.extra
-                )
-                if result:
-                    logger.warning("set %s[IPv%s]: %s successfully.", domain, ip_type, address)
-                    update_success = True
-                    if isinstance(cache, dict):
-                        cache[cache_key] = address
-                else:
-                    logger.error("Failed to update %s record for %s", record_type, domain)
-            except Exception as e:
-                logger.exception("Failed to update %s record for %s: %s", record_type, domain, e)
+    if skipped:
+        raise UpdateCancelled("DDNS update cancelled.", skipped)
     _raise_if_cancelled(cancelled)
     return update_success
 
@@ -116,22 +281,316 @@ def run(config, cancelled=None):
     """
     Run the DDNS update process
     """
-    # 设置IP模块的SSL验证配置
-    ip.ssl_verify = config.ssl
-
     # dns provider class
     provider_class = get_provider_class(config.dns)
+    with phase("cache_load"):
+        cache = Cache.new(config.cache, config.md5(), logger, config.cache_max_age)
     dns = provider_class(
-        config.id, config.token, endpoint=config.endpoint, logger=logger, proxy=config.proxy, ssl=config.ssl
-    )
-    cache = Cache.new(config.cache, config.md5(), logger, config.cache_max_age)
-    return (
-        update_ip(dns, cache, config.index4, config.ipv4, "A", config, cancelled=cancelled) is not False
-        and update_ip(dns, cache, config.index6, config.ipv6, "AAAA", config, cancelled=cancelled) is not False
+        config.id,
+        config.token,
+        endpoint=config.endpoint,
+        logger=logger,
+        proxy=config.proxy,
+        ssl=config.ssl,
+        cache=cache,
+        name=config.dns,
     )
+    jobs = [(config.index4, config.ipv4, "A"), (config.index6, config.ipv6, "AAAA")]
+    start = monotonic()
+    result = "failed"
+    try:
+        for i, (index_rule, domains, record_type) in enumerate(jobs):
+            try:
+                if update_ip(dns, cache, index_rule, domains, record_type, config, cancelled=cancelled) is False:
+                    return False
+            except UpdateCancelled as e:
+                result = "cancelled"
+                for _, rest, rest_type in jobs[i + 1 :]:
+                    e.skipped.extend((domain.lower(), rest_type) for domain in rest)
+                raise
+        result = "succeeded"
+        return True
+    finally:
+        if cache is not None:
+            with phase("cache_sync"):
+                cache.sync()
+        metrics.observe("ddns_sync_duration_seconds", {"provider": config.dns, "result": result}, monotonic() - start)
+        if result == "succeeded":
+            metrics.set_gauge("ddns_sync_last_success_timestamp_seconds", {"provider": config.dns}, time())
+
+
+def _domain_key(domain, record_type):
+    # type: (str, str) -> str
+    return "{}[{}]".format(domain, record_type)
+
+
+def _config_domains(config):
+    # type: (Config) -> list[tuple[str, str]]
+    return [(d.lower(), "A") for d in config.ipv4] + [(d.lower(), "AAAA") for d in config.ipv6]
+
+
+def _format_skipped(skipped):
+    # type: (list[tuple[str, str]]) -> str
+    return ", ".join(_domain_key(domain, record_type) for domain, record_type in skipped) or "-"
+
+
+def config_lock(config):
+    # type: (Config) -> FileLock
+    """配置的进程间锁, CLI、定时任务与 Web 控制台的同步共用 / Inter-process lock of one config."""
+    return FileLock(path.join(gettempdir(), "ddns.{}.lock".format(config.md5())))
+
+
+def run_locked(config, cancelled=None, deadline=None, stats=None):
+    # type: (Config, object | None, float | None, Stats | None) -> bool
+    """
+    在配置锁内运行, 防止重叠运行重复更新并竞争缓存文件
+
+    Run one config while holding its inter-process lock. An overlapping run
+    exits immediately (or waits up to `lock_wait` seconds); when `cancelled`
+    fires the remaining domains are reported as skipped. Phase timings and
+    counters are collected into `stats` when given.
+
+    Returns:
+        bool: 是否成功; 被其他进程占用而跳过时视为成功
+    """
+    lock = config_lock(config)
+    wait = config.lock_wait
+    if deadline is not None:
+        wait = max(min(wait, deadline - time()), 0)
+    try:
+        acquired = lock.acquire(wait)
+    except (IOError, OSError) as e:
+        logger.error("Cannot open lock file %s: %s", lock.path, e)
+        return False
+    if not acquired:
+        skipped = _config_domains(config)
+        logger.warning(
+            "Another ddns process (pid %s) is running this configuration, skipped: %s",
+            lock.owner(),
+            _format_skipped(skipped),
+        )
+        for domain, record_type in skipped if stats else ():
+            stats.note(_domain_key(domain, record_type), result="locked")
+        return True
+    start = monotonic()
+    try:
+        with collect(stats):
+            return run(config, cancelled=cancelled)
+    except UpdateCancelled as e:
+        logger.error("Deadline reached, skipped: %s", _format_skipped(e.skipped))
+        for domain, record_type in e.skipped if stats else ():
+            stats.note(_domain_key(domain, record_type), result="skipped")
+        return False
+    finally:
+        lock.release()
+        if stats:
+            stats.info["duration"] = round(monotonic() - start, 3)
+
+
+def _deadline_checker(deadline):
+    # type: (float | None) -> object | None
+    return (lambda: time() >= deadline) if deadline else None
+
+
+def _run_shard(shard, results, timeout, deadline=None):
+    # type: (list[tuple[int, Config]], Queue, int, float | None) -> None
+    """
+    工作进程: 依次运行分配到的配置, 并通过队列返回 (序号, 结果, 统计)
+
+    Worker process entry: run the assigned configs one by one and report
+    (index, success, stats) for each over the results queue.
+    """
+    if not logger.handlers:  # spawn 启动的进程未继承日志配置
+        config = shard[0][1]
+        basicConfig(
+            level=config.log_level, format=config.log_format, datefmt=config.log_datefmt, filename=config.log_file
+        )
+    if timeout:
+        deadline = min(deadline or float("inf"), time() + timeout)
+    cancelled = _deadline_checker(deadline)
+    for index, config in shard:
+        logger.setLevel(config.log_level)
+        logger.info("Running configuration %d with DNS provider: %s", index + 1, config.dns)
+        stats = Stats(index=index + 1, dns=config.dns)
+        try:
+            success = run_locked(config, cancelled=cancelled, deadline=deadline, stats=stats)
+        except Exception as e:
+            logger.exception("Configuration %d crashed: %s", index + 1, e)
+            success = False
+        results.put((index, success, stats.to_dict()))
+
+
+def _collect_outcomes(results, processes, total, end):
+    # type: (Queue, list[Process], int, float) -> dict[int, tuple[bool, dict]]
+    """从结果队列收集各配置的 (结果, 统计), 直到全部返回、进程全部退出或到达截止时间"""
+    outcomes = {}  # type: dict[int, tuple[bool, dict]]
+    while len(outcomes) < total and time() < end:
+        try:
+            index, success, stats = results.get(timeout=0.5)
+            outcomes[index] = success, stats
+        except Empty:
+            if not any(process.is_alive() for process in processes):
+                break  # 所有进程已退出, 剩余配置未返回结果
+
+    # 进程退出后仍可能有结果留在队列中
+    while len(outcomes) < total:
+        try:
+            index, success, stats = results.get(timeout=0.1)
+            outcomes[index] = success, stats
+        except Empty:
+            break
+    return outcomes
+
+
+def run_workers(configs, workers, timeout=0, deadline=None, reports=None):
+    # type: (list[Config], int, int, float | None, list | None) -> list[bool]
+    """
+    将配置分片到多个进程中并行运行, 单个进程崩溃或超时不影响其他进程
+
+    Shard configs over `workers` processes. Each process owns its provider
+    instances and cache files; a crash or hang only fails its own configs.
+
+    Args:
+        configs (list[Config]): 配置列表
+        workers (int): 进程数
+        timeout (int): 每个进程的截止时间(秒), 0 表示不限制
+        deadline (float | None): 整体运行的截止时间戳
+        reports (list | None): 传入时按 configs 顺序填充每个配置的统计, 未完成的为 None
+
+    Returns:
+        list[bool]: 与 configs 顺序一致的运行结果, 未完成的配置视为失败
+    """
+    workers = max(1, min(workers, len(configs)))
+    indexed = list(enumerate(configs))
+    results = Queue()  # type: Queue
+    processes = [
+        Process(
+            target=_run_shard, args=(indexed[i::workers], results, timeout, deadline), name="ddns-worker-{}".format(i)
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.daemon = True
+        process.start()
+    logger.info("Running %d configurations in %d worker processes", len(configs), workers)
+
+    end = min(deadline or float("inf"), time() + timeout if timeout else float("inf")) + WORKER_GRACE
+    outcomes = _collect_outcomes(results, processes, len(configs), end)
+    for process in processes:
+        if process.is_alive():
+            logger.error("Worker %s exceeded its deadline, terminating", process.name)
+            process.terminate()
+        process.join()
+    for index in range(len(configs)):
+        if index not in outcomes:
+            logger.error("Configuration %d did not finish (worker crashed or timed out)", index + 1)
+    if reports is not None:
+        reports[:] = [outcomes.get(index, (False, None))[1] for index in range(len(configs))]
+    return [outcomes.get(index, (False, None))[0] for index in range(len(configs))]
+
+
+def write_report(configs, results, reports, started, duration):
+    # type: (list[Config], list[bool], list[dict | None], float, float) -> None
+    """
+    输出 JSON 运行报告: --report json 写到标准输出, --report-file 写入文件
+
+    Write the machine-readable run report with per-config and per-domain
+    phase timings, API call/retry counters and cache hits.
+    """
+    items = []
+    for i, config in enumerate(configs):
+        report = reports[i] if i < len(reports) and reports[i] else {"index": i + 1, "dns": config.dns}
+        items.append(dict(report, success=bool(results[i]) if i < len(results) else False))
+    document = {
+        "version": __version__,
+        "started": round(started, 3),
+        "duration": round(duration, 3),
+        "success": all(results),
+        "configs": items,
+    }
+    text = jsonencode(document, indent=2, sort_keys=True)
+    if configs[0].report_file:
+        if not write_file_safely(configs[0].report_file, text + "\n"):
+            logger.error("Failed to write report file: %s", configs[0].report_file)
+    if configs[0].report == "json":
+        sys.stdout.write(text + "\n")
+
+
+def _run_configs(configs, cancelled, deadline, report_enabled, reports):
+    # type: (list[Config], object | None, float | None, bool, list[dict | None]) -> list[bool]
+    """
+    依次或分片到工作进程运行全部配置, 按配置顺序返回结果并填充 reports
+    """
+    if len(configs) == 1:
+        # 单个配置，使用原有逻辑（向后兼容）
+        config = configs[0]
+        stats = Stats(index=1, dns=config.dns) if report_enabled else None
+        results = [run_locked(config, cancelled=cancelled, deadline=deadline, stats=stats)]
+        reports.append(stats and stats.to_dict())
+        return results
+    if configs[0].workers > 1:
+        # 多个配置，分片到多个进程并行运行
+        results = run_workers(configs, configs[0].workers, configs[0].worker_timeout, deadline, reports)
+        for i, success in enumerate(results):
+            if success:
+                logger.info("Configuration %d completed successfully", i + 1)
+            else:
+                logger.error("Configuration %d failed", i + 1)
+        return results
+
+    # 多个配置，使用新的批处理逻辑
+    results = []
+    for i, config in enumerate(configs):
+        # 如果log_level有值则设置setLevel
+        if hasattr(config, "log_level") and config.log_level:
+            logger.setLevel(config.log_level)
+        logger.info("Running configuration %d/%d", i + 1, len(configs))
+        # 记录当前provider
+        logger.info("Using DNS provider: %s", config.dns)
+        stats = Stats(index=i + 1, dns=config.dns) if report_enabled else None
+        success = run_locked(config, cancelled=cancelled, deadline=deadline, stats=stats)
+        results.append(success)
+        reports.append(stats and stats.to_dict())
+        if not success:
+            logger.error("Configuration %d failed", i + 1)
+        else:
+            logger.info("Configuration %d completed successfully", i + 1)
+    return results
+
+
+def _pop_profile_path(argv):
+    # type: (list[str]) -> str | None
+    """从命令行参数中取出 --profile FILE, 以便在解析参数前开始分析"""
+    for i, argument in enumerate(argv[1:], 1):
+        if argument.startswith("--profile="):
+            del argv[i]
+            return argument[len("--profile=") :]
+        if argument == "--profile" and i + 1 < len(argv):
+            profile_path = argv[i + 1]
+            del argv[i : i + 2]
+            return profile_path
+    return None
 
 
 def main():
+    """
+    命令行入口, --profile FILE 时在分析器中运行 (适用于所有子命令, 包括 web 常驻模式)
+    """
+    profile_path = _pop_profile_path(sys.argv)
+    if not profile_path:
+        return _main()
+    return _run_profiled(profile_path, _main)
+
+
+def _run_profiled(profile_path, func):
+    # type: (str, Callable[[], Any]) -> Any
+    """在分析器中运行 func, 守护进程被 SIGTERM 停止时也写出分析结果"""
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    return profile_call(profile_path, func)
+
+
+def _main():
     stdout = sys.stdout  # pythonw 模式无 stdout
     mcp_mode = len(sys.argv) > 1 and sys.argv[1] == "mcp"
     if stdout and stdout.encoding and stdout.encoding.lower() != "utf-8" and hasattr(stdout, "buffer"):
@@ -148,34 +607,23 @@ def main():
     # 使用多配置加载器，它会自动处理单个和多个配置
     configs = load_configs(__description__, __version__, build_date)
 
-    if len(configs) == 1:
-        # 单个配置，使用原有逻辑（向后兼容）
-        config = configs[0]
-        success = run(config)
-        if not success:
-            sys.exit(1)
-    else:
-        # 多个配置，使用新的批处理逻辑
-        overall_success = True
-        for i, config in enumerate(configs):
-            # 如果log_level有值则设置setLevel
-            if hasattr(config, "log_level") and config.log_level:
-                logger.setLevel(config.log_level)
-            logger.info("Running configuration %d/%d", i + 1, len(configs))
-            # 记录当前provider
-            logger.info("Using DNS provider: %s", config.dns)
-            success = run(config)
-            if not success:
-                overall_success = False
-                logger.error("Configuration %d failed", i + 1)
-            else:
-                logger.info("Configuration %d completed successfully", i + 1)
+    # --deadline 为整体运行预算, 到期后取消剩余更新并报告跳过的域名
+    deadline = time() + configs[0].deadline if configs and configs[0].deadline else None
+    cancelled = _deadline_checker(deadline)
+    report_enabled = bool(configs and (configs[0].report or configs[0].report_file))
+    started, start = time(), monotonic()
+    reports = []  # type: list[dict | None]
+    results = _run_configs(configs, cancelled, deadline, report_enabled, reports)
 
-        if not overall_success:
+    if report_enabled:
+        write_report(configs, results, reports, started, monotonic() - start)
+    if len(configs) > 1:
+        if not all(results):
             logger.error("Some configurations failed")
-            sys.exit(1)
         else:
             logger.info("All configurations completed successfully")
+    if not all(results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
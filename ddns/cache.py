@@ -10,6 +10,94 @@ from json import load, dump
 from tempfile import gettempdir
 from time import time
 
+# 失败记录键前缀 / key prefix of persisted update failures
+FAILURE_PREFIX = "failure:"
+# 首次失败后的退避时间(秒)，与默认 5 分钟定时任务间隔一致
+BACKOFF_BASE = 300
+# 退避时间上限(秒)
+BACKOFF_MAX = 86400
+
+
+def failure_key(provider, domain, record_type):
+    # type: (str, str, str) -> str
+    """
+    生成 (provider, domain, type) 的失败记录缓存键
+
+    Build the cache key that tracks failures of one provider record.
+    """
+    return "{}{}:{}:{}".format(FAILURE_PREFIX, provider, domain, record_type)
+
+
+def parse_failure_key(key):
+    # type: (str) -> tuple[str, str, str] | None
+    """
+    解析失败记录键为 (provider, domain, type)，非失败记录返回 None
+    """
+    if not key.startswith(FAILURE_PREFIX):
+        return None
+    parts = key[len(FAILURE_PREFIX) :].split(":")
+    if len(parts) != 3:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+def backoff_delay(failures):
+    # type: (int) -> int
+    """
+    连续失败次数对应的指数退避时间(秒)，不超过 BACKOFF_MAX
+    """
+    exponent = min(max(failures - 1, 0), 16)  # 避免超大整数运算
+    return min(BACKOFF_BASE * 2**exponent, BACKOFF_MAX)
+
+
+def get_backoff(cache, key, now=None, address=None):
+    # type: (dict, str, float | None, str | None) -> dict | None
+    """
+    返回仍处于退避期的失败记录；未失败、已到重试时间或待更新地址已变化则返回 None
+
+    Return the failure state while its retry time is still in the future. A
+    failure recorded for a different `address` does not hold back the new one.
+    """
+    state = cache.get(key)
+    if not isinstance(state, dict):
+        return None
+    if address is not None and state.get("address", address) != address:
+        return None
+    retry_at = state.get("retry_at")
+    if not isinstance(retry_at, (int, float)) or retry_at <= (time() if now is None else now):
+        return None
+    return state
+
+
+def record_failure(cache, key, now=None, address=None):
+    # type: (dict, str, float | None, str | None) -> dict
+    """
+    记录一次失败并计算下次重试时间，失败的地址变化时重新计数
+
+    Count one more consecutive failure and schedule the next retry; a failure
+    for a different `address` starts counting from one again.
+    """
+    now = time() if now is None else now
+    state = cache.get(key)
+    if not isinstance(state, dict) or (address is not None and state.get("address", address) != address):
+        state = {}
+    failures = state.get("failures", 0)
+    failures = (failures if isinstance(failures, int) else 0) + 1
+    state = {"failures": failures, "last_failure": now, "retry_at": now + backoff_delay(failures)}
+    if address is not None:
+        state["address"] = address
+    cache[key] = state
+    return state
+
+
+def clear_failure(cache, key):
+    # type: (dict, str) -> None
+    """
+    更新成功后清除失败记录
+    """
+    if key in cache:
+        del cache[key]
+
 
 class Cache(dict):
     """
@@ -79,6 +79,18 @@ def interval_minutes(value):
     return parsed
 
 
+def web_workers(value):
+    # type: (object) -> int
+    """Parse the dashboard worker pool size."""
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        raise ArgumentTypeError("must be an integer between 1 and 64")
+    if parsed < 1 or parsed > 64:
+        raise ArgumentTypeError("must be an integer between 1 and 64")
+    return parsed
+
+
 def config_interval_minutes(value):
     # type: (object) -> int
     """Parse a JSON interval without coercing non-integer types."""
@@ -241,6 +253,49 @@ def _add_ddns_args(arg):  # type: (ArgumentParser) -> None
         const=False,
         help="disable SSL verify [禁用验证, 等效 --ssl=false]",
     )
+    advanced.add_argument(
+        "--workers",
+        type=non_negative_int,
+        metavar="N",
+        help="run multiple configs in N worker processes [多配置时使用N个进程并行运行]",
+    )
+    advanced.add_argument(
+        "--worker-timeout",
+        "--worker_timeout",
+        dest="worker_timeout",
+        type=non_negative_int,
+        metavar="SECONDS",
+        help="deadline of each worker process [每个工作进程的最长运行秒数]",
+    )
+    advanced.add_argument(
+        "--deadline",
+        type=non_negative_int,
+        metavar="SECONDS",
+        help="cancel remaining updates after SECONDS [整体运行的最长秒数，到期取消剩余更新]",
+    )
+    advanced.add_argument(
+        "--lock-wait",
+        "--lock_wait",
+        dest="lock_wait",
+        type=non_negative_int,
+        metavar="SECONDS",
+        help="wait for an overlapping run instead of exiting [等待重叠运行结束的秒数，默认立即退出]",
+    )
+    advanced.add_argument(
+        "--report", choices=["json"], help="print a run report with phase timings [输出包含阶段耗时的运行报告]"
+    )
+    advanced.add_argument(
+        "--report-file",
+        "--report_file",
+        dest="report_file",
+        metavar="FILE",
+        help="write the JSON run report to FILE [将JSON运行报告写入文件]",
+    )
+    advanced.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="profile the run into FILE: pstats or *.callgrind (main thread only), sampled *.folded (all threads) [性能分析输出文件]",
+    )
     advanced.add_argument("--log_file", metavar="FILE", help="log file [日志文件，默认标准输出]")
     advanced.add_argument("--log.file", "--log-file", dest="log_file", help=SUPPRESS)  # 隐藏参数
     advanced.add_argument("--log_level", type=log_level, metavar="|".join(log_levels), help=None)
@@ -296,6 +351,13 @@ def _add_web_subcommand(subparsers):
         metavar="MINs",
         help="built-in sync interval; overrides config [内置同步间隔，优先于配置]",
     )
+    web.add_argument(
+        "--workers",
+        type=web_workers,
+        default=8,
+        metavar="N",
+        help="dashboard worker threads, 1-64 [控制台工作线程数，1-64]",
+    )
     web.add_argument("--open", action="store_true", help="open dashboard in browser [在浏览器中打开]")
     web.add_argument("--debug", action="store_true", help="enable debug logging [启用调试日志]")
     web.add_argument(
@@ -437,7 +499,7 @@ def _validate_web_mode_arguments():
     # type: () -> None
     if len(sys.argv) <= 1 or sys.argv[1] != "web":
         return
-    value_options = ("-c", "--config", "--host", "--port", "--interval", "--log-level")
+    value_options = ("-c", "--config", "--host", "--port", "--interval", "--workers", "--log-level")
     flag_options = ("--open", "--debug", "-h", "--help")
     long_value_prefixes = tuple(option + "=" for option in value_options if option.startswith("--"))
     arguments = sys.argv[2:]
@@ -698,6 +760,7 @@ def _handle_web_command(args):
         open_browser=args.get("open", False),
         logger=getLogger(),
         interval=interval,
+        workers=args.get("workers", 8),
     )
 
 
@@ -117,6 +117,12 @@ class Config(object):
             "proxy",
             "cache",
             "cache_max_age",
+            "workers",
+            "worker_timeout",
+            "deadline",
+            "lock_wait",
+            "report",
+            "report_file",
             "interval",
             "ssl",
             "log_level",
@@ -147,6 +153,15 @@ class Config(object):
         self.cache = str_bool(self._get("cache", True))
         self.cache_max_age = self._get_cache_max_age()
         self.ssl = str_bool(self._get("ssl", "auto"))
+        # 多配置进程池: 进程数与每个进程的截止时间(秒), 0 表示不启用/不限制
+        self.workers = int(self._get("workers", 0) or 0)  # type: int
+        self.worker_timeout = int(self._get("worker_timeout", 0) or 0)  # type: int
+        # 整体运行截止时间(秒)与等待其他运行释放配置锁的秒数, 0 表示不限制/立即退出
+        self.deadline = int(self._get("deadline", 0) or 0)  # type: int
+        self.lock_wait = int(self._get("lock_wait", 0) or 0)  # type: int
+        # 运行报告格式 (json) 与报告文件路径
+        self.report = self._get("report", None) or None  # type: str | None
+        self.report_file = self._get("report_file", None) or None  # type: str | None
 
         log_level = self._get("log_level", "INFO")
         if isinstance(log_level, string_types):
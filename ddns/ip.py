@@ -8,7 +8,7 @@ from logging import debug, error
 from .util.http import request
 from .util.try_run import try_run
 
-# 模块级别的SSL验证配置，默认使用auto模式
+# 模块级别的SSL验证配置，默认使用auto模式；调用时传入 verify 可按配置覆盖
 ssl_verify = "auto"
 
 # IPV4正则
@@ -63,11 +63,11 @@ def local_v4(i=0):  # 本地ipv4地址
     return info[int(i)][-1][0]
 
 
-def _open(url, reg):
+def _open(url, reg, verify=None):
     try:
         debug("open: %s", url)
         # IP 模块重试3次
-        response = request("GET", url, verify=ssl_verify, retries=2)
+        response = request("GET", url, verify=ssl_verify if verify is None else verify, retries=2)
         res = response.body
         debug("response: %s", res)
         match = compile(reg).search(res)
@@ -78,14 +78,14 @@ def _open(url, reg):
         error(e)
 
 
-def _try_multiple_apis(api_list, reg, ip_type):
+def _try_multiple_apis(api_list, reg, ip_type, verify=None):
     """
     Try multiple API endpoints until one succeeds
     """
     for url in api_list:
         try:
             debug("Trying %s API: %s", ip_type, url)
-            result = _open(url, reg)
+            result = _open(url, reg, verify)
             if result:
                 debug("Successfully got %s from %s: %s", ip_type, url, result)
                 return result
@@ -96,22 +96,22 @@ def _try_multiple_apis(api_list, reg, ip_type):
     return None
 
 
-def public_v4(url=None, reg=IPV4_REG):  # 公网IPV4地址
+def public_v4(url=None, reg=IPV4_REG, verify=None):  # 公网IPV4地址
     if url:
         # 使用指定URL
-        return _open(url, reg)
+        return _open(url, reg, verify)
     else:
         # 使用多个API自动重试
-        return _try_multiple_apis(PUBLIC_IPV4_APIS, reg, "IPv4")
+        return _try_multiple_apis(PUBLIC_IPV4_APIS, reg, "IPv4", verify)
 
 
-def public_v6(url=None, reg=IPV6_REG):  # 公网IPV6地址
+def public_v6(url=None, reg=IPV6_REG, verify=None):  # 公网IPV6地址
     if url:
         # 使用指定URL
-        return _open(url, reg)
+        return _open(url, reg, verify)
     else:
         # 使用多个API自动重试
-        return _try_multiple_apis(PUBLIC_IPV6_APIS, reg, "IPv6")
+        return _try_multiple_apis(PUBLIC_IPV6_APIS, reg, "IPv6", verify)
 
 
 def _read_network_config():
@@ -34,7 +34,7 @@ SERVER_INFO_KEY = "io.modelcontextprotocol/serverInfo"
 PROTOCOL_VERSION_KEY = "io.modelcontextprotocol/protocolVersion"
 CLIENT_CAPABILITIES_KEY = "io.modelcontextprotocol/clientCapabilities"
 CLIENT_INFO_KEY = "io.modelcontextprotocol/clientInfo"
-STATUS_FIELDS = ("state", "message", "last_sync", "addresses", "providers", "records")
+STATUS_FIELDS = ("state", "message", "last_sync", "addresses", "providers", "records", "record_count")
 
 EMPTY_INPUT_SCHEMA = {"type": "object", "additionalProperties": False}
 TOOLS = (
@@ -56,13 +56,23 @@ Defines a unified interface to support extension and adaptation across providers
 """
 
 from abc import ABCMeta, abstractmethod
+from hashlib import md5
 from json import loads as jsondecode, dumps as jsonencode
 from logging import Logger, getLogger  # noqa:F401 # type: ignore[no-redef]
+from time import time
 from ..util.http import request, quote, urlencode
+from ..util.jsonstream import iter_json_array
+from ..util.singleflight import SingleFlight
+from ..util import metrics
+from ..util.timing import count, current_phase, monotonic, phase
+from ._psl import public_suffix_depth
 
 TYPE_FORM = "application/x-www-form-urlencoded"
 TYPE_JSON = "application/json"
 
+# 进程内共享, 合并并发的相同只读查询 (如同一主域名的 zone_id)
+_flight = SingleFlight()
+
 
 def encode_params(params):
     # type: (dict|list|str|bytes|None) -> str
@@ -90,6 +100,7 @@ class SimpleProvider(object):
     Subclasses must implement `set_record`.
 
     * set_record(domain, value, record_type="A", ttl=None, line=None, **extra)
+    * set_records(domains, value, ...) 可选, 支持一次请求更新多个域名时实现
     """
 
     __metaclass__ = ABCMeta
@@ -104,9 +115,15 @@ class SimpleProvider(object):
     decode_response = True  # type: bool
     # Description
     remark = "Managed by [DDNS](https://ddns.newfuture.cc)"
-
-    def __init__(self, id, token, logger=None, ssl="auto", proxy=None, endpoint=None, **options):
-        # type: (str, str, Logger | None, bool|str, list[str]|None, str|None, **object) -> None
+    # 单次 set_records 调用最多更新的域名数, 1 表示逐个调用 set_record
+    batch_size = 1  # type: int
+    # 并发更新时同一服务商的最大并发请求数 (extra.concurrency 只能调低)
+    max_concurrency = 8  # type: int
+    # 流式读取列表响应时解压后响应体的最大字节数
+    max_stream_size = 32 * 1024 * 1024  # type: int
+
+    def __init__(self, id, token, logger=None, ssl="auto", proxy=None, endpoint=None, cache=None, name=None, **options):
+        # type: (str, str, Logger | None, bool|str, list[str]|None, str|None, dict|None, str|None, **object) -> None
         """
         初始化服务商对象
 
@@ -116,6 +133,8 @@ class SimpleProvider(object):
             id (str): 身份认证 ID / Authentication ID
             token (str): 密钥 / Authentication Token
             proxy (list[str | None] | None): 代理配置，支持代理列表
+            cache (dict | None): 持久化缓存，用于保存区域列表等查询结果 / Persistent cache
+            name (str | None): 配置中的服务商名称 (config.dns), 用作指标标签 / Configured provider name
             options (dict): 其它参数 / Additional options
         """
         self.id = id
@@ -127,12 +146,18 @@ class SimpleProvider(object):
         self._proxy = proxy  # 代理列表或None
 
         self._ssl = ssl
+        self._cache = cache
 
         self.options = options
-        name = self.__class__.__name__
-        self.logger = (logger or getLogger()).getChild(name)
+        class_name = self.__class__.__name__
+        # 指标标签与缓存、同步指标一致地使用配置中的服务商名称
+        self.name = name or (class_name[:-8] if class_name.endswith("Provider") else class_name).lower()
+        self.logger = (logger or getLogger()).getChild(class_name)
 
         self._zone_map = {}  # type: dict[str, str]
+        self._zones = None  # type: dict | None # 区域后缀树
+        self._zones_fresh = False  # 后缀树是否为本次运行列出
+        self._zones_unavailable = False  # 不支持或无法列出区域
         self.logger.debug("%s initialized with: %s", self.__class__.__name__, id)
         self._validate()  # 验证身份认证信息
 
@@ -157,6 +182,22 @@ class SimpleProvider(object):
         """
         raise NotImplementedError("This set_record should be implemented by subclasses")
 
+    def set_records(self, domains, value, record_type="A", ttl=None, line=None, **extra):
+        # type: (list[str], str, str, str | int | None, str | None, **object) -> dict[str, bool]
+        """
+        批量设置多个域名的同一记录值, 默认逐个调用 `set_record`
+
+        Set the same value for several domains. Providers whose API accepts
+        multiple hostnames per request override this and raise `batch_size`.
+
+        Args:
+            domains (list[str]): 完整域名列表, 不超过 batch_size 个
+
+        Returns:
+            dict[str, bool]: {域名: 是否成功}
+        """
+        return {domain: self.set_record(domain, value, record_type, ttl, line, **extra) for domain in domains}
+
     def _validate(self):
         # type: () -> None
         """
@@ -171,8 +212,30 @@ class SimpleProvider(object):
         if not self.endpoint:
             raise ValueError("API endpoint must be defined in {}".format(self.__class__.__name__))
 
-    def _http(self, method, url, params=None, body=None, queries=None, headers=None, timeout=None, retries=2):  # noqa: C901
-        # type: (str, str, dict[str,Any]|str|None, dict[str,Any]|str|None, dict[str,Any]|None, dict|None, float|None, int) -> Any # noqa: E501
+    def _single_flight(self, action, params, func, *args, **kwargs):
+        # type: (str, Any, Callable, *Any, **Any) -> Any
+        """
+        合并相同的并发只读调用, 以 (服务商, 操作, 参数) 为键, 仅首个调用方实际执行
+
+        Coalesce identical in-flight read-only calls keyed by (provider, action, params):
+        the first caller runs `func`, concurrent callers wait for and share its result.
+
+        Args:
+            action (str): 操作名, 如 "zone"、"record"
+            params (Any): 可 JSON 序列化的查询参数
+            func (Callable): 实际执行的只读查询
+
+        Returns:
+            Any: func 的返回值, 调用方之间共享, 不可修改
+        """
+        provider = [self.__class__.__name__, self.endpoint, self.id, self.token]
+        key = jsonencode([provider, action, params], sort_keys=True, default=str)
+        return _flight.do(key, func, *args, **kwargs)
+
+    def _http(  # noqa: C901
+        self, method, url, params=None, body=None, queries=None, headers=None, timeout=None, retries=2, stream=None
+    ):
+        # type: (str, str, dict[str,Any]|str|None, dict[str,Any]|str|None, dict[str,Any]|None, dict|None, float|None, int, tuple|None) -> Any # noqa: E501
         """
         发送 HTTP/HTTPS 请求，自动根据 API/url 选择协议。
 
@@ -185,9 +248,10 @@ class SimpleProvider(object):
             headers (dict): 头部，可选
             timeout (float | None): 单次 HTTP 请求超时秒数
             retries (int): HTTP 请求重试次数
+            stream (tuple[str, ...] | None): 流式解析响应 JSON 中该键路径下的数组, 如 ("result",)
 
         Returns:
-            Any: 解析后的响应内容
+            Any: 解析后的响应内容; 指定 stream 时为逐项生成器, 大小受 max_stream_size 限制
 
         Raises:
             RuntimeError: 当响应状态码为400/401或5xx(服务器错误)时抛出异常
@@ -235,22 +299,39 @@ class SimpleProvider(object):
             self.logger.debug("headers:\n%s", {k: self._mask_sensitive_data(v) for k, v in headers.items()})
 
         # 直接传递代理列表给request函数
-        response = request(
-            method,
-            url,
-            body_data,
-            headers=headers,
-            proxies=self._proxy,
-            verify=self._ssl,
-            retries=retries,
-            timeout=timeout,
-        )
+        count("api_calls")
+        # 指标按服务商名称与当前阶段 (zone/query/update/create) 区分请求
+        labels = {"provider": self.name, "action": current_phase() or "request"}
+        start = monotonic()
+        try:
+            response = request(
+                method,
+                url,
+                body_data,
+                headers=headers,
+                proxies=self._proxy,
+                verify=self._ssl,
+                retries=retries,
+                timeout=timeout,
+                stream=stream is not None,
+                max_size=self.max_stream_size,
+            )
+        except Exception:
+            metrics.inc("ddns_api_requests_total", dict(labels, status="error"))
+            raise
+        finally:
+            metrics.observe("ddns_api_request_duration_seconds", labels, monotonic() - start)
         # 处理响应
         status_code = response.status
+        metrics.inc("ddns_api_requests_total", dict(labels, status=str(status_code)))
         if not (200 <= status_code < 300):
+            count("api_errors")
             self.logger.warning("response status: %s %s", status_code, response.reason)
+        elif stream is not None:
+            self.logger.debug("response: streaming items of %s", "/".join(stream) or "[]")
+            return iter_json_array(response.iter_text(), stream)
 
-        res = response.body
+        res = response.body if stream is None else "".join(response.iter_text())
         # 针对客户端错误、认证/授权错误和服务器错误直接抛出异常
         if status_code >= 500 or status_code in (400, 401, 403):
             self.logger.error("HTTP error:\n%s", res)
@@ -263,6 +344,11 @@ class SimpleProvider(object):
             else:
                 raise RuntimeError("服务器错误 [{}]: {}".format(status_code, response.reason))
 
+        if stream is not None:
+            # 列表请求失败不能当作空列表, 否则调用方会误以为记录不存在而重复创建
+            self.logger.error("HTTP error:\n%s", res)
+            raise RuntimeError("请求失败 [{}]: {}".format(status_code, response.reason))
+
         self.logger.debug("response:\n%s", res)
         if not self.decode_response:
             return res
@@ -328,8 +414,13 @@ class BaseProvider(SimpleProvider):
     * _query_record_id()
     * _update_record()
     * _create_record()
+    * _list_zones() 可选, 支持一次列出全部区域时实现
+    * _iter_records() 可选, 逐页遍历区域记录的生成器
     """
 
+    # 区域列表在缓存中的复用时间(秒)
+    zone_list_ttl = 3600  # type: int
+
     def set_record(self, domain, value, record_type="A", ttl=None, line=None, **extra):
         # type: (str, str, str, str | int | None, str | None, **Any) -> bool
         """
@@ -352,12 +443,13 @@ class BaseProvider(SimpleProvider):
         self.logger.info("%s => %s(%s)", domain, value, record_type)
         sub, main = _split_custom_domain(domain)
         try:
-            if sub is not None:
-                # 使用自定义分隔符格式
-                zone_id = self.get_zone_id(main)
-            else:
-                # 自动分析域名
-                zone_id, sub, main = self._split_zone_and_sub(domain)
+            with phase("zone"):
+                if sub is not None:
+                    # 使用自定义分隔符格式
+                    zone_id = self.get_zone_id(main)
+                else:
+                    # 自动分析域名
+                    zone_id, sub, main = self._split_zone_and_sub(domain)
 
             self.logger.info("sub: %s, main: %s(id=%s)", sub, main, zone_id)
             if not zone_id or sub is None:
@@ -365,15 +457,28 @@ class BaseProvider(SimpleProvider):
                 return False
 
             # 查询现有记录
-            record = self._query_record(zone_id, sub, main, record_type=record_type, line=line, extra=extra)
+            with phase("query"):
+                record = self._single_flight(
+                    "record",
+                    [zone_id, sub, main, record_type, line, extra],
+                    self._query_record,
+                    zone_id,
+                    sub,
+                    main,
+                    record_type=record_type,
+                    line=line,
+                    extra=extra,
+                )
 
             # 更新或创建记录
             if record:
                 self.logger.info("Found existing record: %s", record)
-                return self._update_record(zone_id, record, value, record_type, ttl=ttl, line=line, extra=extra)
+                with phase("update"):
+                    return self._update_record(zone_id, record, value, record_type, ttl=ttl, line=line, extra=extra)
             else:
                 self.logger.warning("No existing record found, creating new one")
-                return self._create_record(zone_id, sub, main, value, record_type, ttl=ttl, line=line, extra=extra)
+                with phase("create"):
+                    return self._create_record(zone_id, sub, main, value, record_type, ttl=ttl, line=line, extra=extra)
         except Exception as e:
             self.logger.exception("Error setting record for %s: %s", domain, e)
             return False
@@ -391,9 +496,11 @@ class BaseProvider(SimpleProvider):
         Returns:
             str | None: 区域 ID / Zone identifier
         """
-        if domain in self._zone_map:
-            return self._zone_map[domain]
-        zone_id = self._query_zone_id(domain)
+        zone_id = self._zone_map.get(domain)
+        if zone_id:
+            return zone_id
+        # 同一主域名的并发查询只发出一次请求
+        zone_id = self._single_flight("zone", domain, self._query_zone_id, domain)
         if zone_id:
             self._zone_map[domain] = zone_id
         return zone_id
@@ -471,11 +578,90 @@ class BaseProvider(SimpleProvider):
         """
         raise NotImplementedError("This _update_record should be implemented by subclasses")
 
+    def _iter_records(self, zone_id, **filters):
+        # type: (str, **Any) -> Iterator[dict]
+        """
+        逐页遍历区域中的记录, 由服务商实现游标或偏移分页
+
+        Iterate the records of a zone page by page. Callers stop consuming as
+        soon as they find a match, so later pages are never requested.
+
+        Args:
+            zone_id (str): 主域名 ID
+            filters (dict): 服务商支持的查询过滤参数
+
+        Returns:
+            Iterator[dict]: 记录生成器
+        """
+        raise NotImplementedError("This _iter_records should be implemented by subclasses")
+
+    def _list_zones(self):
+        # type: () -> dict[str, str] | None
+        """
+        列出账号下的全部区域，不支持时返回 None
+
+        List every zone of the account. Providers that cannot list zones return None
+        and fall back to probing `_query_zone_id` suffix by suffix.
+
+        Returns:
+            dict[str, str] | None: {区域名: zone_id}
+        """
+        return None
+
+    def _zone_trie(self, refresh=False):
+        # type: (bool) -> tuple[dict | None, bool]
+        """
+        获取区域后缀树，仅在启用缓存时使用，每次运行最多列出一次，并在缓存中保存 zone_list_ttl 秒
+
+        Load the reverse-label zone trie from this run, the cache, or `_list_zones`.
+
+        Args:
+            refresh (bool): 忽略缓存中的区域列表并重新列出
+
+        Returns:
+            (trie, fresh): 后缀树(不支持时为 None)，以及是否为本次运行列出
+        """
+        if self._zones is not None and (self._zones_fresh or not refresh):
+            return self._zones, self._zones_fresh
+        if self._zones_unavailable or not isinstance(self._cache, dict):
+            # 未启用缓存时保持逐级查询，避免每次运行都列出全部区域
+            return None, False
+
+        cache_key = "zones:{}:{}".format(
+            self.__class__.__name__, md5("{}:{}".format(self.id, self.token).encode("utf-8")).hexdigest()[:16]
+        )
+        if not refresh:
+            stored = self._cache.get(cache_key)
+            if (
+                isinstance(stored, dict)
+                and isinstance(stored.get("trie"), dict)
+                and 0 <= time() - stored.get("time", 0) < self.zone_list_ttl
+            ):
+                self.logger.debug("Using cached zone list")
+                self._zones, self._zones_fresh = stored["trie"], False
+                return self._zones, False
+
+        try:
+            zones = self._single_flight("zones", None, self._list_zones)
+        except Exception as e:
+            self.logger.warning("Failed to list zones, fallback to zone queries: %s", e)
+            zones = None
+        if zones is None:
+            self._zones_unavailable = True
+            return None, False
+
+        self.logger.debug("Listed %d zones", len(zones))
+        self._zones, self._zones_fresh = _build_zone_trie(zones), True
+        self._cache[cache_key] = {"time": time(), "trie": self._zones}
+        return self._zones, True
+
     def _split_zone_and_sub(self, domain):
         # type: (str) -> tuple[str | None, str | None, str ]
         """
         从完整域名拆分主域名和子域名
 
+        支持列出区域的服务商通过后缀树本地匹配最长后缀; 不支持或未匹配时从可注册域名开始逐级查询 zone_id
+
         Args:
             domain (str): 完整域名
 
@@ -483,8 +669,26 @@ class BaseProvider(SimpleProvider):
             (zone_id, sub): 元组
         """
         domain_split = domain.split(".")
+        trie, fresh = self._zone_trie()
+        if trie is not None:
+            matched = _match_zone_trie(trie, domain_split)
+            if matched is None and not fresh:
+                # 缓存的区域列表可能已过时，重新列出一次
+                trie, _ = self._zone_trie(refresh=True)
+                matched = trie and _match_zone_trie(trie, domain_split)
+            if matched:
+                zone_id, depth = matched
+                main = ".".join(domain_split[-depth:])
+                sub = ".".join(domain_split[:-depth]) or "@"
+                self._zone_map[main] = zone_id
+                self.logger.debug("zone_id: %s, sub: %s", zone_id, sub)
+                return zone_id, sub, main
+            # 共享/委派的区域或分页截断等原因可能不在列表中, 继续逐级查询
+            self.logger.debug("No listed zone matches %s, querying zone ids", domain)
+
         zone_id = None
-        index = 2
+        # 从可注册域名开始逐级查询, 跳过 com.cn / co.uk 等公共后缀
+        index = max(2, public_suffix_depth(domain_split) + 1)
         main = ""
         while not zone_id and index <= len(domain_split):
             main = ".".join(domain_split[-index:])
@@ -497,6 +701,43 @@ class BaseProvider(SimpleProvider):
         return None, None, main
 
 
+def _build_zone_trie(zones):
+    # type: (dict[str, str]) -> dict
+    """
+    将 {区域名: zone_id} 构建为按标签倒序的后缀树, 空字符串键保存 zone_id
+
+    Build a reverse-label trie, e.g. {"com": {"example": {"": "zone-id"}}}.
+    """
+    trie = {}  # type: dict
+    for name, zone_id in zones.items():
+        name = name.strip(".").lower()
+        if not name or not zone_id:
+            continue
+        node = trie
+        for label in reversed(name.split(".")):
+            node = node.setdefault(label, {})
+        node[""] = zone_id
+    return trie
+
+
+def _match_zone_trie(trie, labels):
+    # type: (dict, list[str]) -> tuple[str, int] | None
+    """
+    在后缀树中查找最长匹配的区域
+
+    Returns:
+        (zone_id, depth): 区域 ID 和区域名的标签数, 未匹配返回 None
+    """
+    node, found = trie, None
+    for depth, label in enumerate(reversed(labels), 1):
+        node = node.get(label.lower())
+        if not isinstance(node, dict):
+            break
+        if node.get(""):
+            found = (node[""], depth)
+    return found
+
+
 def _split_custom_domain(domain):
     # type: (str) -> tuple[str | None, str]
     """
@@ -514,6 +755,28 @@ def _split_custom_domain(domain):
     return None, domain
 
 
+def parse_dyndns2_response(response, hostnames):
+    # type: (str | None, list[str]) -> dict[str, str]
+    """
+    解析 dyndns2 协议的多主机名响应
+
+    The dyndns2 protocol answers one line per hostname, in request order
+    (e.g. "good 1.2.3.4", "nochg 1.2.3.4", "nohost"). A single line such as
+    "badauth" applies to every hostname.
+
+    Args:
+        response (str | None): 响应文本
+        hostnames (list[str]): 请求中的主机名, 按顺序
+
+    Returns:
+        dict[str, str]: {主机名: 返回码}, 缺失的返回码为空字符串
+    """
+    codes = [line.split()[0] for line in str(response or "").splitlines() if line.strip()]
+    if len(codes) == 1:
+        codes = codes * len(hostnames)
+    return {host: codes[i] if i < len(codes) else "" for i, host in enumerate(hostnames)}
+
+
 def join_domain(sub, main):
     # type: (str | None, str) -> str
     """
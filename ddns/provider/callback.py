@@ -20,12 +20,16 @@ class CallbackProvider(SimpleProvider):
     endpoint = ""  # CallbackProvider uses id as URL, no fixed API endpoint
     content_type = TYPE_JSON
     decode_response = False  # Callback response is not JSON, it's a custom response
+    # token 模板包含 __RECORDS__ 时单次回调的最大记录数, 否则为 1
+    batch_size = 1000
 
     def set_record(self, domain, value, record_type="A", ttl=None, line=None, **extra):
         """
         发送自定义回调请求，支持 GET/POST
         Send custom callback request, support GET/POST
         """
+        if self.batch_size > 1:
+            return self.set_records([domain], value, record_type, ttl, line, **extra)[domain]
         self.logger.info("%s => %s(%s)", domain, value, record_type)
         url = self.id  # 直接用 id 作为 url
         token = self.token  # token 作为 POST 参数
@@ -61,6 +65,47 @@ class CallbackProvider(SimpleProvider):
             self.logger.error("Callback failed: %s", e)
         return False
 
+    def set_records(self, domains, value, record_type="A", ttl=None, line=None, **extra):
+        """
+        批量回调: POST 模板中值为 "__RECORDS__" 的字段替换为全部记录的 JSON 数组
+        Send one callback for several domains, `__DOMAIN__` expands to a comma-separated list.
+        """
+        if self.batch_size < 2:
+            return super(CallbackProvider, self).set_records(domains, value, record_type, ttl, line, **extra)
+
+        self.logger.info("%s => %s(%s)", ",".join(domains), value, record_type)
+        records = [{"domain": d, "value": value, "type": record_type, "ttl": ttl, "line": line} for d in domains]
+        extra.update(
+            {
+                "__DOMAIN__": ",".join(domains),
+                "__RECORDTYPE__": record_type,
+                "__TTL__": ttl,
+                "__IP__": value,
+                "__TIMESTAMP__": time(),
+                "__LINE__": line,
+                "__COUNT__": len(domains),
+            }
+        )
+        url = self._replace_vars(self.id, extra)
+        params = dict(self.token) if isinstance(self.token, dict) else jsondecode(self.token)
+        for k, v in params.items():
+            if v == "__RECORDS__":
+                params[k] = records
+            elif hasattr(v, "replace"):
+                params[k] = self._replace_vars(v, extra)
+
+        success = False
+        try:
+            res = self._http("POST", url, body=params)
+            if res is not None:
+                self.logger.info("Callback result: %s", res)
+                success = True
+            else:
+                self.logger.warning("Callback received empty response.")
+        except Exception as e:
+            self.logger.error("Callback failed: %s", e)
+        return dict.fromkeys(domains, success)
+
     def _replace_vars(self, string, mapping):
         # type: (str, dict) -> str
         """
@@ -77,3 +122,5 @@ class CallbackProvider(SimpleProvider):
             # 如果 endpoint 已经设置，或者 id 不是有效的 URL，则抛出异常
             self.logger.critical("endpoint [%s] or id [%s] 必须是有效的URL", self.endpoint, self.id)
             raise ValueError("endpoint or id must be configured with URL")
+        if "__RECORDS__" not in str(self.token or ""):
+            self.batch_size = 1
@@ -20,8 +20,8 @@ class CloudflareProvider(BaseProvider):
                 self.logger.critical("ID 必须为空或有效的邮箱地址")
                 raise ValueError("ID must be a valid email or Empty for Cloudflare API v4")
 
-    def _request(self, method, action, **params):
-        """发送请求数据"""
+    def _request(self, method, action, stream=False, **params):
+        """发送请求数据, stream 为 True 时逐条返回 result 列表"""
         headers = {}
         if self.id:
             headers["X-Auth-Email"] = self.id
@@ -30,6 +30,10 @@ class CloudflareProvider(BaseProvider):
             headers["Authorization"] = "Bearer " + self.token
 
         params = {k: v for k, v in params.items() if v is not None}  # 过滤掉None参数
+        if stream:
+            # 大型列表按项流式解析, 不在内存中保留完整响应
+            # success 位于 result 之后无法提前检查; API 失败时状态码非 2xx, 由 _http 抛出异常
+            return self._http(method, "/client/v4/zones" + action, headers=headers, params=params, stream=("result",))
         data = self._http(method, "/client/v4/zones" + action, headers=headers, params=params)
         if data and data.get("success"):
             return data.get("result")  # 返回结果或原始数据
@@ -47,6 +51,19 @@ class CloudflareProvider(BaseProvider):
             return zone["id"]
         return None
 
+    def _list_zones(self):
+        # type: () -> dict[str, str] | None
+        """https://developers.cloudflare.com/api/resources/zones/methods/list/"""
+        zones, page, per_page = {}, 1, 50
+        while True:
+            result = self._request("GET", "", per_page=per_page, page=page)
+            if not isinstance(result, list):
+                return None
+            zones.update((z["name"], z["id"]) for z in result if z.get("name") and z.get("id"))
+            if len(result) < per_page:
+                return zones
+            page += 1
+
     def _query_record(self, zone_id, subdomain, main_domain, record_type, line, extra):
         # type: (str, str, str, str, str | None, dict) -> dict | None
         """
@@ -65,23 +82,39 @@ class CloudflareProvider(BaseProvider):
             query["proxied"] = str(proxied).lower()  # True -> "true", False -> "false"
 
         # 先使用extra filter查询
-        data = self._request("GET", "/{}/dns_records".format(zone_id), type=record_type, per_page=10000, **query)
-        record = next((r for r in data if r.get("name") == name and r.get("type") == record_type), None)
+        records = self._iter_records(zone_id, type=record_type, **query)
+        record = next((r for r in records if r.get("name") == name and r.get("type") == record_type), None)
 
         # 如果使用了extra filter但没找到记录，尝试不带extra filter查询
         if not record and proxied is not None:
             self.logger.debug("No record found with extra filters, retrying without extra filters")
-            data = self._request(
-                "GET", "/{}/dns_records".format(zone_id), type=record_type, per_page=10000, **{"name.exact": name}
-            )
-            record = next((r for r in data if r.get("name") == name and r.get("type") == record_type), None)
+            records = self._iter_records(zone_id, type=record_type, **{"name.exact": name})
+            record = next((r for r in records if r.get("name") == name and r.get("type") == record_type), None)
 
         self.logger.debug("Record queried: %s", record)
         if record:
             return record
-        self.logger.warning("Failed to query record: %s", data)
+        self.logger.warning("Failed to query record: %s(%s)", name, record_type)
         return None
 
+    def _iter_records(self, zone_id, **filters):
+        # type: (str, **Any) -> Iterator[dict]
+        """
+        逐页流式遍历记录
+        https://developers.cloudflare.com/api/resources/dns/subresources/records/methods/list/
+        """
+        page, per_page = 1, 10000
+        path = "/{}/dns_records".format(zone_id)
+        while True:
+            params = dict(filters, page=page) if page > 1 else filters
+            count = 0
+            for record in self._request("GET", path, stream=True, per_page=per_page, **params):
+                count += 1
+                yield record
+            if count < per_page:
+                return
+            page += 1
+
     def _create_record(self, zone_id, subdomain, main_domain, value, record_type, ttl, line, extra):
         # type: (str, str, str, str, str, int | str | None, str | None, dict ) -> bool
         """https://developers.cloudflare.com/api/resources/dns/subresources/records/methods/create/"""
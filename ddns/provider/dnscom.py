@@ -60,9 +60,7 @@ class DnscomProvider(BaseProvider):
 
     def _query_record(self, zone_id, subdomain, main_domain, record_type, line, extra):
         """https://www.51dns.com/document/api/4/47.html"""
-        records = self._request("record/list", domainID=zone_id, host=subdomain, pageSize=500)
-        records = records.get("data", []) if records else []
-        for record in records:
+        for record in self._iter_records(zone_id, host=subdomain):
             if (
                 record.get("record") == subdomain
                 and record.get("type") == record_type
@@ -71,6 +69,19 @@ class DnscomProvider(BaseProvider):
                 return record
         return None
 
+    def _iter_records(self, zone_id, **filters):
+        """逐页遍历记录 https://www.51dns.com/document/api/4/47.html"""
+        page, size = 1, 500
+        while True:
+            params = dict(filters, page=page) if page > 1 else filters
+            res = self._request("record/list", domainID=zone_id, pageSize=size, **params)
+            records = res.get("data", []) if res else []
+            for record in records:
+                yield record
+            if len(records) < size:
+                return
+            page += 1
+
     def _create_record(self, zone_id, subdomain, main_domain, value, record_type, ttl, line, extra):
         """https://www.51dns.com/document/api/4/12.html"""
         extra["remark"] = extra.get("remark", self.remark)
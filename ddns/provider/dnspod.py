@@ -98,6 +98,20 @@ class DnspodProvider(BaseProvider):
             return res.get("domain", {}).get("id")
         return None
 
+    def _list_zones(self):
+        # type: () -> dict[str, str] | None
+        """列出全部域名 https://docs.dnspod.cn/api/domain-list/"""
+        zones, offset, length = {}, 0, 3000
+        while True:
+            res = self._request("Domain.List", type="all", offset=offset, length=length)
+            if not isinstance(res, dict) or res.get("status", {}).get("code") != "1":
+                return None
+            domains = res.get("domains") or []
+            zones.update((d["name"], str(d["id"])) for d in domains if d.get("name") and d.get("id"))
+            if len(domains) < length:
+                return zones
+            offset += length
+
     def _query_record(self, zone_id, subdomain, main_domain, record_type, line, extra):
         # type: (str, str, str, str, str | None, dict) -> dict | None
         """查询记录 list 然后逐个查找 https://docs.dnspod.cn/api/record-list/"""
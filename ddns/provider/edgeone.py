@@ -39,6 +39,20 @@ class EdgeOneProvider(TencentCloudProvider):
         self.logger.debug("Acceleration domain not found for: %s", domain)
         return None
 
+    def _list_zones(self):
+        # type: () -> dict[str, str] | None
+        """列出全部站点 https://cloud.tencent.com/document/api/1552/80713"""
+        zones, offset, limit = {}, 0, 100
+        while True:
+            response = self._request("DescribeZones", Offset=offset, Limit=limit)
+            if not response or not isinstance(response.get("Zones"), list):
+                return None
+            items = response["Zones"]
+            zones.update((z["ZoneName"], z["ZoneId"]) for z in items if z.get("ZoneName") and z.get("ZoneId"))
+            if len(items) < limit:
+                return zones
+            offset += limit
+
     def _query_record(self, zone_id, subdomain, main_domain, record_type, line, extra):
         # type: (str, str, str, str, str | None, dict) -> dict | None
         """
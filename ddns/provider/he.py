@@ -4,7 +4,7 @@ Hurricane Electric (he.net) API
 @author: NN708, NewFuture
 """
 
-from ._base import SimpleProvider, TYPE_FORM
+from ._base import SimpleProvider, TYPE_FORM, parse_dyndns2_response
 
 
 class HeProvider(SimpleProvider):
@@ -12,6 +12,7 @@ class HeProvider(SimpleProvider):
     content_type = TYPE_FORM
     accept = None  # he.net does not require a specific Accept header
     decode_response = False  # he.net response is plain text, not JSON
+    batch_size = 20  # dyndns2 接受逗号分隔的多个 hostname
 
     def _validate(self):
         self.logger.warning(
@@ -44,3 +45,27 @@ class HeProvider(SimpleProvider):
         except Exception as e:
             self.logger.error("Error updating record for %s: %s", domain, e)
         return False
+
+    def set_records(self, domains, value, record_type="A", ttl=None, line=None, **extra):
+        """
+        使用同一密码一次更新多个域名, 按行解析每个域名的返回码。
+        Update several hostnames sharing the password with one dyndns2 request.
+        """
+        if len(domains) < 2:
+            return super(HeProvider, self).set_records(domains, value, record_type, ttl, line, **extra)
+
+        self.logger.info("%s => %s(%s)", ",".join(domains), value, record_type)
+        params = {"hostname": ",".join(domains), "myip": value, "password": self.token}
+        try:
+            res = self._http("POST", "/nic/update", body=params)
+        except Exception as e:
+            self.logger.error("Error updating records for %s: %s", ",".join(domains), e)
+            return dict.fromkeys(domains, False)
+
+        self.logger.info("HE API response: %s", res)
+        results = {}
+        for domain, code in parse_dyndns2_response(res, domains).items():
+            results[domain] = code in ("good", "nochg")
+            if not results[domain]:
+                self.logger.error("HE API error for %s: %s", domain, code)
+        return results
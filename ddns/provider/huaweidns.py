@@ -80,25 +80,42 @@ class HuaweiDNSProvider(BaseProvider):
         zoneid = zone and zone["id"]
         return zoneid
 
+    def _list_zones(self):
+        # type: () -> dict[str, str] | None
+        """https://support.huaweicloud.com/api-dns/dns_api_62003.html"""
+        zones, offset, limit = {}, 0, 500
+        while True:
+            data = self._request("GET", "/v2/zones", limit=limit, offset=offset)
+            if not isinstance(data, dict) or not isinstance(data.get("zones"), list):
+                return None
+            zones.update((z["name"], z["id"]) for z in data["zones"] if z.get("name") and z.get("id"))
+            if len(data["zones"]) < limit:
+                return zones
+            offset += limit
+
     def _query_record(self, zone_id, subdomain, main_domain, record_type, line, extra):
         """
         v2.1 https://support.huaweicloud.com/api-dns/dns_api_64004.html
         v2 https://support.huaweicloud.com/api-dns/ListRecordSetsByZone.html
         """
         domain = join_domain(subdomain, main_domain) + "."
-        data = self._request(
-            "GET",
-            "/v2.1/zones/" + zone_id + "/recordsets",
-            limit=500,
-            name=domain,
-            type=record_type,
-            line_id=line,
-            search_mode="equal",
-        )
-        records = data.get("recordsets", [])
+        records = self._iter_records(zone_id, name=domain, type=record_type, line_id=line, search_mode="equal")
         record = next((r for r in records if r.get("name") == domain and r.get("type") == record_type), None)
         return record
 
+    def _iter_records(self, zone_id, **filters):
+        """逐页遍历记录 https://support.huaweicloud.com/api-dns/dns_api_64004.html"""
+        offset, limit = 0, 500
+        while True:
+            params = dict(filters, offset=offset) if offset else filters
+            data = self._request("GET", "/v2.1/zones/" + zone_id + "/recordsets", limit=limit, **params)
+            records = data.get("recordsets", []) if isinstance(data, dict) else []
+            for record in records:
+                yield record
+            if len(records) < limit:
+                return
+            offset += limit
+
     def _create_record(self, zone_id, subdomain, main_domain, value, record_type, ttl, line, extra):
         """
         v2.1 https://support.huaweicloud.com/api-dns/dns_api_64001.html
@@ -4,7 +4,7 @@ No-IP (noip.com) Dynamic DNS API
 @author: GitHub Copilot
 """
 
-from ._base import SimpleProvider, TYPE_FORM, quote
+from ._base import SimpleProvider, TYPE_FORM, parse_dyndns2_response, quote
 
 
 class NoipProvider(SimpleProvider):
@@ -20,6 +20,7 @@ class NoipProvider(SimpleProvider):
     content_type = TYPE_FORM
     accept = None  # No-IP returns plain text response
     decode_response = False  # Response is plain text, not JSON
+    batch_size = 20  # dyndns2 accepts a comma-separated hostname list
 
     def _validate(self):
         """
@@ -99,3 +100,29 @@ class NoipProvider(SimpleProvider):
             self.logger.error("Error updating No-IP record for %s: %s", domain, e)
 
         return False
+
+    def set_records(self, domains, value, record_type="A", ttl=None, line=None, **extra):
+        """
+        Update several hostnames to the same IP with a single request
+
+        The hostname parameter takes a comma-separated list and No-IP answers
+        one response code per hostname, in request order.
+        """
+        if len(domains) < 2:
+            return super(NoipProvider, self).set_records(domains, value, record_type, ttl, line, **extra)
+
+        self.logger.info("%s => %s(%s)", ",".join(domains), value, record_type)
+        params = {"hostname": ",".join(domains), "myip": value}
+        try:
+            response = self._http("GET", "/nic/update", queries=params)
+        except Exception as e:
+            self.logger.error("Error updating No-IP records for %s: %s", ",".join(domains), e)
+            return dict.fromkeys(domains, False)
+
+        self.logger.info("No-IP API response: %s", str(response).strip())
+        results = {}
+        for domain, code in parse_dyndns2_response(response, domains).items():
+            results[domain] = code in ("good", "nochg")
+            if not results[domain]:
+                self.logger.error("No-IP update for %s failed: %s", domain, code or "no response")
+        return results
@@ -119,6 +119,20 @@ class TencentCloudProvider(BaseProvider):
         self.logger.debug("Domain ID not found in response for: %s", domain)
         return None
 
+    def _list_zones(self):
+        # type: () -> dict[str, str] | None
+        """列出全部域名 https://cloud.tencent.com/document/api/1427/56172"""
+        zones, offset, limit = {}, 0, 3000
+        while True:
+            response = self._request("DescribeDomainList", Offset=offset, Limit=limit)
+            if not response or not isinstance(response.get("DomainList"), list):
+                return None
+            domains = response["DomainList"]
+            zones.update((d["Name"], str(d["DomainId"])) for d in domains if d.get("Name") and d.get("DomainId"))
+            if len(domains) < limit:
+                return zones
+            offset += limit
+
     def _query_record(self, zone_id, subdomain, main_domain, record_type, line, extra):
         # type: (str, str, str, str, str | None, dict) -> dict | None
         """查询 DNS 记录列表 https://cloud.tencent.com/document/api/1427/56166"""
@@ -63,6 +63,10 @@ class BaseScheduler(object):
         """Get detailed status information"""
         raise NotImplementedError
 
+    def state_files(self):  # type: () -> list[str]
+        """Files or directories whose modification signals a task change, so cached status can be reused"""
+        return []
+
     def install(self, interval, ddns_args=None):  # type: (int, dict | None) -> bool
         """Install DDNS scheduled task"""
         raise NotImplementedError
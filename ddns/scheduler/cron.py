@@ -19,6 +19,14 @@ class CronScheduler(BaseScheduler):
     SCHEDULER_NAME = "cron"
 
     KEY = "# DDNS:"
+    # Debian / RHEL / SUSE / BSD / macOS 的用户 crontab 目录
+    SPOOL_DIRS = (
+        "/var/spool/cron/crontabs",
+        "/var/spool/cron",
+        "/var/spool/cron/tabs",
+        "/var/cron/tabs",
+        "/usr/lib/cron/tabs",
+    )
 
     def _update_crontab(self, lines):  # type: (list[str]) -> bool
         """Update crontab with new content"""
@@ -36,6 +44,10 @@ class CronScheduler(BaseScheduler):
         result = crontab_content or try_run(["crontab", "-l"], logger=self.logger) or ""
         return self.KEY in result
 
+    def state_files(self):  # type: () -> list[str]
+        # crontab 以改名方式替换用户文件, 目录修改时间随之变化; 普通用户不能读取目录内容, 但可以 stat 目录
+        return list(self.SPOOL_DIRS)
+
     def get_status(self):
         status = {"scheduler": "cron", "installed": False}  # type: dict[str, str | bool | int | None]
         # Get crontab content once and reuse it for all checks
@@ -23,6 +23,10 @@ class LaunchdScheduler(BaseScheduler):
     def is_installed(self):
         return os.path.exists(self._get_plist_path())
 
+    def state_files(self):
+        # launchctl load/unload 不修改文件, 只能靠缓存过期发现
+        return [self._get_plist_path()]
+
     def get_status(self):
         # Read plist content once and use it to determine installation status
         content = read_file_safely(self._get_plist_path())
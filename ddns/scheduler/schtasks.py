@@ -32,6 +32,10 @@ class SchtasksScheduler(BaseScheduler):
         result = try_run(["schtasks", "/query", "/tn", self.NAME], logger=self.logger) or ""
         return self.NAME in result
 
+    def state_files(self):
+        # 任务计划程序将任务定义保存在 Tasks 目录, 启用与禁用也会改写该文件
+        return [os.path.join(os.environ.get("SystemRoot", "C:\\Windows"), "System32", "Tasks", self.NAME)]
+
     def get_status(self):
         # Use XML format for language-independent parsing
         task_xml = try_run(["schtasks", "/query", "/tn", self.NAME, "/xml"], logger=self.logger)
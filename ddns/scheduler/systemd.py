@@ -24,6 +24,7 @@ class SystemdScheduler(BaseScheduler):
     TIMER_NAME = "ddns.timer"
     SERVICE_PATH = "/etc/systemd/system/ddns.service"
     TIMER_PATH = "/etc/systemd/system/ddns.timer"
+    WANTS_DIR = "/etc/systemd/system/multi-user.target.wants"  # enable/disable 在此增删链接
 
     def _systemctl(self, *args):
         """Run systemctl command and return success status"""
@@ -34,6 +35,10 @@ class SystemdScheduler(BaseScheduler):
         """Check if systemd timer files exist"""
         return os.path.exists(self.SERVICE_PATH) and os.path.exists(self.TIMER_PATH)
 
+    def state_files(self):
+        """Unit files and the wants directory changed by install, uninstall, enable and disable"""
+        return [self.SERVICE_PATH, self.TIMER_PATH, self.WANTS_DIR]
+
     def get_status(self):
         """Get comprehensive status information"""
         installed = self.is_installed()
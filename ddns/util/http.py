@@ -6,14 +6,18 @@ HTTP utilities module, including ssl, proxies, retry and basicAuth.
 @author: NewFuture
 """
 
+from codecs import getincrementaldecoder
 from logging import getLogger
 from re import compile
 import ssl
 import os
 import time
 import socket
+import zlib
+from threading import BoundedSemaphore, Lock
 
 from .. import __version__
+from . import metrics, timing
 
 try:  # python 3
     from urllib.request import (
@@ -48,6 +52,14 @@ USER_AGENT = "DDNS/{} (ddns@newfuture.cc)".format(__version__ if __version__ !=
 
 logger = getLogger().getChild("http")
 _AUTH_URL_RE = compile(r"^(https?://)([^:/?#]+):([^@]+)@(.+)$")
+# 请求压缩响应，读取时分块解压
+ACCEPT_ENCODING = "gzip, deflate"
+# 并发更新时每个主机的最大同时请求数
+MAX_HOST_CONNECTIONS = 8
+_HOST_RE = compile(r"^[a-zA-Z][\w+.-]*://([^/?#]+)")
+_host_slots = {}  # type: dict[str, BoundedSemaphore]
+_host_slots_lock = Lock()
+CHUNK_SIZE = 64 * 1024
 
 
 def _proxy_handler(proxy):
@@ -65,8 +77,20 @@ def _proxy_handler(proxy):
     return ProxyHandler({"http": proxy, "https": proxy})
 
 
-def request(method, url, data=None, headers=None, proxies=None, verify=True, auth=None, retries=1, timeout=None):
-    # type: (str, str, str | bytes | None, dict[str, str] | None, list[str] | None, bool | str, BaseHandler | None, int, float | None) -> HttpResponse # noqa: E501
+def request(
+    method,
+    url,
+    data=None,
+    headers=None,
+    proxies=None,
+    verify=True,
+    auth=None,
+    retries=1,
+    timeout=None,
+    stream=False,
+    max_size=None,
+):
+    # type: (str, str, str | bytes | None, dict[str, str] | None, list[str] | None, bool | str, BaseHandler | None, int, float | None, bool, int | None) -> HttpResponse # noqa: E501
     """
     发送HTTP/HTTPS请求，支持自动重试和类似requests.request的参数接口
 
@@ -87,6 +111,8 @@ def request(method, url, data=None, headers=None, proxies=None, verify=True, aut
         auth (BaseHandler | None): 自定义认证处理器
         retries (int): 最大重试次数，默认1次
         timeout (float | None): 单次请求超时秒数；默认 GET 60 秒，其他请求 120 秒
+        stream (bool): 流式读取，响应体不预先读取，通过 HttpResponse.iter_text() 逐块获取
+        max_size (int | None): 流式读取时解压后响应体的最大字节数，超出时抛出 ValueError
 
     Returns:
         HttpResponse: 响应对象
@@ -112,6 +138,8 @@ def request(method, url, data=None, headers=None, proxies=None, verify=True, aut
         headers = {}
     if not any(k.lower() == "user-agent" for k in headers.keys()):
         headers["User-Agent"] = USER_AGENT  # 设置默认User-Agent
+    if not any(k.lower() == "accept-encoding" for k in headers.keys()):
+        headers["Accept-Encoding"] = ACCEPT_ENCODING
 
     handlers = [NoHTTPErrorHandler(), AutoSSLHandler(verify), RetryHandler(retries)]
     handlers += [auth] if auth else []
@@ -123,31 +151,129 @@ def request(method, url, data=None, headers=None, proxies=None, verify=True, aut
         h = handlers + ([proxy_handler] if proxy_handler else [])
         return build_opener(*h).open(req, timeout=request_timeout)  # 创建处理器链
 
-    if not proxies:
-        response = run(None)  # 默认
-    else:
-        last_err = None  # type: Exception # type: ignore[assignment]
-        for p in proxies:
-            logger.debug("Trying proxy: %s", p)
-            try:
-                response = run(_proxy_handler(p))  # 尝试使用代理
-                break  # 成功后退出循环
-            except Exception as e:
-                last_err = e
+    slot = _host_slot(url)
+    slot.acquire()  # 限制同一主机的并发请求数
+    try:
+        if not proxies:
+            response = run(None)  # 默认
         else:
-            logger.error("All proxies failed")
-            raise last_err  # 如果所有代理都失败，抛出最后一个错误
-
-    # 处理响应
-    response_headers = response.info()
-    raw_body = response.read()
+            last_err = None  # type: Exception # type: ignore[assignment]
+            for p in proxies:
+                logger.debug("Trying proxy: %s", p)
+                try:
+                    response = run(_proxy_handler(p))  # 尝试使用代理
+                    break  # 成功后退出循环
+                except Exception as e:
+                    last_err = e
+            else:
+                logger.error("All proxies failed")
+                raise last_err  # 如果所有代理都失败，抛出最后一个错误
+
+        # 处理响应
+        response_headers = response.info()
+        status_code = response.getcode()
+        reason = getattr(response, "msg", "")
+        if stream:
+            chunks = _iter_text(response, response_headers, max_size)
+            streamed = HttpResponse(status_code, reason, response_headers, None, chunks, release=slot.release)
+            slot = None  # 流式响应读完或关闭时才释放名额
+            return streamed
+
+        raw_body = _read_body(response, response_headers.get("Content-Encoding"))
+    finally:
+        if slot is not None:
+            slot.release()
     decoded_body = _decode_response_body(raw_body, response_headers.get("Content-Type"))
-    status_code = response.getcode()
-    reason = getattr(response, "msg", "")
-
     return HttpResponse(status_code, reason, response_headers, decoded_body)
 
 
+def _host_slot(url):
+    # type: (str) -> BoundedSemaphore
+    """获取 URL 所属主机的并发信号量 / Per-host semaphore bounding concurrent requests."""
+    m = _HOST_RE.match(url)
+    host = m.group(1).lower() if m else ""
+    with _host_slots_lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = BoundedSemaphore(MAX_HOST_CONNECTIONS)
+        return slot
+
+
+def _read_body(response, content_encoding):
+    # type: (Any, str | None) -> bytes
+    """读取响应体，gzip/deflate 编码时分块读取并增量解压"""
+    encoding = content_encoding.strip().lower() if isinstance(content_encoding, str) else ""
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        return response.read()
+    return b"".join(_iter_body(response, encoding))
+
+
+def _iter_body(response, encoding, max_size=None):
+    # type: (Any, str, int | None) -> Iterator[bytes]
+    """分块读取响应体并按 Content-Encoding 增量解压，结束或中断时关闭响应"""
+    decompressor = None
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        # 32 + MAX_WBITS 自动识别 gzip 与 zlib 头; 部分服务器的 deflate 为无头的原始流
+        decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS)
+    size, first = 0, True
+    try:
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if chunk and decompressor is not None:
+                try:
+                    chunk = decompressor.decompress(chunk)
+                except zlib.error:
+                    if not (first and encoding == "deflate"):
+                        raise
+                    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                    chunk = decompressor.decompress(chunk)
+                first = False
+            elif not chunk:
+                if decompressor is None:
+                    break
+                chunk, decompressor = decompressor.flush(), None
+                if not chunk:
+                    break
+            size += len(chunk)
+            if max_size and size > max_size:
+                raise ValueError("Response body exceeds {} bytes".format(max_size))
+            if chunk:
+                yield chunk
+    finally:
+        response.close()
+
+
+def _iter_text(response, headers, max_size=None):
+    # type: (Any, Any, int | None) -> Iterator[str]
+    """流式读取并按 Content-Type 的 charset 增量解码响应文本，默认 UTF-8"""
+    content_encoding = headers.get("Content-Encoding")
+    encoding = content_encoding.strip().lower() if isinstance(content_encoding, str) else ""
+    try:
+        decoder = getincrementaldecoder(_content_charset(headers.get("Content-Type")) or "utf-8")("replace")
+    except LookupError:
+        decoder = getincrementaldecoder("utf-8")("replace")
+    for chunk in _iter_body(response, encoding, max_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", True)
+    if text:
+        yield text
+
+
+def _content_charset(content_type):
+    # type: (str | None) -> str | None
+    """从 Content-Type 提取 charset 并处理常见别名"""
+    if not content_type or "charset=" not in content_type.lower():
+        return None
+    start = content_type.lower().find("charset=") + 8
+    end = content_type.find(";", start)
+    if end == -1:
+        end = len(content_type)
+    charset = content_type[start:end].strip("'\" ").lower()
+    return {"gb2312": "gbk", "iso-8859-1": "latin-1"}.get(charset, charset)
+
+
 def _decode_response_body(raw_body, content_type):
     # type: (bytes, str | None) -> str
     """解码HTTP响应体，优先使用UTF-8"""
@@ -156,16 +282,8 @@ def _decode_response_body(raw_body, content_type):
 
     # 从Content-Type提取charset
     charsets = ["utf-8", "gbk", "ascii", "latin-1"]
-    if content_type and "charset=" in content_type.lower():
-        start = content_type.lower().find("charset=") + 8
-        end = content_type.find(";", start)
-        if end == -1:
-            end = len(content_type)
-        charset = content_type[start:end].strip("'\" ").lower()
-
-        # 处理常见别名映射
-        charset_aliases = {"gb2312": "gbk", "iso-8859-1": "latin-1"}
-        charset = charset_aliases.get(charset, charset)
+    charset = _content_charset(content_type)
+    if charset is not None:
         if charset in charsets:
             charsets.remove(charset)
         charsets.insert(0, charset)
@@ -183,13 +301,42 @@ def _decode_response_body(raw_body, content_type):
 class HttpResponse(object):
     """HTTP响应封装类"""
 
-    def __init__(self, status, reason, headers, body):
-        # type: (int, str, Any, str) -> None
-        """初始化HTTP响应对象"""
+    def __init__(self, status, reason, headers, body, chunks=None, release=None):
+        # type: (int, str, Any, str | None, Iterator[str] | None, Callable[[], None] | None) -> None
+        """初始化HTTP响应对象, 流式响应的 body 为 None, release 在读完或关闭时调用"""
         self.status = status
         self.reason = reason
         self.headers = headers
         self.body = body
+        self._chunks = chunks
+        self._release = release
+
+    def iter_text(self):
+        # type: () -> Iterator[str]
+        """逐块返回响应文本，非流式响应直接返回完整 body"""
+        if self._chunks is None:
+            return iter([self.body] if self.body else [])
+        return self._iter_chunks()
+
+    def _iter_chunks(self):
+        # type: () -> Iterator[str]
+        try:
+            for chunk in self._chunks:  # type: ignore[union-attr]
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        # type: () -> None
+        """关闭流式响应并释放主机并发名额, 可重复调用"""
+        if self._chunks is not None:
+            self._chunks.close()  # type: ignore[attr-defined]
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __del__(self):
+        self.close()
 
 
 class NoHTTPErrorHandler(HTTPDefaultErrorHandler):  # type: ignore[misc]
@@ -314,9 +461,13 @@ class RetryHandler(BaseHandler):  # type: ignore[misc]
                     if not hasattr(res, "getcode") or res.getcode() not in self.RETRY_CODES:
                         return res  # 成功响应直接返回
                     logger.warning("HTTP %d error, retrying in %d seconds", res.getcode(), 2**attempt)
+                    reason = str(res.getcode())
                 except (socket.timeout, socket.gaierror, socket.herror) as e:
                     logger.warning("Request failed, retrying in %d seconds: %s", 2**attempt, str(e))
+                    reason = "timeout" if isinstance(e, socket.timeout) else "network"
 
+                timing.count("retries")
+                metrics.inc("ddns_http_retries_total", {"reason": reason})
                 time.sleep(2**attempt)
                 continue
             return self.parent.open(req, timeout=req.timeout)  # 最后一次尝试
@@ -0,0 +1,127 @@
+# coding=utf-8
+"""
+JSON 数组流式解析, 逐项解码大型列表响应而不保留完整文本
+Iterative JSON array item parser for large list responses.
+
+@author: NewFuture
+"""
+
+from json import loads as jsondecode
+from re import compile
+
+__all__ = ["iter_json_array"]
+
+# 字符串外只需关注的结构字符, 字符串内只需关注引号和转义
+_STRUCT_RE = compile(r'[\[\]{}",]')
+_STRING_RE = compile(r'["\\]')
+
+
+class _ArrayScanner(object):
+    """iter_json_array 的扫描状态, 跨文本块保留"""
+
+    def __init__(self, path):
+        # type: (tuple[str, ...]) -> None
+        self.path = path
+        self.stack = []  # type: list[list] # [容器类型, 当前键]
+        self.in_string = self.escape = self.expect_key = self.done = False
+        self.capture = None  # type: str | None # "key" 或 "item"
+        self.parts = []  # type: list[str]
+        self.start = 0
+        self.target = 0  # 目标数组所在的栈深度, 0 表示尚未找到
+
+    def feed(self, chunk):
+        # type: (str) -> Iterator[str]
+        """扫描一个文本块, 依次产生其中已完整的数组项文本"""
+        pos, self.start = 0, 0
+        while pos < len(chunk) and not self.done:
+            if self.in_string:
+                pos = self._scan_string(chunk, pos)
+                continue
+            m = _STRUCT_RE.search(chunk, pos)
+            if not m:
+                break
+            pos = m.end()
+            text = self._scan_struct(chunk, m.group(), pos)
+            if text is not None and (text.strip() or not self.done):
+                yield text
+        if self.capture is not None and not self.done:
+            self.parts.append(chunk[self.start :])
+
+    def _scan_string(self, chunk, pos):
+        # type: (str, int) -> int
+        """跳过字符串内容直到结束引号, 捕获对象键; 返回新的扫描位置"""
+        if self.escape:
+            self.escape = False
+            return pos + 1
+        m = _STRING_RE.search(chunk, pos)
+        if not m:
+            return len(chunk)
+        pos = m.end()
+        if m.group() == "\\":
+            self.escape = True
+            return pos
+        self.in_string = False
+        if self.capture == "key":
+            self.parts.append(chunk[self.start : pos - 1])
+            self.stack[-1][1] = jsondecode('"' + "".join(self.parts) + '"')
+            self.capture, self.parts = None, []
+        return pos
+
+    def _scan_struct(self, chunk, char, pos):
+        # type: (str, str, int) -> str | None
+        """处理字符串外的结构字符; 目标数组中一项结束时返回该项文本"""
+        depth = len(self.stack)
+        if char == '"':
+            self.in_string = True
+            if not self.target and self.expect_key and self.stack and self.stack[-1][0] == "{":
+                self.capture, self.start, self.parts, self.expect_key = "key", pos, [], False
+        elif char in "{[":
+            self.stack.append([char, None])
+            self.expect_key = char == "{"
+            if char == "[" and not self.target and all(c == "{" for c, _ in self.stack[:-1]):
+                if tuple(key for _, key in self.stack[:-1]) == self.path:
+                    self.target = depth + 1
+                    self.capture, self.start, self.parts = "item", pos, []
+        elif self.target and depth == self.target:
+            text = "".join(self.parts) + chunk[self.start : pos - 1]
+            self.start, self.parts = pos, []
+            self.done = char != ","  # 目标数组已关闭
+            return text
+        elif char in "}]":
+            if self.stack:
+                self.stack.pop()
+        elif self.stack and self.stack[-1][0] == "{":
+            self.expect_key = True
+        return None
+
+
+def iter_json_array(chunks, path=()):
+    # type: (Iterable[str], tuple[str, ...] | list[str]) -> Iterator[Any]
+    """
+    从文本块中逐项解析 path 指向的 JSON 数组, 每次仅保留当前一项的文本
+
+    Yield the items of the array found at `path` (object keys from the root,
+    e.g. ("result",) for {"result": [...]}) one at a time. Parsing stops as
+    soon as that array is closed, so the rest of the body is never read.
+
+    Args:
+        chunks (Iterable[str]): 响应文本块
+        path (tuple[str, ...]): 数组所在的对象键路径, 空元组表示根数组
+
+    Returns:
+        Iterator[Any]: 数组中的每一项; 未找到数组时不产生任何项
+
+    Raises:
+        ValueError: 数组中的某一项不是合法 JSON
+    """
+    scanner = _ArrayScanner(tuple(path))
+    try:
+        for chunk in chunks:
+            for text in scanner.feed(chunk):
+                yield jsondecode(text)
+            if scanner.done:
+                return
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()  # 提前结束时释放底层响应
@@ -0,0 +1,108 @@
+# coding=utf-8
+"""
+跨进程文件锁, 防止重叠运行
+Inter-process file lock (flock on POSIX, msvcrt on Windows).
+
+@author: NewFuture
+"""
+
+import os
+from time import sleep, time
+
+try:  # POSIX
+    import fcntl
+
+    msvcrt = None
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt  # type: ignore[no-redef]
+
+__all__ = ["FileLock"]
+
+
+class FileLock(object):
+    """
+    基于文件的独占锁, 持有者 PID 写入锁文件, 进程退出时由系统自动释放
+
+    Exclusive lock on a file. The holder writes its PID into the file; the
+    operating system releases the lock when the process exits, so a crashed
+    run never leaves a stale lock behind.
+    """
+
+    def __init__(self, path):
+        # type: (str) -> None
+        self.path = path
+        self._fd = None  # type: int | None
+
+    def acquire(self, timeout=0, interval=0.2):
+        # type: (float, float) -> bool
+        """
+        获取锁
+
+        Args:
+            timeout (float): 等待秒数, 0 表示立即返回, None 表示一直等待
+            interval (float): 重试间隔秒数
+
+        Returns:
+            bool: 是否获取成功
+
+        Raises:
+            OSError: 无法打开锁文件, 如其他用户在共享临时目录留下的锁文件
+        """
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        end = None if timeout is None else time() + timeout
+        while not self._try_lock(fd):
+            if end is not None and time() >= end:
+                os.close(fd)
+                return False
+            sleep(interval if end is None else max(min(interval, end - time()), 0))
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        self._fd = fd
+        return True
+
+    def release(self):
+        # type: () -> None
+        """释放锁 / Release the lock if held."""
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def owner(self):
+        # type: () -> int | None
+        """读取持有者 PID / PID written by the current holder, if readable."""
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0) or None
+        except (IOError, OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _try_lock(fd):
+        # type: (int) -> bool
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except (IOError, OSError):
+            return False
+
+    def __enter__(self):
+        self.acquire(None)
+        return self
+
+    def __exit__(self, *args):
+        self.release()
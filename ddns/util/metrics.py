@@ -0,0 +1,133 @@
+# coding=utf-8
+"""
+进程内的 Prometheus 指标: 计数器、直方图与仪表, 以文本格式导出
+In-process Prometheus metrics: counters, histograms and gauges rendered in the
+text exposition format for the web console's `/metrics` endpoint.
+
+@author: NewFuture
+"""
+
+from __future__ import unicode_literals
+
+from bisect import bisect_left
+from threading import Lock
+
+__all__ = ["BUCKETS", "CONTENT_TYPE", "METRICS", "inc", "observe", "render", "reset", "set_gauge"]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 直方图上界 (秒), 覆盖本机命令到慢速 API 的耗时
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# {指标名: (类型, 说明)}, 导出时按名称排序
+METRICS = {
+    "ddns_api_requests_total": ("counter", "Provider API requests by provider, action and HTTP status."),
+    "ddns_api_request_duration_seconds": ("histogram", "Provider API request latency by provider and action."),
+    "ddns_http_retries_total": ("counter", "HTTP attempts retried after a retryable status or network error."),
+    "ddns_ip_detection_duration_seconds": ("histogram", "IP address detection latency by address family and rule."),
+    "ddns_cache_lookups_total": ("counter", "Record cache lookups by provider and result."),
+    "ddns_sync_duration_seconds": ("histogram", "Duration of one configuration sync by provider and result."),
+    "ddns_sync_last_success_timestamp_seconds": ("gauge", "Unix time of the last successful sync by provider."),
+}
+
+_lock = Lock()
+_values = {}  # type: dict[str, dict[tuple, Any]] # {指标名: {标签: 值}}, 直方图的值为 [各桶计数, 总和, 次数]
+
+
+def _key(labels):
+    # type: (dict | None) -> tuple
+    return tuple(sorted((labels or {}).items()))
+
+
+def inc(name, labels=None, value=1):
+    # type: (str, dict | None, float) -> None
+    """累加计数器 / Increase a counter."""
+    key = _key(labels)
+    with _lock:
+        series = _values.setdefault(name, {})
+        series[key] = series.get(key, 0) + value
+
+
+def set_gauge(name, labels=None, value=0):
+    # type: (str, dict | None, float) -> None
+    """设置仪表的当前值 / Set a gauge."""
+    key = _key(labels)
+    with _lock:
+        _values.setdefault(name, {})[key] = value
+
+
+def observe(name, labels=None, value=0):
+    # type: (str, dict | None, float) -> None
+    """记录一次直方图观测, 如耗时秒数 / Record one histogram observation."""
+    key = _key(labels)
+    index = bisect_left(BUCKETS, value)
+    with _lock:
+        series = _values.setdefault(name, {})
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        histogram[0][index] += 1
+        histogram[1] += value
+        histogram[2] += 1
+
+
+def reset():
+    # type: () -> None
+    """清空全部指标, 供测试使用 / Drop every recorded value."""
+    with _lock:
+        _values.clear()
+
+
+def _escape(value):
+    # type: (Any) -> str
+    return "{}".format(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key, extra=()):
+    # type: (tuple, tuple) -> str
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(name, _escape(value)) for name, value in pairs) + "}"
+
+
+def _number(value):
+    # type: (float) -> str
+    if isinstance(value, int):
+        return str(value)
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def _copy(value):
+    # type: (Any) -> Any
+    return [list(value[0]), value[1], value[2]] if isinstance(value, list) else value
+
+
+def render():
+    # type: () -> str
+    """
+    以 Prometheus 文本格式导出全部指标
+
+    Render every metric that has been recorded in the text exposition format
+    (version 0.0.4); histograms get cumulative `_bucket`, `_sum` and `_count`.
+    """
+    with _lock:
+        snapshot = {name: {key: _copy(value) for key, value in series.items()} for name, series in _values.items()}
+    lines = []
+    for name in sorted(snapshot):
+        kind, help_text = METRICS.get(name, ("untyped", name))
+        lines.append("# HELP {} {}".format(name, help_text))
+        lines.append("# TYPE {} {}".format(name, kind))
+        for key in sorted(snapshot[name]):
+            value = snapshot[name][key]
+            if kind != "histogram":
+                lines.append("{}{} {}".format(name, _labels(key), _number(value)))
+                continue
+            buckets, total, count = value
+            cumulative = 0
+            for bound, observed in zip(BUCKETS + (float("inf"),), buckets):
+                cumulative += observed
+                lines.append("{}_bucket{} {}".format(name, _labels(key, (("le", _number(bound)),)), cumulative))
+            lines.append("{}_sum{} {}".format(name, _labels(key), _number(total)))
+            lines.append("{}_count{} {}".format(name, _labels(key), count))
+    return "\n".join(lines) + "\n" if lines else ""
@@ -0,0 +1,66 @@
+# coding=utf-8
+"""
+有界并发执行, 兼容 Python 2.7 (无需 concurrent.futures)
+Bounded thread-based parallel map, compatible with Python 2.7.
+
+@author: NewFuture
+"""
+
+from threading import Lock, Thread
+
+__all__ = ["parallel_map"]
+
+
+def parallel_map(func, items, workers):
+    # type: (Callable[[Any], Any], Iterable[Any], int) -> list[Any]
+    """
+    以最多 workers 个线程并发执行 func, 按输入顺序返回结果
+
+    Run `func` over `items` with at most `workers` threads and return the results
+    in input order. With a single worker (or item) everything runs inline. The first
+    exception stops further items from being started and is re-raised once every
+    running call has finished.
+
+    Args:
+        func (Callable): 对每一项执行的函数
+        items (Iterable): 输入项
+        workers (int): 最大并发线程数
+
+    Returns:
+        list: 与 items 顺序一致的结果
+    """
+    items = list(items)
+    workers = max(1, min(int(workers), len(items)))
+    if workers == 1:
+        return [func(item) for item in items]
+
+    results = [None] * len(items)  # type: list[Any]
+    errors = []  # type: list[BaseException]
+    tasks = iter(enumerate(items))
+    lock = Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if errors:
+                    return
+                task = next(tasks, None)
+            if task is None:
+                return
+            index, item = task
+            try:
+                results[index] = func(item)
+            except BaseException as e:
+                with lock:
+                    errors.append(e)
+                return
+
+    threads = [Thread(target=worker, name="ddns-worker-{}".format(i)) for i in range(workers)]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
@@ -0,0 +1,178 @@
+# coding=utf-8
+"""
+性能分析: cProfile (pstats/callgrind) 与轻量采样分析器
+Profiling helpers: cProfile with pstats or callgrind output, and a lightweight
+stack sampler for long-running web and daemon modes.
+
+@author: NewFuture
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sys
+from io import open
+from logging import getLogger
+from threading import Event, Thread
+
+try:
+    from cProfile import Profile
+except ImportError:  # 精简的 Python 构建可能缺少 cProfile
+    from profile import Profile  # type: ignore[assignment,no-redef]
+
+__all__ = ["SamplingProfiler", "profile_call", "profile_format", "write_callgrind"]
+
+logger = getLogger().getChild("profiler")
+
+
+def profile_format(path):
+    # type: (str) -> str
+    """
+    根据文件名选择输出格式: *.callgrind / callgrind.out.* 为 callgrind, *.folded 为采样, 其他为 pstats
+
+    Returns:
+        str: "callgrind" | "sample" | "pstats"
+    """
+    name = os.path.basename(path).lower()
+    if name.endswith(".callgrind") or name.startswith("callgrind.out"):
+        return "callgrind"
+    if name.endswith(".folded"):
+        return "sample"
+    return "pstats"
+
+
+def _callgrind_name(func):
+    # type: (tuple[str, int, str]) -> tuple[str, str]
+    filename, line, name = func
+    if filename == "~":  # 内置函数
+        return "~", name
+    return filename, "{}:{}".format(name, line)
+
+
+def write_callgrind(stats, path):
+    # type: (dict, str) -> None
+    """
+    将 pstats 的统计数据写为 callgrind 格式, 可用 KCachegrind/QCachegrind 查看
+
+    Args:
+        stats (dict): pstats.Stats(...).stats, {func: (cc, nc, tt, ct, callers)}
+        path (str): 输出文件路径
+    """
+    callees = {}  # type: dict[tuple, list[tuple[tuple, int, float]]]
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, value in callers.items():
+            calls, cumulative = (value[1], value[3]) if isinstance(value, tuple) else (value, 0)
+            callees.setdefault(caller, []).append((func, calls, cumulative))
+
+    lines = ["# callgrind format", "version: 1", "creator: ddns", "events: Microseconds", ""]
+    for func, (_, _, total, _, _) in sorted(stats.items()):
+        filename, name = _callgrind_name(func)
+        lines += ["fl=" + filename, "fn=" + name, "{} {}".format(func[1], int(total * 1e6))]
+        for callee, calls, cumulative in callees.get(func, ()):
+            callee_file, callee_name = _callgrind_name(callee)
+            lines += [
+                "cfl=" + callee_file,
+                "cfn=" + callee_name,
+                "calls={} {}".format(calls, callee[1]),
+                "{} {}".format(func[1], int(cumulative * 1e6)),
+            ]
+        lines.append("")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+
+
+def profile_call(path, func, *args, **kwargs):
+    # type: (str, Callable, *Any, **Any) -> Any
+    """
+    在分析器中执行 func, 退出时 (包括 sys.exit) 写出分析结果
+
+    Run `func` under cProfile (or the stack sampler for *.folded paths) and
+    write the result to `path` when it returns, raises or exits. cProfile only
+    sees the calling thread; work done in pool or web threads needs *.folded.
+    """
+    if profile_format(path) == "sample":
+        sampler = SamplingProfiler(path)
+        sampler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.stop()
+
+    profiler = Profile()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        if profile_format(path) == "callgrind":
+            profiler.create_stats()
+            write_callgrind(profiler.stats, path)
+        else:
+            profiler.dump_stats(path)
+        logger.info("Profile written to %s", path)
+
+
+class SamplingProfiler(object):
+    """
+    轻量采样分析器: 定期记录所有线程的调用栈, 输出 flamegraph 可用的折叠栈格式
+
+    Periodically samples the stacks of all threads and writes them in the folded
+    format ("frame;frame;frame count") understood by flamegraph tools. The file
+    is rewritten every `flush_interval` seconds so a long-running daemon can be
+    inspected without stopping it.
+    """
+
+    def __init__(self, path, interval=0.01, flush_interval=60):
+        # type: (str, float, float) -> None
+        self.path = path
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.samples = {}  # type: dict[str, int]
+        self._stopped = Event()
+        self._thread = None  # type: Thread | None
+
+    def start(self):
+        # type: () -> None
+        self._thread = Thread(target=self._run, name="ddns-profiler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        # type: () -> None
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        logger.info("Profile samples written to %s", self.path)
+
+    def sample(self):
+        # type: () -> None
+        """记录一次所有线程 (除自身外) 的调用栈"""
+        own = self._thread.ident if self._thread is not None else None
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append("{} ({}:{})".format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno))
+                frame = frame.f_back
+            key = ";".join(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+
+    def flush(self):
+        # type: () -> None
+        """写出当前的折叠栈统计"""
+        lines = ["{} {}".format(stack, n) for stack, n in sorted(self.samples.items())]
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def _run(self):
+        # type: () -> None
+        waited = 0.0
+        while not self._stopped.wait(self.interval):
+            self.sample()
+            waited += self.interval
+            if waited >= self.flush_interval:
+                self.flush()
+                waited = 0.0
@@ -0,0 +1,77 @@
+# coding=utf-8
+"""
+相同只读请求的合并执行 (singleflight)
+Coalesce identical in-flight read-only calls.
+
+@author: NewFuture
+"""
+
+from threading import Event, Lock
+
+__all__ = ["SingleFlight"]
+
+
+class _Call(object):
+    """一次进行中的调用 / An in-flight call shared by all waiters."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None  # type: BaseException | None
+
+
+class SingleFlight(object):
+    """
+    相同 key 的并发调用只执行一次, 其余调用方等待并共享其结果或异常
+
+    Concurrent calls with the same key run the function once; the other callers
+    wait for that result (or exception). Nothing is cached once the call returns,
+    so only use it for read-only calls whose results are not mutated.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}  # type: dict[Hashable, _Call]
+
+    def do(self, key, func, *args, **kwargs):
+        # type: (Hashable, Callable, *Any, **Any) -> Any
+        """
+        执行 func 或等待相同 key 的进行中调用
+
+        Args:
+            key (Hashable): 调用标识, 如 (provider, action, params)
+            func (Callable): 实际执行的函数
+
+        Returns:
+            Any: func 的返回值
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def __len__(self):
+        # type: () -> int
+        """进行中的调用数 / Number of in-flight calls."""
+        with self._lock:
+            return len(self._calls)
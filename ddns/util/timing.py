@@ -0,0 +1,139 @@
+# coding=utf-8
+"""
+运行阶段计时与计数, 生成机器可读的运行报告
+Per-phase timers and counters for machine-readable run reports.
+
+@author: NewFuture
+"""
+
+from contextlib import contextmanager
+from threading import Lock, local
+
+try:  # python 3
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic  # type: ignore[no-redef]
+
+__all__ = ["Stats", "collect", "count", "current", "current_phase", "monotonic", "phase"]
+
+_local = local()
+
+
+def _add(target, name, seconds):
+    # type: (dict, str, float) -> None
+    entry = target.get(name)
+    if entry is None:
+        target[name] = {"count": 1, "seconds": seconds}
+    else:
+        entry["count"] += 1
+        entry["seconds"] += seconds
+
+
+class Stats(object):
+    """
+    单个配置的阶段耗时、计数器与每个域名的明细, 可在多个线程中共享
+
+    Phase timings and counters of one config run, with per-domain details.
+    Safe to share between the threads updating the config's domains.
+    """
+
+    def __init__(self, **info):
+        self.info = info  # type: dict # 配置标识, 如 index/dns
+        self.phases = {}  # type: dict[str, dict] # {阶段: {"count": n, "seconds": s}}
+        self.counters = {}  # type: dict[str, int]
+        self.domains = {}  # type: dict[str, dict] # {"域名[类型]": 明细}
+        self._lock = Lock()
+
+    def _domain(self, key):
+        # type: (str) -> dict
+        return self.domains.setdefault(key, {"phases": {}, "counters": {}})
+
+    def add_phase(self, name, seconds, keys=()):
+        # type: (str, float, Iterable[str]) -> None
+        """记录一次阶段耗时, 同时计入 keys 对应的域名"""
+        with self._lock:
+            _add(self.phases, name, seconds)
+            for key in keys:
+                _add(self._domain(key)["phases"], name, seconds)
+
+    def incr(self, name, n=1, keys=()):
+        # type: (str, int, Iterable[str]) -> None
+        """累加计数器, 同时计入 keys 对应的域名"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+            for key in keys:
+                counters = self._domain(key)["counters"]
+                counters[name] = counters.get(name, 0) + n
+
+    def note(self, key, **fields):
+        # type: (str, **Any) -> None
+        """记录域名明细字段, 如 cache="hit" 或 result="updated" """
+        with self._lock:
+            self._domain(key).update(fields)
+
+    def to_dict(self):
+        # type: () -> dict
+        """导出为可 JSON 序列化的字典, 耗时保留到毫秒"""
+
+        def rounded(phases):
+            return {k: {"count": v["count"], "seconds": round(v["seconds"], 3)} for k, v in phases.items()}
+
+        with self._lock:
+            domains = {}
+            for key, detail in self.domains.items():
+                detail = dict(detail, phases=rounded(detail["phases"]), counters=dict(detail["counters"]))
+                domains[key] = detail
+            return dict(self.info, phases=rounded(self.phases), counters=dict(self.counters), domains=domains)
+
+
+def current():
+    # type: () -> Stats | None
+    """当前线程正在收集的统计 / Stats collected by the current thread, if any."""
+    return getattr(_local, "stats", None)
+
+
+@contextmanager
+def collect(stats, keys=()):
+    # type: (Stats | None, Iterable[str]) -> Iterator[Stats | None]
+    """
+    在当前线程中将计时与计数写入 stats, keys 为归属的域名
+
+    Route `phase`/`count` of the current thread into `stats`, attributing them
+    to the given domain keys. Nested calls restore the outer scope on exit.
+    """
+    previous = (getattr(_local, "stats", None), getattr(_local, "keys", ()))
+    _local.stats, _local.keys = stats, tuple(keys)
+    try:
+        yield stats
+    finally:
+        _local.stats, _local.keys = previous
+
+
+def current_phase():
+    # type: () -> str | None
+    """当前线程最内层的阶段名, 供指标标注请求 / Innermost phase of the current thread."""
+    return getattr(_local, "phase", None)
+
+
+@contextmanager
+def phase(name):
+    # type: (str) -> Iterator[None]
+    """以单调时钟记录代码块耗时, 未在收集时只记录阶段名 / Time a block with a monotonic clock."""
+    outer = getattr(_local, "phase", None)
+    _local.phase = name
+    stats = current()
+    start = monotonic() if stats is not None else 0
+    try:
+        yield
+    finally:
+        _local.phase = outer
+        if stats is not None:
+            stats.add_phase(name, monotonic() - start, _local.keys)
+
+
+def count(name, n=1):
+    # type: (str, int) -> None
+    """累加当前线程的计数器, 如 api_calls / retries"""
+    stats = current()
+    if stats is not None:
+        stats.incr(name, n, _local.keys)
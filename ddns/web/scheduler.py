@@ -19,10 +19,11 @@ MINUTE_SECONDS = 60
 class WebScheduler(object):
     """Run one guarded synchronization at a fixed interval."""
 
-    def __init__(self, callback, interval=5, enabled=True, guard=None, logger=None):
-        # type: (object, int, bool, object | None, logging.Logger | None) -> None
+    def __init__(self, callback, interval=5, enabled=True, guard=None, logger=None, listener=None):
+        # type: (object, int, bool, object | None, logging.Logger | None, object | None) -> None
         self._callback = callback
         self._guard = guard
+        self._listener = listener
         self._logger = (logger or logging.getLogger()).getChild("scheduler")
         self._condition = threading.Condition()
         self._clock = getattr(time, "monotonic", time.time)
@@ -51,6 +52,16 @@ class WebScheduler(object):
             raise ValueError("Web scheduler interval must be between 1 and 1440 minutes.")
         return parsed
 
+    def _notify(self):
+        # type: () -> None
+        # 状态变化通知在锁外调用, 监听器可以安全地读取 status()
+        if self._listener is None:
+            return
+        try:
+            self._listener()
+        except Exception:
+            self._logger.exception("Web scheduler listener failed")
+
     def _schedule_next_locked(self):
         # type: () -> None
         self._next_run = (
@@ -70,6 +81,7 @@ class WebScheduler(object):
             self._thread.daemon = True
             self._schedule_next_locked()
             self._thread.start()
+        self._notify()
 
     def stop(self):
         # type: () -> None
@@ -100,6 +112,7 @@ class WebScheduler(object):
             self._blocked_reason = None
             self._schedule_next_locked()
             self._condition.notify_all()
+        self._notify()
         return self.status()
 
     def status(self):
@@ -165,9 +178,12 @@ class WebScheduler(object):
                 if not allowed:
                     self._blocked_reason = reason
                     self._schedule_next_locked()
-                    continue
-                self._blocked_reason = None
-                self._running = True
+                else:
+                    self._blocked_reason = None
+                    self._running = True
+            self._notify()
+            if not allowed:
+                continue
 
             error_message = None
             try:
@@ -182,3 +198,4 @@ class WebScheduler(object):
                     self._last_error = error_message
                     self._schedule_next_locked()
                     self._condition.notify_all()
+                self._notify()
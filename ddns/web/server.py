@@ -4,6 +4,9 @@
 from __future__ import unicode_literals
 
 import binascii
+import gzip
+import hashlib
+import io
 import json
 import logging
 import os
@@ -15,14 +18,15 @@ import time
 import webbrowser
 
 try:
+    import queue
     from http.server import BaseHTTPRequestHandler, HTTPServer
-    from socketserver import ThreadingMixIn
-    from urllib.parse import urlparse
+    from urllib.parse import parse_qs, urlparse
 except ImportError:  # Python 2
+    import Queue as queue  # type: ignore[no-redef]
     from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
-    from SocketServer import ThreadingMixIn
-    from urlparse import urlparse
+    from urlparse import parse_qs, urlparse
 
+from ..util import metrics
 from .service import DashboardError, DashboardService
 
 try:
@@ -39,7 +43,27 @@ STATIC_ASSETS = {
 INDEX_PATHS = ("/", "/index.html", "/dashboard", "/dashboard/")
 MAX_BODY_SIZE = 2 * 1024 * 1024
 LAUNCH_PATH_PREFIX = "/launch/"
+SYNC_JOB_PATH_PREFIX = "/api/sync/"
+EVENTS_PATH = "/api/events"
+EVENT_TICKET_PATH = "/api/events/ticket"
+METRICS_PATH = "/metrics"
+EVENT_HEARTBEAT_SECONDS = 15
+EVENT_RETRY_MILLISECONDS = 3000
 LAUNCH_TOKEN_TTL = 60
+EVENT_TICKET_TTL = 30
+GZIP_MIN_SIZE = 512
+DEFAULT_WORKERS = 8
+MAX_WORKERS = 64
+QUEUE_PER_WORKER = 4
+CONNECTION_TIMEOUT = 10
+# 需要访问令牌的 GET 接口: 路径 -> 处理方法名, /api/sync/<id> 按前缀匹配
+API_GET_ROUTES = {
+    "/api/dashboard": "_get_dashboard",
+    "/api/config": "_get_config",
+    "/api/records": "_get_records",
+    "/api/sync": "_get_sync_jobs",
+    EVENTS_PATH: "_send_events",
+}
 SOURCE_ASSET_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "web"))
 PACKAGED_ASSET_ROOT = os.path.join(os.path.dirname(__file__), "static")
 
@@ -56,11 +80,72 @@ def _write_stdout(message):
     sys.stdout.flush()
 
 
-class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
-    """HTTP server that keeps slow dashboard operations isolated."""
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTP server that serves connections from a fixed pool of worker threads.
+
+    Accepted connections wait in a bounded queue; when it is full the
+    connection is answered with 503 at once, so a burst of clients cannot
+    grow the thread count or memory use.
+    """
 
     allow_reuse_address = False
-    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS):
+        # type: (tuple, type, int) -> None
+        HTTPServer.__init__(self, server_address, handler_class)
+        self.workers = workers
+        self.stopping = threading.Event()
+        # 事件流长期占用工作线程, 至多占用一半, 其余留给普通请求
+        self.event_streams = threading.BoundedSemaphore(max(1, workers // 2))
+        self._pending = queue.Queue(workers * QUEUE_PER_WORKER)
+        self._busy_lock = threading.Lock()
+        self.busy_workers = 0
+        self._worker_threads = []
+        for index in range(workers):
+            thread = threading.Thread(target=self._work, name="ddns-web-{}".format(index))
+            thread.daemon = True
+            thread.start()
+            self._worker_threads.append(thread)
+
+    def process_request(self, request, client_address):
+        # type: (socket.socket, tuple) -> None
+        try:
+            self._pending.put_nowait((request, client_address))
+        except queue.Full:
+            self._reject(request)
+
+    def _reject(self, request):
+        # type: (socket.socket) -> None
+        try:
+            request.settimeout(0.1)
+            request.sendall(BUSY_RESPONSE)
+            request.shutdown(socket.SHUT_WR)
+            # 读掉已到达的请求, 避免关闭时发送 RST 使客户端收不到 503
+            while request.recv(4096):
+                pass
+        except (IOError, OSError):
+            pass
+        finally:
+            request.close()
+
+    def _work(self):
+        # type: () -> None
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            request, client_address = item
+            with self._busy_lock:
+                self.busy_workers += 1
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._busy_lock:
+                    self.busy_workers -= 1
 
     def server_bind(self):
         # type: () -> None
@@ -68,6 +153,24 @@ class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
         HTTPServer.server_bind(self)
 
+    def server_close(self):
+        # type: () -> None
+        # 通知事件流在下一次心跳时结束, 并让空闲的工作线程退出
+        self.stopping.set()
+        HTTPServer.server_close(self)
+        while True:
+            try:
+                item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.shutdown_request(item[0])
+        for _ in self._worker_threads:
+            try:
+                self._pending.put_nowait(None)
+            except queue.Full:
+                break
+
     def issue_launch_token(self):
         # type: () -> str
         """Create a short-lived, single-use browser bootstrap token."""
@@ -87,8 +190,26 @@ class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
                 self.launch_token_expires = 0
             return valid
 
+    def issue_event_ticket(self):
+        # type: () -> str
+        """Create a short-lived, single-use ticket that authorizes one event stream."""
+        ticket = binascii.hexlify(os.urandom(24)).decode("ascii")
+        now = time.time()
+        with self.launch_token_lock:
+            for stale in [key for key, expires in self.event_tickets.items() if expires < now]:
+                del self.event_tickets[stale]
+            self.event_tickets[ticket] = now + EVENT_TICKET_TTL
+        return ticket
+
+    def consume_event_ticket(self, ticket):
+        # type: (str | None) -> bool
+        """Consume an event stream ticket exactly once."""
+        with self.launch_token_lock:
+            expires = self.event_tickets.pop(ticket, None) if ticket else None
+        return expires is not None and time.time() <= expires
+
 
-class ThreadingHTTPServerV6(ThreadingHTTPServer):
+class PooledHTTPServerV6(PooledHTTPServer):
     """IPv6 loopback variant of the dashboard server."""
 
     address_family = socket.AF_INET6
@@ -119,6 +240,63 @@ def _resource_bytes(asset_name):
     return content
 
 
+_ASSET_CACHE = {}  # type: dict[str, dict]
+_ASSET_CACHE_LOCK = threading.Lock()
+
+
+def _gzip_bytes(content):
+    # type: (bytes) -> bytes
+    buffer = io.BytesIO()
+    # 固定 mtime, 同一内容的压缩结果与 ETag 保持稳定
+    with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9, mtime=0) as gzip_file:
+        gzip_file.write(content)
+    return buffer.getvalue()
+
+
+def _cached_asset(asset_name):
+    # type: (str) -> dict
+    """Load an asset once with its precomputed gzip variant and strong ETags."""
+    with _ASSET_CACHE_LOCK:
+        asset = _ASSET_CACHE.get(asset_name)
+        if asset is None:
+            content = _resource_bytes(asset_name)
+            digest = hashlib.sha256(content).hexdigest()[:32]
+            compressed = _gzip_bytes(content) if len(content) >= GZIP_MIN_SIZE else None
+            if compressed is not None and len(compressed) >= len(content):
+                compressed = None
+            asset = {
+                "identity": (content, '"{}"'.format(digest)),
+                "gzip": None if compressed is None else (compressed, '"{}-gzip"'.format(digest)),
+            }
+            _ASSET_CACHE[asset_name] = asset
+        return asset
+
+
+def _accepts_gzip(accept_encoding):
+    # type: (str) -> bool
+    for item in accept_encoding.split(","):
+        parts = [part.strip().lower() for part in item.split(";")]
+        if parts[0] not in ("gzip", "*"):
+            continue
+        for parameter in parts[1:]:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _etag_matches(if_none_match, etags):
+    # type: (str, tuple) -> bool
+    candidates = [item.strip() for item in if_none_match.split(",")]
+    # If-None-Match 使用弱比较
+    candidates = [item[2:] if item.startswith("W/") else item for item in candidates]
+    return "*" in candidates or any(etag in candidates for etag in etags)
+
+
 def _json_bytes(payload):
     # type: (dict | list) -> bytes
     content = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
@@ -127,6 +305,17 @@ def _json_bytes(payload):
     return content
 
 
+_BUSY_BODY = _json_bytes({"error": {"code": "server_busy", "message": "Dashboard is busy, retry shortly."}})
+BUSY_RESPONSE = (
+    b"HTTP/1.1 503 Service Unavailable\r\n"
+    b"Content-Type: application/json; charset=utf-8\r\n"
+    b"Retry-After: 1\r\n"
+    b"Cache-Control: no-store\r\n"
+    b"Connection: close\r\n"
+    b"Content-Length: " + str(len(_BUSY_BODY)).encode("ascii") + b"\r\n\r\n" + _BUSY_BODY
+)
+
+
 def _local_hostname(host_header):
     # type: (str) -> bool
     try:
@@ -142,6 +331,8 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
     protocol_version = "HTTP/1.1"
     server_version = "DDNS"
     sys_version = ""
+    # 空闲的长连接或缓慢的客户端不能无限期占用工作线程
+    timeout = CONNECTION_TIMEOUT
 
     @property
     def service(self):
@@ -155,7 +346,12 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
 
     def log_message(self, format_string, *args):
         # type: (str, *object) -> None
-        self.server.logger.info("%s - %s", self.address_string(), format_string % args)  # type: ignore[attr-defined]
+        message = format_string % args
+        request_path = getattr(self, "path", "")
+        if "?" in request_path:
+            # 查询参数可能携带事件流票据等凭据, 访问日志只记录路径
+            message = message.replace(request_path, urlparse(request_path).path)
+        self.server.logger.info("%s - %s", self.address_string(), message)  # type: ignore[attr-defined]
 
     def _security_headers(self):
         # type: () -> None
@@ -172,6 +368,19 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
             "frame-ancestors 'none'; form-action 'self'; object-src 'none'",
         )
 
+    def parse_request(self):
+        # type: () -> bool
+        self._body_read = False
+        return BaseHTTPRequestHandler.parse_request(self)
+
+    def _end_headers(self):
+        # type: () -> None
+        # 请求体未读取时无法复用连接, 否则剩余字节会被当作下一个请求
+        if self.command in ("POST", "PUT") and not getattr(self, "_body_read", True):
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+
     def _send_bytes(self, status, content, content_type, cache_control="no-store", head_only=False):
         # type: (int, bytes, str, str, bool) -> None
         self.send_response(status)
@@ -179,10 +388,33 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
         self.send_header("Content-Length", str(len(content)))
         self.send_header("Cache-Control", cache_control)
         self._security_headers()
-        self.end_headers()
+        self._end_headers()
         if not head_only and self.command != "HEAD":
             self.wfile.write(content)
 
+    def _send_asset(self, asset_name, content_type, head_only=False):
+        # type: (str, str, bool) -> None
+        asset = _cached_asset(asset_name)
+        variant = asset["gzip"] if asset["gzip"] and _accepts_gzip(self.headers.get("Accept-Encoding", "")) else None
+        content, etag = variant or asset["identity"]
+        if_none_match = self.headers.get("If-None-Match")
+        etags = tuple(item[1] for item in (asset["identity"], asset["gzip"]) if item)
+        not_modified = if_none_match is not None and _etag_matches(if_none_match, etags)
+        self.send_response(304 if not_modified else 200)
+        if not not_modified:
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(content)))
+            if variant:
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        if asset["gzip"]:
+            self.send_header("Vary", "Accept-Encoding")
+        self._security_headers()
+        self.end_headers()
+        if not not_modified and not head_only and self.command != "HEAD":
+            self.wfile.write(content)
+
     def _send_json(self, status, payload, head_only=False):
         # type: (int, dict | list, bool) -> None
         self._send_bytes(status, _json_bytes(payload), "application/json; charset=utf-8", head_only=head_only)
@@ -214,7 +446,14 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
 
     def _request_has_token(self):
         # type: () -> bool
-        if self.headers.get("X-DDNS-Token") == self.access_token:
+        token = self.headers.get("X-DDNS-Token")
+        url = urlparse(self.path)
+        if token is None and url.path == EVENTS_PATH:
+            # EventSource 无法设置请求头, 事件流使用 POST 换取的一次性票据, 访问令牌不出现在 URL 中
+            ticket = parse_qs(url.query).get("ticket", [None])[-1]
+            if self.server.consume_event_ticket(ticket):  # type: ignore[attr-defined]
+                return True
+        elif token == self.access_token:
             return True
         self._send_json(403, {"error": {"code": "invalid_token", "message": "Dashboard request token is invalid."}})
         return False
@@ -246,6 +485,7 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
             error.code = "payload_too_large"
             raise error
         content = self.rfile.read(content_length)
+        self._body_read = True
         try:
             payload = json.loads(content.decode("utf-8"))
         except (UnicodeDecodeError, TypeError, ValueError):
@@ -260,41 +500,138 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
             raise error
         return payload
 
+    def _last_event_id(self):
+        # type: () -> int
+        value = self.headers.get("Last-Event-ID")
+        if value is None:
+            value = parse_qs(urlparse(self.path).query).get("last_event_id", [None])[-1]
+        if value is None:
+            return self.service.latest_event_id()
+        try:
+            return max(0, int(value))
+        except (TypeError, ValueError):
+            return self.service.latest_event_id()
+
+    def _send_events(self, head_only=False):
+        # type: (bool) -> None
+        """Stream dashboard events until the client disconnects or the server stops."""
+        streams = self.server.event_streams  # type: ignore[attr-defined]
+        if not streams.acquire(False):
+            self._send_json(
+                503, {"error": {"code": "server_busy", "message": "Too many event streams."}}, head_only=head_only
+            )
+            return
+        try:
+            self._stream_events(head_only)
+        finally:
+            streams.release()
+
+    def _stream_events(self, head_only):
+        # type: (bool) -> None
+        last_event_id = self._last_event_id()
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.send_header("X-Accel-Buffering", "no")
+        self._security_headers()
+        self.end_headers()
+        if head_only or self.command == "HEAD":
+            return
+        stopping = self.server.stopping  # type: ignore[attr-defined]
+        try:
+            self.wfile.write("retry: {}\n\n".format(EVENT_RETRY_MILLISECONDS).encode("utf-8"))
+            self.wfile.flush()
+            while not stopping.is_set():
+                events = self.service.wait_events(last_event_id, EVENT_HEARTBEAT_SECONDS)
+                if not events:
+                    self.wfile.write(b": heartbeat\n\n")
+                for event in events:
+                    last_event_id = event["id"]
+                    header = "id: {}\nevent: {}\ndata: ".format(event["id"], event["event"]).encode("utf-8")
+                    self.wfile.write(header + _json_bytes(event["data"]) + b"\n\n")
+                self.wfile.flush()
+        except (IOError, OSError):
+            # 客户端断开后 EventSource 会携带 Last-Event-ID 重连
+            return
+
     def _handle_get(self, head_only=False):
         # type: (bool) -> None
         if not self._request_is_local():
             return
         path = urlparse(self.path).path
         if path.startswith(LAUNCH_PATH_PREFIX):
-            launch_token = path[len(LAUNCH_PATH_PREFIX) :]
-            if head_only or not self.server.consume_launch_token(launch_token):  # type: ignore[attr-defined]
-                self._send_json(
-                    403,
-                    {"error": {"code": "invalid_launch_token", "message": "Dashboard launch token is invalid."}},
-                    head_only=head_only,
-                )
-                return
-            self._send_redirect("/#token={}&view=overview".format(self.access_token))
+            self._get_launch(path[len(LAUNCH_PATH_PREFIX) :], head_only)
             return
         if path in INDEX_PATHS:
-            content = _resource_bytes("index.html")
-            self._send_bytes(200, content, "text/html; charset=utf-8", head_only=head_only)
+            self._send_asset("index.html", "text/html; charset=utf-8", head_only=head_only)
             return
         if path in STATIC_ASSETS:
             resource_path, content_type = STATIC_ASSETS[path]
-            self._send_bytes(
-                200, _resource_bytes(resource_path), content_type, cache_control="no-cache", head_only=head_only
-            )
+            self._send_asset(resource_path, content_type, head_only=head_only)
+            return
+        if path == METRICS_PATH:
+            # 指标不含凭据, 本机的 Prometheus 无法获知每次启动随机生成的令牌, 因此只校验本机 Host
+            self._send_bytes(200, metrics.render().encode("utf-8"), metrics.CONTENT_TYPE, head_only=head_only)
             return
         if path.startswith("/api/") and not self._request_has_token():
             return
-        if path == "/api/dashboard":
-            self._send_json(200, self.service.dashboard(), head_only=head_only)
+        handler = API_GET_ROUTES.get(path)
+        if handler is None and path.startswith(SYNC_JOB_PATH_PREFIX):
+            handler = "_get_sync_job"
+        if handler is None:
+            self._send_not_found()
             return
-        if path == "/api/config":
-            self._send_json(200, self.service.config_state(), head_only=head_only)
+        getattr(self, handler)(head_only)
+
+    def _query_params(self):
+        # type: () -> dict[str, str]
+        """Return the last value of each query parameter."""
+        return {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+    def _get_launch(self, launch_token, head_only):
+        # type: (str, bool) -> None
+        if head_only or not self.server.consume_launch_token(launch_token):  # type: ignore[attr-defined]
+            self._send_json(
+                403,
+                {"error": {"code": "invalid_launch_token", "message": "Dashboard launch token is invalid."}},
+                head_only=head_only,
+            )
             return
-        self._send_not_found()
+        self._send_redirect("/#token={}&view=overview".format(self.access_token))
+
+    def _get_dashboard(self, head_only):
+        # type: (bool) -> None
+        since = self._query_params().get("since")
+        self._send_json(200, self.service.dashboard(since=since), head_only=head_only)
+
+    def _get_config(self, head_only):
+        # type: (bool) -> None
+        self._send_json(200, self.service.config_state(), head_only=head_only)
+
+    def _get_records(self, head_only):
+        # type: (bool) -> None
+        params = self._query_params()
+        records = self.service.records(
+            provider=params.get("provider") or None,
+            record_type=params.get("type") or None,
+            query=params.get("q") or None,
+            sort=params.get("sort", "domain"),
+            order=params.get("order", "asc"),
+            cursor=params.get("cursor") or None,
+            limit=params.get("limit"),
+        )
+        self._send_json(200, records, head_only=head_only)
+
+    def _get_sync_jobs(self, head_only):
+        # type: (bool) -> None
+        self._send_json(200, {"jobs": self.service.sync_jobs()}, head_only=head_only)
+
+    def _get_sync_job(self, head_only):
+        # type: (bool) -> None
+        job_id = urlparse(self.path).path[len(SYNC_JOB_PATH_PREFIX) :]
+        self._send_json(200, {"job": self.service.sync_job(job_id)}, head_only=head_only)
 
     def do_GET(self):
         # type: () -> None
@@ -341,7 +678,10 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
         try:
             payload = self._read_json()
             if path == "/api/sync":
-                self._send_json(200, self.service.sync())
+                self._send_json(202, {"job": self.service.start_sync(parallelism=payload.get("parallelism", 1))})
+            elif path == EVENT_TICKET_PATH:
+                ticket = self.server.issue_event_ticket()  # type: ignore[attr-defined]
+                self._send_json(200, {"ticket": ticket, "expires_in": EVENT_TICKET_TTL})
             elif path == "/api/config/validate":
                 self._send_json(200, {"config": self.service.validate(payload.get("config"))})
             elif path == "/api/config/restore":
@@ -364,29 +704,34 @@ class DashboardRequestHandler(BaseHTTPRequestHandler):
         self._send_json(405, {"error": {"code": "method_not_allowed", "message": "CORS is not enabled."}})
 
 
-def create_server(service=None, host="127.0.0.1", port=9876, logger=None):
-    # type: (DashboardService | None, str, int, logging.Logger | None) -> ThreadingHTTPServer
+def create_server(service=None, host="127.0.0.1", port=9876, logger=None, workers=DEFAULT_WORKERS):
+    # type: (DashboardService | None, str, int, logging.Logger | None, int) -> PooledHTTPServer
     """Create a local dashboard server without starting its loop."""
     if host not in ("127.0.0.1", "localhost", "::1"):
         raise ValueError("Dashboard host must be a loopback address.")
+    if isinstance(workers, bool) or not isinstance(workers, int) or not 1 <= workers <= MAX_WORKERS:
+        raise ValueError("Dashboard workers must be between 1 and {}.".format(MAX_WORKERS))
     logger = (logger or logging.getLogger()).getChild("web.server")
-    server_class = ThreadingHTTPServerV6 if host == "::1" else ThreadingHTTPServer
-    server = server_class((host, port), DashboardRequestHandler)
+    server_class = PooledHTTPServerV6 if host == "::1" else PooledHTTPServer
+    server = server_class((host, port), DashboardRequestHandler, workers=workers)
     server.dashboard_service = service or DashboardService(logger=logger)
     server.access_token = binascii.hexlify(os.urandom(24)).decode("ascii")
     server.launch_token_lock = threading.Lock()
     server.launch_token = None
     server.launch_token_expires = 0
+    server.event_tickets = {}
     server.logger = logger
     return server
 
 
-def serve(config_path=None, host="127.0.0.1", port=9876, open_browser=False, logger=None, interval=5):
-    # type: (str | None, str, int, bool, logging.Logger | None, int) -> None
+def serve(
+    config_path=None, host="127.0.0.1", port=9876, open_browser=False, logger=None, interval=5, workers=DEFAULT_WORKERS
+):
+    # type: (str | None, str, int, bool, logging.Logger | None, int, int) -> None
     """Run the embedded dashboard until interrupted."""
     logger = logger or logging.getLogger()
     service = DashboardService(config_path=config_path, logger=logger, scheduler_interval=interval)
-    server = create_server(service=service, host=host, port=port, logger=logger)
+    server = create_server(service=service, host=host, port=port, logger=logger, workers=workers)
     bound_host, bound_port = server.server_address[:2]
     display_host = "127.0.0.1" if bound_host == "0.0.0.0" else bound_host
     if ":" in display_host:
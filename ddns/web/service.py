@@ -3,6 +3,8 @@
 
 from __future__ import unicode_literals
 
+import base64
+import binascii
 import copy
 import json
 import logging
@@ -15,13 +17,16 @@ import tempfile
 import threading
 import time
 from ast import literal_eval
+from bisect import bisect_left, bisect_right
 
+from ..cache import get_backoff, parse_failure_key
 from ..config.config import Config, split_array_string
 from ..config.env import load_config as load_env_config
 from ..config.file import DEFAULT_CONFIG_PATHS, _flatten_single_config, _process_multi_providers
 from ..provider import get_provider_class
 from ..util.comment import remove_comment
 from ..util.fileio import read_file
+from ..util.pool import parallel_map
 from .scheduler import WebScheduler
 
 try:
@@ -69,6 +74,16 @@ DOMAIN_PATTERN = re.compile(CONFIG_RULES["domainPattern"])
 PROXY_PATTERN = re.compile(CONFIG_RULES["proxyPattern"])
 LOG_LEVELS = tuple(CONFIG_RULES["logLevels"])
 CACHE_MTIME_TOLERANCE_SECONDS = 2
+SYNC_JOB_HISTORY = 20
+EVENT_HISTORY = 200
+SCHEDULER_STATUS_TTL = 30
+DASHBOARD_RECORD_LIMIT = 200
+DEFAULT_RECORD_PAGE = 100
+MAX_RECORD_PAGE = 500
+RECORD_SORT_FIELDS = ("domain", "type", "provider", "value", "updated")
+DELTA_FIELDS = ("state", "message", "config_path", "last_sync", "addresses", "providers", "record_count", "activities")
+DELTA_TOMBSTONES = 1000
+MAX_SYNC_PARALLELISM = 8
 ADDRESS_SOURCE_NAMES = set(CONFIG_RULES["addressSourceNames"])
 ADDRESS_SOURCE_PREFIXES = tuple(CONFIG_RULES["addressSourcePrefixes"])
 FALSE_ALIASES = tuple(CONFIG_RULES["falseAliases"])
@@ -127,6 +142,20 @@ class DashboardOperationError(DashboardError):
     code = "operation_failed"
 
 
+class DashboardRequestError(DashboardError):
+    """Raised when request parameters are invalid."""
+
+    status = 400
+    code = "invalid_request"
+
+
+class DashboardNotFoundError(DashboardError):
+    """Raised when a requested dashboard resource does not exist."""
+
+    status = 404
+    code = "not_found"
+
+
 def _default_document():
     # type: () -> dict
     return {
@@ -403,6 +432,69 @@ def _validate_interval(value):
     return parsed
 
 
+def _validate_parallelism(value):
+    # type: (object) -> int
+    message = "parallelism must be an integer between 1 and {}.".format(MAX_SYNC_PARALLELISM)
+    if isinstance(value, bool) or not isinstance(value, integer_types):
+        raise ConfigValidationError(message)
+    parsed = int(value)
+    if parsed < 1 or parsed > MAX_SYNC_PARALLELISM:
+        raise ConfigValidationError(message)
+    return parsed
+
+
+def _record_sort_key(record, sort):
+    # type: (dict, str) -> tuple
+    # 主排序字段之后补齐其余字段, 保证游标键唯一且顺序稳定
+    tail = (record["domain"].lower(), record["type"], record["provider"], record["domain"], record["value"])
+    if sort == "domain":
+        return tail
+    if sort == "updated":
+        return (record.get("updated") or 0,) + tail
+    return (record[sort],) + tail
+
+
+def _stamp_changes(versions, current, version, tombstones=None):
+    # type: (dict, dict, int, dict | None) -> bool
+    """Stamp entries of current that differ from versions with version, returning whether any changed."""
+    changed = False
+    for key, value in current.items():
+        previous = versions.get(key)
+        if previous is None or previous[1] != value:
+            versions[key] = (version, value)
+            changed = True
+        if tombstones is not None:
+            tombstones.pop(key, None)
+    for key in [key for key in versions if key not in current]:
+        if tombstones is not None:
+            del versions[key]
+            tombstones[key] = version
+            changed = True
+        elif versions[key][1] is not None:
+            # 消失的字段记为 None, 增量中以 null 告知客户端
+            versions[key] = (version, None)
+            changed = True
+    return changed
+
+
+def _encode_cursor(sort, order, key):
+    # type: (str, str, tuple) -> str
+    content = json.dumps([sort, order, list(key)], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(content).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor, sort, order):
+    # type: (str, str, str) -> tuple
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise DashboardRequestError("Invalid records cursor.")
+    if cursor_sort != sort or cursor_order != order or not isinstance(key, list):
+        raise DashboardRequestError("Records cursor does not match the requested sort.")
+    return tuple(key)
+
+
 def _runtime_log_format(config):
     # type: (Config) -> str
     if config.log_format:
@@ -797,6 +889,37 @@ def _swap_backup(path):
         raise
 
 
+def _file_signature(path):
+    # type: (str) -> tuple | None
+    """Return (mtime_ns, size, inode) of a file, or None when it is missing."""
+    try:
+        stat = os.stat(path)
+    except (IOError, OSError):
+        return None
+    mtime_ns = getattr(stat, "st_mtime_ns", None)
+    if mtime_ns is None:  # Python 2
+        mtime_ns = int(stat.st_mtime * 1e9)
+    return mtime_ns, stat.st_size, stat.st_ino
+
+
+def _cached_records(cache, config, provider_id, cache_time):
+    # type: (dict, Config, str, float | None) -> list[dict]
+    """Project the cached values of one provider's configured A/AAAA records into dashboard records."""
+    configured_keys = {(domain.lower(), "A") for domain in config.ipv4}
+    configured_keys.update((domain.lower(), "AAAA") for domain in config.ipv6)
+    records = []
+    for key, value in cache.items():
+        if key.startswith("__") or parse_failure_key(key) is not None or not isinstance(value, string_types):
+            continue
+        domain, record_type = key.rsplit(":", 1) if ":" in key else (key, "A")
+        record_type = record_type.upper()
+        if (domain.lower(), record_type) in configured_keys:
+            records.append(
+                {"domain": domain, "type": record_type, "value": value, "provider": provider_id, "updated": cache_time}
+            )
+    return records
+
+
 class DashboardService(object):
     """Own local dashboard configuration and runtime operations."""
 
@@ -805,6 +928,25 @@ class DashboardService(object):
         self.config_path = resolve_config_path(config_path)
         self.logger = (logger or logging.getLogger()).getChild("web")
         self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self._dashboard_snapshot = None  # type: dict | None
+        self._jobs_lock = threading.Lock()
+        self._jobs = {}  # type: dict[str, dict]
+        self._job_order = []  # type: list[str]
+        self._events_condition = threading.Condition()
+        self._events = []  # type: list[dict]
+        self._event_id = 0
+        self._last_external_status = {}  # type: dict
+        self._scheduler_probe_lock = threading.Lock()
+        self._scheduler_states = None  # type: tuple | None # (过期时间, 状态文件签名, 探测结果)
+        self._version_lock = threading.Lock()
+        # 以启动时刻的毫秒数起算, 重启前的版本号总是小于新进程的下限, 从而回退为完整快照
+        self._version = self._version_floor = int(time.time() * 1000)
+        self._field_versions = {}  # type: dict[str, tuple[int, object]]
+        self._scheduler_versions = {}  # type: dict[str, tuple[int, object]]
+        self._record_versions = {}  # type: dict[tuple[str, str, str], tuple[int, dict]]
+        self._record_tombstones = {}  # type: dict[tuple[str, str, str], int]
+        self._versioned_snapshot = None  # type: dict | None
         self._activities = []
         self._web_scheduler = scheduler or WebScheduler(
             self._scheduled_sync,
@@ -812,6 +954,7 @@ class DashboardService(object):
             enabled=True,
             guard=self._scheduled_sync_guard,
             logger=self.logger,
+            listener=self._publish_scheduler,
         )
         self._reset_sync_state()
         self._record_activity("INFO", "控制台", "本机控制台已启动", os.path.basename(self.config_path))
@@ -826,26 +969,44 @@ class DashboardService(object):
         """Stop periodic synchronization before the web process exits."""
         self._web_scheduler.stop()
 
-    def _external_scheduler_states(self):
-        # type: () -> list[tuple[object, dict]]
+    def _external_scheduler_states(self, refresh=False):
+        # type: (bool) -> list[tuple[object, dict]]
+        """
+        Return the status of every platform scheduler, probing at most once per TTL.
+
+        Probes fork crontab, systemctl or launchctl, so the results are reused
+        until the TTL passes or a scheduler's state files change on disk.
+        """
         if get_schedulers is None:
             return []
-        states = []
-        for scheduler in get_schedulers():
-            try:
-                states.append((scheduler, scheduler.get_status()))
-            except (IOError, OSError, RuntimeError, ValueError, NotImplementedError) as error:
-                states.append(
-                    (
-                        scheduler,
-                        {"installed": False, "scheduler": scheduler.__class__.__name__, "error": text_type(error)},
+        with self._scheduler_probe_lock:
+            schedulers = get_schedulers()
+            signature = [(path, _file_signature(path)) for scheduler in schedulers for path in scheduler.state_files()]
+            cached = self._scheduler_states
+            if not refresh and cached is not None and time.time() < cached[0] and cached[1] == signature:
+                return list(cached[2])
+            states = []
+            for scheduler in schedulers:
+                try:
+                    states.append((scheduler, scheduler.get_status()))
+                except (IOError, OSError, RuntimeError, ValueError, NotImplementedError) as error:
+                    states.append(
+                        (
+                            scheduler,
+                            {"installed": False, "scheduler": scheduler.__class__.__name__, "error": text_type(error)},
+                        )
                     )
-                )
-        return states
+            self._scheduler_states = (time.time() + SCHEDULER_STATUS_TTL, signature, states)
+            return list(states)
 
-    def _external_scheduler_status(self):
-        # type: () -> dict
-        states = [status for _, status in self._external_scheduler_states()]
+    def _invalidate_scheduler_states(self):
+        # type: () -> None
+        with self._scheduler_probe_lock:
+            self._scheduler_states = None
+
+    def _external_scheduler_status(self, refresh=False):
+        # type: (bool) -> dict
+        states = [status for _, status in self._external_scheduler_states(refresh)]
         if not states:
             return {"installed": False, "scheduler": "unavailable"}
         enabled = [status for status in states if status.get("installed") and status.get("enabled")]
@@ -889,10 +1050,49 @@ class DashboardService(object):
 
     def _record_activity(self, level, source, message, detail=""):
         # type: (str, str, str, str) -> None
-        self._activities.insert(
-            0, {"level": level, "source": source, "message": message, "detail": detail, "timestamp": time.time()}
-        )
+        activity = {"level": level, "source": source, "message": message, "detail": detail, "timestamp": time.time()}
+        self._activities.insert(0, activity)
         del self._activities[50:]
+        self._publish("activity", activity)
+
+    def _publish(self, name, data):
+        # type: (str, dict) -> None
+        with self._events_condition:
+            self._event_id += 1
+            self._events.append({"id": self._event_id, "event": name, "data": copy.deepcopy(data)})
+            del self._events[:-EVENT_HISTORY]
+            self._events_condition.notify_all()
+
+    def _publish_scheduler(self):
+        # type: () -> None
+        # 调度器状态变化频繁, 外部计划任务状态沿用最近一次查询结果
+        self._publish("scheduler", self._scheduler_status(self._last_external_status))
+
+    def latest_event_id(self):
+        # type: () -> int
+        """Return the id of the newest published event."""
+        with self._events_condition:
+            return self._event_id
+
+    def wait_events(self, last_event_id, timeout):
+        # type: (int, float) -> list[dict]
+        """
+        Return events newer than last_event_id, waiting up to timeout seconds for one.
+
+        When the requested id has already left the bounded history, a single
+        "reset" event tells the client to reload the full dashboard.
+        """
+        deadline = time.time() + timeout
+        with self._events_condition:
+            # 进程重启后的旧 ID 或已被淘汰的 ID 无法续传
+            if last_event_id > self._event_id or (self._events and last_event_id < self._events[0]["id"] - 1):
+                return [{"id": self._event_id, "event": "reset", "data": {}}]
+            while self._event_id <= last_event_id:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return []
+                self._events_condition.wait(remaining)
+            return [event for event in self._events if event["id"] > last_event_id]
 
     def _validate_document(self, document):
         # type: (dict | list) -> dict
@@ -900,16 +1100,21 @@ class DashboardService(object):
         fallback_provider = env_config.get("dns") or env_config.get("provider")
         return validate_document(document, fallback_provider=fallback_provider)
 
+    def _read_document(self):
+        # type: () -> dict
+        # 配置以原子替换方式写入, 读取无需持有同步锁
+        if not os.path.exists(self.config_path):
+            return self._validate_document({})
+        try:
+            content = read_file(self.config_path)
+        except (IOError, OSError) as error:
+            raise DashboardOperationError("Cannot read configuration: {}.".format(error))
+        return self._validate_document(_parse_document(content))
+
     def load_document(self):
         # type: () -> dict
         with self._lock:
-            if not os.path.exists(self.config_path):
-                return self._validate_document({})
-            try:
-                content = read_file(self.config_path)
-            except (IOError, OSError) as error:
-                raise DashboardOperationError("Cannot read configuration: {}.".format(error))
-            return self._validate_document(_parse_document(content))
+            return self._read_document()
 
     def config_state(self):
         # type: () -> dict
@@ -966,6 +1171,7 @@ class DashboardService(object):
                     enabled=bool(scheduler_status.get("enabled")), interval=validated["interval"]
                 )
             self._reset_sync_state()
+            self._invalidate_snapshot()
             self._record_activity("INFO", "配置", "配置已保存", "{} 个 DNS 服务商".format(len(validated["providers"])))
             return self.config_state()
 
@@ -992,6 +1198,7 @@ class DashboardService(object):
                     enabled=bool(scheduler_status.get("enabled")), interval=restored["interval"]
                 )
             self._reset_sync_state()
+            self._invalidate_snapshot()
             self._record_activity("WARN", "配置", "已恢复上一版配置", os.path.basename(self.config_path))
             return self.config_state()
 
@@ -1005,13 +1212,8 @@ class DashboardService(object):
 
     def _read_cache(self, config):
         # type: (Config) -> tuple[dict, float | None]
-        if config.cache is False:
-            return {}, None
-        if config.cache is True:
-            cache_path = os.path.join(tempfile.gettempdir(), "ddns.{}.cache".format(config.md5()))
-        else:
-            cache_path = os.path.abspath(os.path.expanduser(config.cache))
-        if not os.path.exists(cache_path):
+        cache_path = self._cache_path(config)
+        if cache_path is None or not os.path.exists(cache_path):
             return {}, None
         try:
             cache_time = os.path.getmtime(cache_path)
@@ -1027,10 +1229,12 @@ class DashboardService(object):
             self.logger.warning("Cannot read cache %s: %s", cache_path, error)
             return {}, None
 
-    def _scheduler_status(self):
-        # type: () -> dict
+    def _scheduler_status(self, external=None):
+        # type: (dict | None) -> dict
         status = self._web_scheduler.status()
-        external = self._external_scheduler_status()
+        if external is None:
+            external = self._external_scheduler_status()
+            self._last_external_status = external
         requested_enabled = bool(status.get("enabled"))
         conflict = bool(external.get("installed") and external.get("enabled"))
         status["requested_enabled"] = requested_enabled
@@ -1043,156 +1247,443 @@ class DashboardService(object):
             status["external_error"] = external["error"]
         return status
 
-    def dashboard(self):
+    def _cache_path(self, config):
+        # type: (Config) -> str | None
+        if config.cache is False:
+            return None
+        if config.cache is True:
+            return os.path.join(tempfile.gettempdir(), "ddns.{}.cache".format(config.md5()))
+        return os.path.abspath(os.path.expanduser(config.cache))
+
+    def _snapshot_is_current(self, snapshot, env_key):
+        # type: (dict, str) -> bool
+        if snapshot["env"] != env_key or time.time() >= snapshot["expires"]:
+            return False
+        return all(_file_signature(path) == signature for path, signature in snapshot["files"])
+
+    def _snapshot(self):
         # type: () -> dict
-        with self._lock:
-            document = self.load_document()
-            runtime_configs = self._runtime_configs(document)
-            providers = []
-            records = []
-            addresses = []
-            seen_addresses = set()
-            cache_last_sync = None
-            last_sync = self._last_sync_time
-            configured_record_count = 0
-
-            for provider_index, (provider, config) in enumerate(zip(document.get("providers", []), runtime_configs)):
-                cache, cache_time = self._read_cache(config)
-                provider_records = []
-                configured_keys = {(domain.lower(), "A") for domain in config.ipv4}
-                configured_keys.update((domain.lower(), "AAAA") for domain in config.ipv6)
-                for key, value in cache.items():
-                    if key.startswith("__") or not isinstance(value, string_types):
-                        continue
-                    if ":" in key:
-                        domain, record_type = key.rsplit(":", 1)
+        """Return the projection of the configuration and cache files, rebuilding it only when they change."""
+        env_key = json.dumps(load_env_config(), sort_keys=True, default=text_type)
+        with self._snapshot_lock:
+            snapshot = self._dashboard_snapshot
+            if snapshot is None or not self._snapshot_is_current(snapshot, env_key):
+                snapshot = self._build_snapshot(env_key)
+                self._dashboard_snapshot = snapshot
+            return snapshot
+
+    def _invalidate_snapshot(self):
+        # type: () -> None
+        with self._snapshot_lock:
+            self._dashboard_snapshot = None
+
+    def _build_snapshot(self, env_key):
+        # type: (str) -> dict
+        files = [(self.config_path, _file_signature(self.config_path))]
+        document = self._read_document()
+        runtime_configs = self._runtime_configs(document)
+        providers = []
+        records = []
+        addresses = []
+        seen_addresses = set()
+        cache_last_sync = None
+        configured_record_count = 0
+        expires = float("inf")
+
+        for provider, config in zip(document.get("providers", []), runtime_configs):
+            cache_path = self._cache_path(config)
+            if cache_path is not None:
+                signature = _file_signature(cache_path)
+                files.append((cache_path, signature))
+                if signature is not None:
+                    # 缓存过期或时钟偏差范围外的缓存变为可见时需要重建
+                    mtime = signature[0] / 1e9
+                    if mtime - time.time() > CACHE_MTIME_TOLERANCE_SECONDS:
+                        expires = min(expires, mtime - CACHE_MTIME_TOLERANCE_SECONDS)
                     else:
-                        domain, record_type = key, "A"
-                    record_type = record_type.upper()
-                    if (domain.lower(), record_type) not in configured_keys:
-                        continue
-                    record = {
-                        "domain": domain,
-                        "type": record_type,
-                        "value": value,
-                        "provider": provider["provider"],
-                        "updated": cache_time,
-                    }
-                    provider_records.append(record)
-                    records.append(record)
-                    family = "IPv6" if ":" in value else "IPv4"
-                    address_key = (family, value)
-                    if address_key not in seen_addresses:
-                        seen_addresses.add(address_key)
-                        addresses.append({"family": family, "value": value})
-
-                if provider_records and cache_time is not None:
-                    cache_last_sync = max(cache_last_sync or cache_time, cache_time)
-                    last_sync = max(last_sync or cache_time, cache_time)
-                configured_records = len(config.ipv4) + len(config.ipv6)
-                configured_record_count += configured_records
-                providers.append(
-                    {
-                        "id": provider["provider"],
-                        "label": PROVIDER_LABELS.get(provider["provider"], provider["provider"]),
-                        "records": configured_records,
-                        "status": (
-                            "error"
-                            if provider_index in self._last_sync_failed_provider_indexes
-                            else (
-                                "synced"
-                                if provider_records or provider_index in self._last_sync_provider_indexes
-                                else "configured"
-                            )
-                        ),
-                    }
-                )
+                        expires = min(expires, mtime + config.cache_max_age)
+            cache, cache_time = self._read_cache(config)
+            provider_backoff = []
+            configured_keys = {(domain.lower(), "A") for domain in config.ipv4}
+            configured_keys.update((domain.lower(), "AAAA") for domain in config.ipv6)
+            for key in cache:
+                failure = parse_failure_key(key)
+                if failure is None:
+                    continue
+                failed_provider, domain, record_type = failure
+                domain, record_type = domain.lower(), record_type.upper()
+                state = get_backoff(cache, key)
+                if state and failed_provider == config.dns and (domain, record_type) in configured_keys:
+                    expires = min(expires, state["retry_at"])
+                    provider_backoff.append(
+                        {
+                            "domain": domain,
+                            "type": record_type,
+                            "failures": state.get("failures"),
+                            "last_failure": state.get("last_failure"),
+                            "retry_at": state.get("retry_at"),
+                        }
+                    )
+
+            provider_records = _cached_records(cache, config, provider["provider"], cache_time)
+            records.extend(provider_records)
+            for record in provider_records:
+                value = record["value"]
+                family = "IPv6" if ":" in value else "IPv4"
+                address_key = (family, value)
+                if address_key not in seen_addresses:
+                    seen_addresses.add(address_key)
+                    addresses.append({"family": family, "value": value})
+
+            if provider_records and cache_time is not None:
+                cache_last_sync = max(cache_last_sync or cache_time, cache_time)
+            configured_records = len(config.ipv4) + len(config.ipv6)
+            configured_record_count += configured_records
+            providers.append(
+                {
+                    "id": provider["provider"],
+                    "label": PROVIDER_LABELS.get(provider["provider"], provider["provider"]),
+                    "records": configured_records,
+                    "backoff": sorted(provider_backoff, key=lambda item: (item["domain"], item["type"])),
+                    "cached": bool(provider_records),
+                }
+            )
 
-            if not providers or configured_record_count == 0:
-                state = "unconfigured"
-                message = "尚未添加需要更新的域名"
-            elif self._last_sync_status == "failed":
-                state = "error"
-                message = "最近一次同步失败"
-            elif records or self._last_sync_time is not None:
-                state = "synced"
-                message = "解析记录同步数据可用" if records else "最近一次同步已完成"
+        records.sort(key=lambda item: (item["domain"], item["type"], item["provider"]))
+        addresses.sort(key=lambda item: (item["family"], item["value"]))
+        return {
+            "env": env_key,
+            "files": files,
+            "expires": expires,
+            "providers": providers,
+            "records": records,
+            "addresses": addresses,
+            "cache_last_sync": cache_last_sync,
+            "configured_records": configured_record_count,
+            "record_views": {},
+        }
+
+    def dashboard(self, since=None):
+        # type: (object) -> dict
+        """
+        Compose the dashboard from the cached file snapshot and live runtime state, without the sync lock.
+
+        With since, only the fields, scheduler entries and records that changed
+        after that version are returned, plus removed_records; a version that
+        can no longer be answered incrementally yields the full dashboard.
+        """
+        if since is not None:
+            try:
+                since = int(since)
+            except (TypeError, ValueError):
+                since = -1
+            if since < 0:
+                raise DashboardRequestError("since must be a non-negative dashboard version.")
+        snapshot = self._snapshot()
+        records = snapshot["records"]
+        cache_last_sync = snapshot["cache_last_sync"]
+        last_sync = self._last_sync_time
+        if cache_last_sync is not None:
+            last_sync = max(last_sync or cache_last_sync, cache_last_sync)
+        failed_indexes = self._last_sync_failed_provider_indexes
+        synced_indexes = self._last_sync_provider_indexes
+        providers = []
+        for provider_index, item in enumerate(snapshot["providers"]):
+            provider = {key: value for key, value in item.items() if key != "cached"}
+            if provider_index in failed_indexes:
+                provider["status"] = "error"
+            elif item["cached"] or provider_index in synced_indexes:
+                provider["status"] = "synced"
             else:
-                state = "ready"
-                message = "配置已就绪，等待首次同步"
+                provider["status"] = "configured"
+            providers.append(provider)
+
+        if not providers or snapshot["configured_records"] == 0:
+            state = "unconfigured"
+            message = "尚未添加需要更新的域名"
+        elif self._last_sync_status == "failed":
+            state = "error"
+            message = "最近一次同步失败"
+        elif records or self._last_sync_time is not None:
+            state = "synced"
+            message = "解析记录同步数据可用" if records else "最近一次同步已完成"
+        else:
+            state = "ready"
+            message = "配置已就绪，等待首次同步"
 
-            activities = list(self._activities)
-            if cache_last_sync:
-                activities.insert(
-                    0,
-                    {
-                        "level": "INFO",
-                        "source": "同步缓存",
-                        "message": "最近一次同步已完成",
-                        "detail": "{} 条记录".format(len(records)),
-                        "timestamp": cache_last_sync,
-                    },
-                )
-            activities.sort(key=lambda item: item.get("timestamp") or 0, reverse=True)
-            records.sort(key=lambda item: (item["domain"], item["type"], item["provider"]))
-            addresses.sort(key=lambda item: (item["family"], item["value"]))
-
-            return {
-                "state": state,
-                "message": message,
-                "config_path": self.config_path,
-                "last_sync": last_sync,
-                "addresses": addresses,
-                "providers": providers,
-                "records": records,
-                "activities": activities[:50],
-                "scheduler": self._scheduler_status(),
+        activities = list(self._activities)
+        if cache_last_sync:
+            activities.insert(
+                0,
+                {
+                    "level": "INFO",
+                    "source": "同步缓存",
+                    "message": "最近一次同步已完成",
+                    "detail": "{} 条记录".format(len(records)),
+                    "timestamp": cache_last_sync,
+                },
+            )
+        activities.sort(key=lambda item: item.get("timestamp") or 0, reverse=True)
+
+        status = {
+            "state": state,
+            "message": message,
+            "config_path": self.config_path,
+            "last_sync": last_sync,
+            "addresses": list(snapshot["addresses"]),
+            "providers": providers,
+            "records": records[:DASHBOARD_RECORD_LIMIT],
+            "record_count": len(records),
+            "activities": activities[:50],
+            "scheduler": self._scheduler_status(),
+        }
+        return self._versioned(status, snapshot, since)
+
+    def _versioned(self, status, snapshot, since):
+        # type: (dict, dict, int | None) -> dict
+        with self._version_lock:
+            version = self._version + 1
+            changed = _stamp_changes(self._field_versions, {field: status[field] for field in DELTA_FIELDS}, version)
+            changed |= _stamp_changes(self._scheduler_versions, status["scheduler"], version)
+
+            # 快照对象在文件未变化时复用, 只有重建后才需要逐条比较记录
+            if snapshot is not self._versioned_snapshot:
+                self._versioned_snapshot = snapshot
+                current = {
+                    (record["provider"], record["domain"], record["type"]): record for record in snapshot["records"]
+                }
+                changed |= _stamp_changes(self._record_versions, current, version, self._record_tombstones)
+                if len(self._record_tombstones) > DELTA_TOMBSTONES:
+                    dropped = sorted(self._record_tombstones.items(), key=lambda item: item[1])
+                    dropped = dropped[: len(dropped) - DELTA_TOMBSTONES]
+                    for key, _ in dropped:
+                        del self._record_tombstones[key]
+                    self._version_floor = max(self._version_floor, dropped[-1][1])
+
+            if changed:
+                self._version = version
+            status["version"] = self._version
+            if since is None or since < self._version_floor or since > self._version:
+                return status
+
+            delta = {"version": self._version, "since": since, "delta": True}
+            delta.update((field, value) for field, (stamp, value) in self._field_versions.items() if stamp > since)
+            delta["scheduler"] = {
+                name: value for name, (stamp, value) in self._scheduler_versions.items() if stamp > since
             }
+            delta["records"] = sorted(
+                (record for stamp, record in self._record_versions.values() if stamp > since),
+                key=lambda item: (item["domain"], item["type"], item["provider"]),
+            )
+            delta["removed_records"] = [
+                {"provider": key[0], "domain": key[1], "type": key[2]}
+                for key, stamp in sorted(self._record_tombstones.items())
+                if stamp > since
+            ]
+            return delta
+
+    def records(self, provider=None, record_type=None, query=None, sort="domain", order="asc", cursor=None, limit=None):
+        # type: (str | None, str | None, str | None, str, str, str | None, object) -> dict
+        """
+        Return one page of cached records, filtered and sorted on the server.
+
+        Pages are addressed by an opaque keyset cursor, so records added or
+        removed between requests never shift or repeat the following pages.
+        """
+        if sort not in RECORD_SORT_FIELDS:
+            raise DashboardRequestError("sort must be one of: {}.".format(", ".join(RECORD_SORT_FIELDS)))
+        if order not in ("asc", "desc"):
+            raise DashboardRequestError("order must be asc or desc.")
+        if limit is None:
+            limit = DEFAULT_RECORD_PAGE
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1 or limit > MAX_RECORD_PAGE:
+            raise DashboardRequestError("limit must be an integer between 1 and {}.".format(MAX_RECORD_PAGE))
+        record_type = record_type.upper() if record_type else None
+        query = query.lower() if query else None
+
+        snapshot = self._snapshot()
+        view = snapshot["record_views"].get(sort)
+        if view is None:
+            keyed = sorted(
+                ((_record_sort_key(record, sort), record) for record in snapshot["records"]), key=lambda item: item[0]
+            )
+            view = ([key for key, _ in keyed], [record for _, record in keyed])
+            snapshot["record_views"][sort] = view
+        keys, ordered = view
+
+        def matches(record):
+            return (
+                (provider is None or record["provider"] == provider)
+                and (record_type is None or record["type"] == record_type)
+                and (query is None or query in record["domain"].lower() or query in record["value"].lower())
+            )
 
-    def sync(self, source="同步", cancelled=None):
-        # type: (str, object | None) -> dict
+        if order == "asc":
+            start = bisect_right(keys, _decode_cursor(cursor, sort, order)) if cursor else 0
+            positions = range(start, len(ordered))
+        else:
+            start = bisect_left(keys, _decode_cursor(cursor, sort, order)) if cursor else len(ordered)
+            positions = range(start - 1, -1, -1)
+        page = []
+        next_cursor = None
+        for position in positions:
+            record = ordered[position]
+            if not matches(record):
+                continue
+            if len(page) == limit:
+                next_cursor = _encode_cursor(sort, order, keys[page[-1]])
+                break
+            page.append(position)
+
+        filtered = provider is not None or record_type is not None or query is not None
+        return {
+            "records": [ordered[position] for position in page],
+            "next_cursor": next_cursor,
+            "total": sum(1 for record in ordered if matches(record)) if filtered else len(ordered),
+            "limit": limit,
+        }
+
+    def _sync_configs(self):
+        # type: () -> list[tuple[int, Config]]
+        document = self._read_document()
+        indexed_configs = [
+            (index, config)
+            for index, config in enumerate(self._runtime_configs(document))
+            if config.ipv4 or config.ipv6
+        ]
+        if not indexed_configs:
+            raise ConfigValidationError("Add at least one domain before running synchronization.")
+        return indexed_configs
+
+    def _update_job(self, job_id, provider_index=None, **fields):
+        # type: (str | None, int | None, **object) -> None
+        if job_id is None:
+            return
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            if provider_index is None:
+                job.update(fields)
+            for provider in job["providers"]:
+                if provider["index"] == provider_index:
+                    provider.update(fields)
+            snapshot = copy.deepcopy(job)
+        self._publish("sync", snapshot)
+
+    def _sync_provider(self, provider_index, config, cancelled=None, job_id=None):
+        # type: (int, Config, object | None, str | None) -> bool
+        from ..__main__ import UpdateCancelled, config_lock, run
+
+        if cancelled is not None and cancelled():
+            raise UpdateCancelled("DDNS update cancelled.")
+        self._update_job(job_id, provider_index, status="running", started=time.time())
+        error_message = None
+        # 与 CLI/定时任务共用配置锁, 避免同时写入同一缓存文件
+        lock = config_lock(config)
+        try:
+            if not lock.acquire(config.lock_wait):
+                error_message = "Another ddns process (pid {}) is running this configuration.".format(lock.owner())
+        except (IOError, OSError) as error:
+            error_message = "Cannot open lock file {}: {}".format(lock.path, error)
+        if error_message:
+            self.logger.warning("Skip dashboard synchronization for %s: %s", config.dns, error_message)
+            self._update_job(job_id, provider_index, status="failed", finished=time.time(), error=error_message)
+            return False
+        try:
+            result = run(config) if cancelled is None else run(config, cancelled=cancelled)
+        except UpdateCancelled:
+            self._update_job(job_id, provider_index, status="cancelled", finished=time.time())
+            raise
+        except Exception as error:
+            self.logger.exception("Dashboard synchronization failed for %s", config.dns)
+            result, error_message = False, text_type(error)
+        finally:
+            lock.release()
+        self._update_job(
+            job_id,
+            provider_index,
+            status="succeeded" if result else "failed",
+            finished=time.time(),
+            error=error_message,
+        )
+        self._publish_records(provider_index, config, result)
+        if cancelled is not None and cancelled():
+            raise UpdateCancelled("DDNS update cancelled.")
+        return bool(result)
+
+    def _publish_records(self, provider_index, config, result):
+        # type: (int, Config, bool) -> None
+        # 只读取刚同步的这一个缓存文件; 仪表盘快照按文件签名自行失效, 无需整体重建
+        cache, cache_time = self._read_cache(config)
+        records = sorted(
+            _cached_records(cache, config, config.dns, cache_time), key=lambda item: (item["domain"], item["type"])
+        )
+        self._publish(
+            "records",
+            {
+                "provider_index": provider_index,
+                "provider": config.dns,
+                "status": "succeeded" if result else "failed",
+                "records": records[:DASHBOARD_RECORD_LIMIT],
+                "record_count": len(records),
+            },
+        )
+
+    def sync(self, source="同步", cancelled=None, parallelism=1, job_id=None):
+        # type: (str, object | None, int, str | None) -> dict
+        """
+        Run every configured provider and return the refreshed dashboard.
+
+        With parallelism above one, providers run concurrently, except that
+        providers sharing a cache file still run one after another.
+        """
         with self._lock:
-            document = self.load_document()
-            indexed_configs = [
-                (index, config)
-                for index, config in enumerate(self._runtime_configs(document))
-                if config.ipv4 or config.ipv6
-            ]
-            if not indexed_configs:
-                raise ConfigValidationError("Add at least one domain before running synchronization.")
+            indexed_configs = self._sync_configs()
+            self._update_job(job_id, status="running", started=time.time())
+
+            from ..__main__ import UpdateCancelled
+
+            groups = {}  # type: dict[object, list[tuple[int, Config]]]
+            for provider_index, config in indexed_configs:
+                # 共享缓存文件的服务商依次执行, 避免并发写入同一缓存
+                group_key = self._cache_path(config) or provider_index
+                groups.setdefault(group_key, []).append((provider_index, config))
+            ordered_groups = sorted(groups.values(), key=lambda group: group[0][0])
 
-            from ..__main__ import UpdateCancelled, run
+            cancelled_providers = []  # type: list[str]
+
+            def sync_group(group):
+                results = []
+                for index, config in group:
+                    try:
+                        results.append((index, config, self._sync_provider(index, config, cancelled, job_id)))
+                    except UpdateCancelled:
+                        cancelled_providers.append(config.dns)
+                        raise
+                return results
 
-            failures = []
-            successful_indexes = set()
             try:
                 logging_state = _activate_runtime_logging(indexed_configs[0][1])
             except (IOError, OSError, ValueError) as error:
                 raise DashboardOperationError("Cannot configure synchronization logging: {}.".format(error))
             try:
-                for provider_index, config in indexed_configs:
-                    try:
-                        if cancelled is not None and cancelled():
-                            raise UpdateCancelled("DDNS update cancelled.")
-                        result = run(config) if cancelled is None else run(config, cancelled=cancelled)
-                        if cancelled is not None and cancelled():
-                            raise UpdateCancelled("DDNS update cancelled.")
-                        if not result:
-                            failures.append((provider_index, config.dns))
-                        else:
-                            successful_indexes.add(provider_index)
-                    except UpdateCancelled:
-                        self._record_activity("WARN", source, "同步已取消", config.dns)
-                        raise DashboardOperationError("Synchronization cancelled.")
-                    except Exception:
-                        self.logger.exception("Dashboard synchronization failed for %s", config.dns)
-                        failures.append((provider_index, config.dns))
+                results = [item for group in parallel_map(sync_group, ordered_groups, parallelism) for item in group]
+            except UpdateCancelled:
+                self._record_activity("WARN", source, "同步已取消", ", ".join(cancelled_providers))
+                raise DashboardOperationError("Synchronization cancelled.")
             finally:
                 _restore_runtime_logging(logging_state)
+                self._invalidate_snapshot()
 
+            failures = [(index, config.dns) for index, config, result in results if not result]
             if failures:
                 self._last_sync_status = "failed"
-                self._last_sync_provider_indexes = successful_indexes
+                self._last_sync_provider_indexes = {index for index, _, result in results if result}
                 self._last_sync_failed_provider_indexes = {index for index, _ in failures}
                 failure_names = [name for _, name in failures]
                 self._record_activity("WARN", source, "部分服务商同步失败", ", ".join(failure_names))
@@ -1205,6 +1696,81 @@ class DashboardService(object):
             self._record_activity("INFO", source, "所有配置同步完成", "{} 个 DNS 服务商".format(len(indexed_configs)))
             return self.dashboard()
 
+    def start_sync(self, source="同步", parallelism=1):
+        # type: (str, object) -> dict
+        """
+        Queue a background synchronization and return its job immediately.
+
+        A queued or running job is returned instead of starting a second one.
+        Configuration errors are still reported synchronously.
+        """
+        parallelism = _validate_parallelism(parallelism)
+        indexed_configs = self._sync_configs()
+        with self._jobs_lock:
+            for job in self._jobs.values():
+                if job["status"] in ("queued", "running"):
+                    return copy.deepcopy(job)
+            job_id = binascii.hexlify(os.urandom(8)).decode("ascii")
+            job = {
+                "id": job_id,
+                "source": source,
+                "status": "queued",
+                "parallelism": parallelism,
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "error": None,
+                "providers": [
+                    {
+                        "index": index,
+                        "provider": config.dns,
+                        "records": len(config.ipv4) + len(config.ipv6),
+                        "status": "pending",
+                        "started": None,
+                        "finished": None,
+                        "error": None,
+                    }
+                    for index, config in indexed_configs
+                ],
+            }
+            self._jobs[job_id] = job
+            self._job_order.append(job_id)
+            while len(self._job_order) > SYNC_JOB_HISTORY:
+                self._jobs.pop(self._job_order.pop(0), None)
+            snapshot = copy.deepcopy(job)
+
+        worker = threading.Thread(target=self._run_sync_job, args=(job_id, source, parallelism), name="ddns-web-sync")
+        worker.daemon = True
+        worker.start()
+        return snapshot
+
+    def _run_sync_job(self, job_id, source, parallelism):
+        # type: (str, str, int) -> None
+        try:
+            self.sync(source=source, parallelism=parallelism, job_id=job_id)
+        except DashboardError as error:
+            self._update_job(job_id, status="failed", finished=time.time(), error=text_type(error))
+        except Exception as error:
+            self.logger.exception("Dashboard synchronization job %s failed", job_id)
+            self._update_job(job_id, status="failed", finished=time.time(), error=text_type(error))
+        else:
+            self._update_job(job_id, status="succeeded", finished=time.time())
+
+    def sync_job(self, job_id):
+        # type: (str) -> dict
+        """Return the progress of one synchronization job."""
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                raise DashboardNotFoundError("Synchronization job not found.")
+            return copy.deepcopy(job)
+
+    def sync_jobs(self):
+        # type: () -> list[dict]
+        """Return recent synchronization jobs, newest first."""
+        with self._jobs_lock:
+            return [copy.deepcopy(self._jobs[job_id]) for job_id in reversed(self._job_order)]
+
     def configure_scheduler(self, action, scheduler_name="web", interval=5):
         # type: (str, str, int) -> dict
         with self._lock:
@@ -1220,9 +1786,11 @@ class DashboardService(object):
 
             current = self._web_scheduler.status()
             enabled = bool(current.get("enabled"))
+            # 用户操作总是重新探测, 不依赖缓存的外部任务状态
             if action == "takeover":
-                for external_scheduler, external in self._external_scheduler_states():
+                for external_scheduler, external in self._external_scheduler_states(refresh=True):
                     if external.get("installed") and external.get("enabled"):
+                        self._invalidate_scheduler_states()
                         if not external_scheduler.disable():
                             raise DashboardOperationError(
                                 "Cannot disable the existing {} scheduled task.".format(
@@ -1238,7 +1806,7 @@ class DashboardService(object):
                             )
                 enabled = True
             elif action == "enable":
-                external = self._external_scheduler_status()
+                external = self._external_scheduler_status(refresh=True)
                 if external.get("installed") and external.get("enabled"):
                     raise DashboardOperationError(
                         "An external {} scheduled task is enabled; use takeover or ddns task --disable first.".format(
@@ -404,6 +404,15 @@ class OfflineE2ETestCase(unittest.TestCase):
         finally:
             connection.close()
 
+    def _wait_for_sync_job(self, port, job, headers, timeout=30):
+        deadline = time.time() + timeout
+        while job["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.1)
+            status, _, body = self._http_request(port, "/api/sync/" + job["id"], headers=headers)
+            self.assertEqual(status, 200, body)
+            job = json.loads(body)["job"]
+        return job
+
 
 class TestCliE2E(OfflineE2ETestCase):
     """Exercise complete DDNS update flows through public process entrypoints."""
@@ -930,6 +939,8 @@ class TestWebE2E(OfflineE2ETestCase):
         sync_status, _, sync_body = self._http_request(
             port, "/api/sync", method="POST", payload={}, headers=config_headers
         )
+        self.assertEqual(sync_status, 202, sync_body)
+        sync_job = self._wait_for_sync_job(port, json.loads(sync_body)["job"], api_headers)
         dashboard_status, _, dashboard_body = self._http_request(port, "/api/dashboard", headers=api_headers)
 
         self.assertEqual(validate_status, 200, validate_body)
@@ -938,7 +949,8 @@ class TestWebE2E(OfflineE2ETestCase):
         )
         self.assertEqual(save_status, 200, save_body)
         self.assertTrue(os.path.isfile(config_path))
-        self.assertEqual(sync_status, 200, sync_body)
+        self.assertEqual(sync_job["status"], "succeeded", sync_job)
+        self.assertEqual([provider["status"] for provider in sync_job["providers"]], ["succeeded"])
         dashboard = json.loads(dashboard_body)
         self.assertEqual(dashboard_status, 200)
         self.assertEqual(dashboard["state"], "synced")
@@ -0,0 +1,21 @@
+# coding=utf-8
+"""
+离线服务商模拟器: 确定性的记录状态与按端点注入的故障 (延迟、429/5xx、连接重置、慢响应、TLS 失败)
+
+Offline provider simulator for resilience and load tests. Unlike the unit
+mocks it serves real HTTP on a loopback port, so the whole request path
+(RetryHandler, proxy failover, per-host limits, concurrent updates) runs
+unchanged:
+
+    with ProviderSimulator("cloudflare") as sim:
+        sim.inject("GET dns_records", status=429, times=2)
+        provider = CloudflareProvider("user@example.com", "token", endpoint=sim.url)
+        provider.set_record("www.example.com", "192.0.2.1")
+"""
+
+from .apis import APIS, ZONE, ZONE_ID, ProviderAPI
+from .server import Fault, ProviderSimulator
+
+PROVIDERS = tuple(sorted(APIS))
+
+__all__ = ["APIS", "PROVIDERS", "ZONE", "ZONE_ID", "Fault", "ProviderAPI", "ProviderSimulator"]
@@ -0,0 +1,202 @@
+# coding=utf-8
+"""
+服务商 API 的内存模拟: 区域查询、记录查询、创建与修改
+In-memory stand-ins for the provider APIs: zone lookup, record query, create and update.
+"""
+
+from threading import Lock
+
+ZONE = "example.com"
+ZONE_ID = "1001"
+
+
+class ProviderAPI(object):
+    """
+    单个服务商的确定性记录状态, 记录以 (完整域名, 类型) 为键, ID 依次递增
+
+    Deterministic record state of one provider. Subclasses map a request to an
+    endpoint name (used to target faults) and to a JSON response.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.records = {}  # type: dict[tuple[str, str], dict[str, str]]
+        self._lock = Lock()
+        self._next_id = 1
+
+    def find(self, fqdn, record_type=None):
+        # type: (str, str | None) -> list[dict[str, str]]
+        with self._lock:
+            return [
+                dict(record, name=name, type=rtype)
+                for (name, rtype), record in sorted(self.records.items())
+                if name == fqdn and (not record_type or rtype == record_type)
+            ]
+
+    def upsert(self, fqdn, record_type, value, record_id=None):
+        # type: (str, str, str, str | None) -> str
+        """创建 (record_id 为空) 或按 ID 修改记录, 返回记录 ID"""
+        with self._lock:
+            if record_id is None:
+                record_id = str(self._next_id)
+                self._next_id += 1
+            else:
+                record_id = str(record_id)
+                for key, record in list(self.records.items()):
+                    if record["id"] == record_id:
+                        del self.records[key]
+            self.records[(fqdn, record_type)] = {"id": record_id, "value": value}
+            return record_id
+
+    def value(self, fqdn, record_type="A"):
+        # type: (str, str) -> str | None
+        """记录当前值 / Current value of a record, if it exists."""
+        found = self.find(fqdn, record_type)
+        return found[0]["value"] if found else None
+
+    def endpoint(self, method, path, headers):
+        # type: (str, str, Any) -> str
+        raise NotImplementedError
+
+    def handle(self, method, path, query, body, headers):
+        # type: (str, str, dict, dict, Any) -> tuple[int, dict]
+        raise NotImplementedError
+
+
+def _fqdn(sub):
+    # type: (str | None) -> str
+    return ZONE if not sub or sub == "@" else sub + "." + ZONE
+
+
+def _sub(fqdn):
+    # type: (str) -> str
+    return fqdn[: -len(ZONE) - 1] if fqdn.endswith("." + ZONE) else "@"
+
+
+class CloudflareAPI(ProviderAPI):
+    """端点: "zones", "GET dns_records", "POST dns_records", "PUT dns_records" """
+
+    name = "cloudflare"
+
+    def endpoint(self, method, path, headers):
+        parts = path.strip("/").split("/")
+        return "zones" if parts[-1] == "zones" else method + " dns_records"
+
+    def handle(self, method, path, query, body, headers):
+        parts = path.strip("/").split("/")[2:]  # client/v4/...
+        page = int(query.get("page", 1))
+        if parts == ["zones"]:
+            name = query.get("name.exact", query.get("name"))
+            zones = [{"id": ZONE_ID, "name": ZONE}] if page == 1 and name in (None, ZONE) else []
+            return 200, {"success": True, "result": zones}
+        if len(parts) < 3 or parts[2] != "dns_records":
+            return 404, {"success": False, "errors": [{"code": 7003, "message": "No route for " + path}]}
+        if method == "GET":
+            found = self.find(query.get("name.exact", query.get("name", "")), query.get("type")) if page == 1 else []
+            result = [{"id": r["id"], "name": r["name"], "type": r["type"], "content": r["value"]} for r in found]
+            return 200, {"success": True, "result": result}
+        record_id = self.upsert(body["name"], body["type"], body["content"], parts[3] if len(parts) > 3 else None)
+        return 200, {"success": True, "result": dict(body, id=record_id)}
+
+
+class DnspodAPI(ProviderAPI):
+    """端点为接口名, 如 "Domain.Info", "Record.List", "Record.Create", "Record.Modify" """
+
+    name = "dnspod"
+
+    def endpoint(self, method, path, headers):
+        return path.strip("/")
+
+    def handle(self, method, path, query, body, headers):
+        action = path.strip("/")
+        ok = {"code": "1", "message": "Action completed successful"}
+        if action == "Domain.Info":
+            if body.get("domain") != ZONE:
+                return 200, {"status": {"code": "6", "message": "Domain not found"}}
+            return 200, {"status": ok, "domain": {"id": ZONE_ID, "name": ZONE}}
+        if action == "Domain.List":
+            return 200, {"status": ok, "domains": [{"id": ZONE_ID, "name": ZONE}]}
+        if action == "Record.List":
+            sub = body.get("sub_domain", "@")
+            found = self.find(_fqdn(sub), body.get("record_type"))
+            if not found:
+                return 200, {"status": {"code": "10", "message": "No records"}}
+            records = [
+                {"id": r["id"], "name": sub, "type": r["type"], "value": r["value"], "line": "默认"} for r in found
+            ]
+            return 200, {"status": ok, "records": records}
+        if action in ("Record.Create", "Record.Modify"):
+            sub = body.get("sub_domain", "@")
+            record_id = self.upsert(_fqdn(sub), body["record_type"], body["value"], body.get("record_id"))
+            return 200, {"status": ok, "record": {"id": record_id, "name": sub, "value": body["value"]}}
+        return 200, {"status": {"code": "-1", "message": "Unknown action " + action}}
+
+
+class AlidnsAPI(ProviderAPI):
+    """端点为 x-acs-action, 如 "DescribeSubDomainRecords", "AddDomainRecord" """
+
+    name = "alidns"
+
+    def endpoint(self, method, path, headers):
+        return headers.get("x-acs-action") or ""
+
+    def handle(self, method, path, query, body, headers):
+        action = self.endpoint(method, path, headers)
+        params = dict(query, **body)
+        if action == "GetMainDomainName":
+            return 200, {"RR": _sub(params.get("InputString", "")), "DomainName": ZONE}
+        if action == "DescribeSubDomainRecords":
+            found = self.find(params.get("SubDomain", ""), params.get("Type"))
+            records = [
+                {
+                    "RecordId": r["id"],
+                    "RR": _sub(r["name"]),
+                    "DomainName": ZONE,
+                    "Type": r["type"],
+                    "Value": r["value"],
+                    "Line": "default",
+                    "TTL": 600,
+                }
+                for r in found
+            ]
+            return 200, {"TotalCount": len(records), "DomainRecords": {"Record": records}}
+        if action in ("AddDomainRecord", "UpdateDomainRecord"):
+            fqdn = _fqdn(params.get("RR"))
+            return 200, {"RecordId": self.upsert(fqdn, params["Type"], params["Value"], params.get("RecordId"))}
+        return 400, {"Code": "InvalidAction.NotFound", "Message": "Unknown action " + action}
+
+
+class TencentCloudAPI(ProviderAPI):
+    """端点为 X-TC-Action, 如 "DescribeRecordList", "CreateRecord", "ModifyRecord" """
+
+    name = "tencentcloud"
+
+    def endpoint(self, method, path, headers):
+        return headers.get("X-TC-Action") or ""
+
+    def handle(self, method, path, query, body, headers):
+        action = self.endpoint(method, path, headers)
+        if action == "DescribeDomain":
+            return 200, {"Response": {"DomainInfo": {"DomainId": int(ZONE_ID), "Domain": ZONE}}}
+        if action == "DescribeDomainList":
+            return 200, {"Response": {"DomainList": [{"DomainId": int(ZONE_ID), "Name": ZONE}]}}
+        if action == "DescribeRecordList":
+            sub = body.get("Subdomain", "@")
+            found = self.find(_fqdn(sub), body.get("RecordType"))
+            if not found:
+                error = {"Code": "ResourceNotFound.NoDataOfRecord", "Message": "No records"}
+                return 200, {"Response": {"Error": error}}
+            records = [
+                {"RecordId": int(r["id"]), "Name": sub, "Type": r["type"], "Value": r["value"], "Line": "默认"}
+                for r in found
+            ]
+            return 200, {"Response": {"RecordList": records}}
+        if action in ("CreateRecord", "ModifyRecord"):
+            fqdn = _fqdn(body.get("SubDomain"))
+            record_id = self.upsert(fqdn, body["RecordType"], body["Value"], body.get("RecordId"))
+            return 200, {"Response": {"RecordId": int(record_id)}}
+        return 200, {"Response": {"Error": {"Code": "InvalidAction", "Message": "Unknown action " + action}}}
+
+
+APIS = {api.name: api for api in (CloudflareAPI, DnspodAPI, AlidnsAPI, TencentCloudAPI)}
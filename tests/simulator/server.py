@@ -0,0 +1,221 @@
+# coding=utf-8
+"""
+回环 HTTP 服务与按端点注入的故障
+Loopback HTTP server serving a simulated provider API with per-endpoint faults.
+"""
+
+import json
+import socket
+import struct
+from time import sleep
+from threading import Lock, Thread
+
+from .apis import APIS
+
+try:  # python 3
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:  # python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer  # type: ignore[no-redef]
+    from SocketServer import ThreadingMixIn  # type: ignore[no-redef]
+    from urlparse import parse_qs, urlsplit  # type: ignore[no-redef]
+
+
+class Fault(object):
+    """
+    注入到匹配端点的故障, times 为生效次数 (None 表示一直生效)
+
+    A fault applied to requests of one endpoint ("*" for all):
+
+    - latency: seconds to wait before answering (longer than the client timeout
+      for a hang)
+    - status: answer with this HTTP status instead of the API, e.g. a 429 or
+      5xx burst; `headers` are added to that response (e.g. Retry-After)
+    - reset: abort the connection with a TCP reset and no response
+    - slow_body: seconds between body chunks of `chunk` bytes
+    """
+
+    def __init__(
+        self, endpoint="*", times=None, latency=0, status=None, headers=None, reset=False, slow_body=0, chunk=16
+    ):
+        # type: (str, int | None, float, int | None, dict | None, bool, float, int) -> None
+        self.endpoint = endpoint
+        self.times = times
+        self.latency = latency
+        self.status = status
+        self.headers = headers or {}
+        self.reset = reset
+        self.slow_body = slow_body
+        self.chunk = chunk
+        self.hits = 0
+
+    def matches(self, endpoint):
+        # type: (str) -> bool
+        return self.endpoint in ("*", endpoint) and (self.times is None or self.hits < self.times)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def _serve(self):
+        simulator = self.server.simulator
+        url = urlsplit(self.path)  # 作为代理时请求行为完整 URL
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if raw.lstrip().startswith("{"):
+            body = json.loads(raw)
+        else:
+            body = {k: v[-1] for k, v in parse_qs(raw).items()}
+
+        endpoint = "ip" if url.path == "/ip" else simulator.api.endpoint(self.command, url.path, self.headers)
+        fault = simulator._begin(endpoint, proxied=bool(url.scheme))
+        try:
+            if fault and fault.latency:
+                sleep(fault.latency)
+            if fault and fault.reset:
+                return self._reset()
+            if fault and fault.status:
+                error = {"code": fault.status, "message": "injected fault"}
+                return self._send(fault.status, json.dumps(error).encode("utf-8"), fault.headers)
+            if endpoint == "ip":
+                return self._send(200, simulator.ip.encode("utf-8"), {"Content-Type": "text/plain"}, fault)
+            status, data = simulator.api.handle(self.command, url.path, query, body, self.headers)
+            self._send(status, json.dumps(data).encode("utf-8"), {}, fault)
+        finally:
+            simulator._end()
+
+    def _send(self, status, payload, headers, fault=None):
+        # type: (int, bytes, dict, Fault | None) -> None
+        self.send_response(status)
+        headers = dict({"Content-Type": "application/json"}, **headers)
+        for key, value in headers.items():
+            self.send_header(key, str(value))
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if not (fault and fault.slow_body):
+            self.wfile.write(payload)
+            return
+        for i in range(0, len(payload), fault.chunk):
+            self.wfile.write(payload[i : i + fault.chunk])
+            self.wfile.flush()
+            sleep(fault.slow_body)
+
+    def _reset(self):
+        # SO_LINGER(1, 0) 让 close 发送 RST 而不是 FIN
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.connection.close()
+        self.close_connection = True
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _serve
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        pass  # 注入的 reset 与客户端超时断开都属预期
+
+
+class ProviderSimulator(object):
+    """
+    在 127.0.0.1 的随机端口上模拟一个服务商 API
+
+    Serve one provider API on a random loopback port. Point a provider at it
+    with `endpoint=simulator.url`; use `simulator.url` as an HTTP proxy to test
+    proxy failover (proxied requests carry absolute URLs and are served the same
+    way), and `simulator.tls_url` to make the TLS handshake fail.
+
+    `/ip` answers with `simulator.ip` for public IP detection rules.
+    """
+
+    def __init__(self, provider="cloudflare"):
+        # type: (str) -> None
+        self.api = APIS[provider]()
+        self.ip = "192.0.2.1"
+        self.faults = []  # type: list[Fault]
+        self.requests = []  # type: list[str] # 依次收到的端点
+        self.proxied = 0  # 以代理方式收到的请求数
+        self.inflight = 0
+        self.max_inflight = 0
+        self._lock = Lock()
+        self._server = None  # type: _Server | None
+
+    @property
+    def url(self):
+        # type: () -> str
+        return "http://127.0.0.1:{}".format(self._server.server_address[1])
+
+    @property
+    def tls_url(self):
+        # type: () -> str
+        """同一端口的 https 地址, 握手会失败 / HTTPS URL of a plain-HTTP port: the handshake fails."""
+        return "https://127.0.0.1:{}".format(self._server.server_address[1])
+
+    def start(self):
+        # type: () -> ProviderSimulator
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.simulator = self
+        thread = Thread(target=self._server.serve_forever, name="simulator-" + self.api.name)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        # type: () -> None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def inject(self, endpoint="*", **kwargs):
+        # type: (str, **Any) -> Fault
+        """添加故障, 参数见 Fault / Add a fault; see Fault for the options."""
+        fault = Fault(endpoint, **kwargs)
+        with self._lock:
+            self.faults.append(fault)
+        return fault
+
+    def clear(self):
+        # type: () -> None
+        """清除故障与请求记录 / Drop all faults and the request log."""
+        with self._lock:
+            self.faults = []
+            self.requests = []
+            self.proxied = 0
+            self.max_inflight = self.inflight
+
+    def count(self, endpoint=None):
+        # type: (str | None) -> int
+        """收到的请求数, endpoint 为空时统计全部"""
+        with self._lock:
+            return sum(1 for e in self.requests if endpoint in (None, e))
+
+    def _begin(self, endpoint, proxied):
+        # type: (str, bool) -> Fault | None
+        with self._lock:
+            self.requests.append(endpoint)
+            self.proxied += proxied
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+            for fault in self.faults:
+                if fault.matches(endpoint):
+                    fault.hits += 1
+                    return fault
+        return None
+
+    def _end(self):
+        # type: () -> None
+        with self._lock:
+            self.inflight -= 1
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
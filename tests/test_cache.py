@@ -11,7 +11,17 @@ from __init__ import patch, unittest
 import os
 import tempfile
 from time import sleep
-from ddns.cache import Cache  # noqa: E402
+from ddns.cache import (  # noqa: E402
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    Cache,
+    backoff_delay,
+    clear_failure,
+    failure_key,
+    get_backoff,
+    parse_failure_key,
+    record_failure,
+)
 
 
 class TestCache(unittest.TestCase):
@@ -708,5 +718,78 @@ class TestCache(unittest.TestCase):
         cache.close()
 
 
+class TestFailureBackoff(unittest.TestCase):
+    """Test cases for persisted failure backoff helpers"""
+
+    def test_failure_key_round_trip(self):
+        """Test failure keys encode provider, domain and record type"""
+        key = failure_key("cloudflare", "www.example.com", "AAAA")
+
+        self.assertEqual(parse_failure_key(key), ("cloudflare", "www.example.com", "AAAA"))
+        self.assertIsNone(parse_failure_key("www.example.com:A"))
+        self.assertIsNone(parse_failure_key("failure:broken"))
+
+    def test_backoff_delay_is_exponential_and_capped(self):
+        """Test backoff doubles on each failure and stops at the cap"""
+        self.assertEqual(backoff_delay(1), BACKOFF_BASE)
+        self.assertEqual(backoff_delay(2), BACKOFF_BASE * 2)
+        self.assertEqual(backoff_delay(3), BACKOFF_BASE * 4)
+        self.assertEqual(backoff_delay(100), BACKOFF_MAX)
+
+    def test_record_failure_accumulates_until_cleared(self):
+        """Test consecutive failures extend the retry time until success"""
+        cache = {}
+        key = failure_key("debug", "example.com", "A")
+
+        first = record_failure(cache, key, now=1000)
+        second = record_failure(cache, key, now=2000)
+
+        self.assertEqual(first["failures"], 1)
+        self.assertEqual(second["failures"], 2)
+        self.assertEqual(second["retry_at"], 2000 + BACKOFF_BASE * 2)
+        self.assertIs(get_backoff(cache, key, now=2001), cache[key])
+        self.assertIsNone(get_backoff(cache, key, now=second["retry_at"]))
+
+        clear_failure(cache, key)
+        self.assertNotIn(key, cache)
+        clear_failure(cache, key)
+
+    def test_backoff_is_scoped_to_failed_address(self):
+        """Test a failure only holds back the address that failed"""
+        cache = {}
+        key = failure_key("debug", "example.com", "A")
+
+        record_failure(cache, key, now=1000, address="192.0.2.1")
+        record_failure(cache, key, now=1001, address="192.0.2.1")
+
+        self.assertIsNotNone(get_backoff(cache, key, now=1002, address="192.0.2.1"))
+        self.assertIsNone(get_backoff(cache, key, now=1002, address="192.0.2.2"))
+        self.assertIsNotNone(get_backoff(cache, key, now=1002))
+        state = record_failure(cache, key, now=1003, address="192.0.2.2")
+        self.assertEqual((state["failures"], state["address"]), (1, "192.0.2.2"))
+
+    def test_failure_state_persists_in_cache_file(self):
+        """Test failure state is saved with the regular cache data"""
+        cache_file = tempfile.mktemp(prefix="ddns_test_cache_", suffix="pk1")
+        self.addCleanup(lambda: os.path.exists(cache_file) and os.remove(cache_file))
+        key = failure_key("debug", "example.com", "A")
+        cache = Cache(cache_file)
+        record_failure(cache, key, now=1000)
+        cache.close()
+
+        reloaded = Cache(cache_file)
+
+        self.assertEqual(reloaded[key]["failures"], 1)
+        self.assertIsNotNone(get_backoff(reloaded, key, now=1001))
+        reloaded.close()
+
+    def test_get_backoff_ignores_invalid_state(self):
+        """Test malformed cache values never block updates"""
+        cache = {"failure:debug:example.com:A": "203.0.113.1", "failure:debug:example.com:AAAA": {"retry_at": "x"}}
+
+        self.assertIsNone(get_backoff(cache, "failure:debug:example.com:A", now=0))
+        self.assertIsNone(get_backoff(cache, "failure:debug:example.com:AAAA", now=0))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -253,6 +253,8 @@ class TestWebSubcommand(unittest.TestCase):
             "8765",
             "--interval",
             "12",
+            "--workers",
+            "3",
             "--open",
             "--debug",
         ]
@@ -267,6 +269,7 @@ class TestWebSubcommand(unittest.TestCase):
         self.assertEqual(captured[0]["host"], "::1")
         self.assertEqual(captured[0]["port"], 8765)
         self.assertEqual(captured[0]["interval"], 12)
+        self.assertEqual(captured[0]["workers"], 3)
         self.assertTrue(captured[0]["open"])
         self.assertTrue(captured[0]["debug"])
 
@@ -279,6 +282,16 @@ class TestWebSubcommand(unittest.TestCase):
 
         self.assertEqual(context.exception.code, 2)
 
+    def test_web_subcommand_rejects_invalid_workers(self):
+        """Keep the dashboard worker pool within a bounded size."""
+        for invalid in ("0", "65", "many"):
+            sys.argv = ["ddns", "web", "--workers", invalid]
+
+            with self.assertRaises(SystemExit) as context:
+                load_config("Test DDNS", "Test doc", "1.0.0", "2026-01-01")
+
+            self.assertEqual(context.exception.code, 2)
+
     def test_web_subcommand_rejects_invalid_interval(self):
         """Require a positive, bounded internal scheduling interval."""
         sys.argv = ["ddns", "web", "--interval", "0"]
@@ -328,7 +341,13 @@ class TestWebSubcommand(unittest.TestCase):
         mock_basic_config.assert_called_once()
         mock_load_env.assert_not_called()
         mock_serve.assert_called_once_with(
-            config_path="dashboard.json", host="127.0.0.1", port=7654, open_browser=True, logger=mock.ANY, interval=9
+            config_path="dashboard.json",
+            host="127.0.0.1",
+            port=7654,
+            open_browser=True,
+            logger=mock.ANY,
+            interval=9,
+            workers=8,
         )
 
     @patch("ddns.web.serve")
@@ -341,7 +360,13 @@ class TestWebSubcommand(unittest.TestCase):
 
         mock_basic_config.assert_called_once()
         mock_serve.assert_called_once_with(
-            config_path=config_path, host="127.0.0.1", port=7654, open_browser=False, logger=mock.ANY, interval=13
+            config_path=config_path,
+            host="127.0.0.1",
+            port=7654,
+            open_browser=False,
+            logger=mock.ANY,
+            interval=13,
+            workers=8,
         )
 
     @patch("ddns.web.serve")
@@ -357,7 +382,13 @@ class TestWebSubcommand(unittest.TestCase):
         mock_basic_config.assert_called_once()
         mock_load_env.assert_called_once_with()
         mock_serve.assert_called_once_with(
-            config_path=config_path, host="127.0.0.1", port=7654, open_browser=False, logger=mock.ANY, interval=17
+            config_path=config_path,
+            host="127.0.0.1",
+            port=7654,
+            open_browser=False,
+            logger=mock.ANY,
+            interval=17,
+            workers=8,
         )
 
     @patch("ddns.web.serve")
@@ -370,7 +401,13 @@ class TestWebSubcommand(unittest.TestCase):
         mock_basic_config.assert_called_once()
         mock_load_env.assert_called_once_with()
         mock_serve.assert_called_once_with(
-            config_path="environment.json", host="127.0.0.1", port=7654, open_browser=False, logger=mock.ANY, interval=5
+            config_path="environment.json",
+            host="127.0.0.1",
+            port=7654,
+            open_browser=False,
+            logger=mock.ANY,
+            interval=5,
+            workers=8,
         )
 
     @patch("ddns.web.serve")
@@ -133,6 +133,15 @@ class TestConfig(unittest.TestCase):
         self.assertNotIn("interval", config.extra)
         self.assertEqual(config.extra["custom"], "value")
 
+    def test_worker_options_are_not_provider_extra(self):
+        """Keep the worker pool options away from provider API parameters."""
+        config = Config(cli_config={"dns": "debug", "workers": 4, "worker_timeout": 60})
+
+        self.assertEqual(config.workers, 4)
+        self.assertEqual(config.worker_timeout, 60)
+        self.assertEqual(config.extra, {})
+        self.assertEqual(Config(json_config={"dns": "debug"}).workers, 0)
+
     def test_config_array_and_conversion_parameters(self):
         """Test array parameter processing and type conversions"""
         # Array parameters
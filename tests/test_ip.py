@@ -336,7 +336,7 @@ class TestIpModule(unittest.TestCase):
         result = get_ip("4", ["regex:172\\.16\\..*", "public"])
 
         self.assertEqual(result, "1.2.3.4")
-        mock_public_v4.assert_called_once_with()
+        mock_public_v4.assert_called_once_with(verify=None)
 
     @patch("ddns.ip.public_v4")
     @patch("ddns.__main__.check_output")
@@ -349,7 +349,7 @@ class TestIpModule(unittest.TestCase):
 
         self.assertEqual(result, "1.2.3.4")
         mock_check_output.assert_called_once_with("test-ip")
-        mock_public_v4.assert_called_once_with()
+        mock_public_v4.assert_called_once_with(verify=None)
 
     @patch("ddns.ip.public_v4")
     @patch("ddns.__main__.check_output")
@@ -362,7 +362,7 @@ class TestIpModule(unittest.TestCase):
 
         self.assertEqual(result, "1.2.3.4")
         mock_check_output.assert_called_once_with("test-ip", shell=True)
-        mock_public_v4.assert_called_once_with()
+        mock_public_v4.assert_called_once_with(verify=None)
 
     @patch("ddns.ip.request")
     def test_get_ip_ipv6_rule_fallback(self, mock_request):
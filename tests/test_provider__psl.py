@@ -0,0 +1,42 @@
+# coding=utf-8
+"""
+公共后缀列表索引单元测试
+
+Test suite for ddns.provider._psl.public_suffix_depth.
+"""
+
+from __future__ import unicode_literals
+
+from __init__ import unittest
+from ddns.provider._psl import public_suffix_depth
+
+
+def depth(domain):
+    return public_suffix_depth(domain.split("."))
+
+
+class TestPublicSuffixDepth(unittest.TestCase):
+    """公共后缀标签数测试"""
+
+    def test_default_rule(self):
+        self.assertEqual(depth("www.example.com"), 1)
+        self.assertEqual(depth("example.unknown-tld"), 1)
+
+    def test_multi_label_suffix(self):
+        self.assertEqual(depth("www.example.com.cn"), 2)
+        self.assertEqual(depth("foo.co.uk"), 2)
+        self.assertEqual(depth("Foo.CO.UK"), 2)
+        self.assertEqual(depth("com.cn"), 2)
+
+    def test_wildcard_and_exception(self):
+        self.assertEqual(depth("a.b.kawasaki.jp"), 3)
+        self.assertEqual(depth("city.kawasaki.jp"), 2)
+        self.assertEqual(depth("foo.ck"), 2)
+        self.assertEqual(depth("www.ck"), 1)
+
+    def test_idn_suffix(self):
+        self.assertEqual(depth("example.公司.cn"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
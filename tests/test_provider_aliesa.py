@@ -4,7 +4,7 @@
 @author: NewFuture
 """
 
-from base_test import unittest, BaseProviderTestCase
+from base_test import unittest, patch, BaseProviderTestCase
 from ddns.provider.aliesa import AliesaProvider
 
 
@@ -141,6 +141,37 @@ class TestAliesaProvider(BaseProviderTestCase):
         record = records[0] if records else None
         self.assertIsNone(record)
 
+    def test_iter_records_pages_until_total_count(self):
+        """Test _iter_records requests later pages until TotalCount is reached"""
+        first_page = [{"RecordId": str(i), "RecordName": "www.example.com"} for i in range(500)]
+
+        with patch.object(self.provider, "_request") as mock_request:
+            mock_request.side_effect = [
+                {"Records": first_page, "TotalCount": 501},
+                {"Records": [{"RecordId": "last", "RecordName": "www.example.com"}], "TotalCount": 501},
+            ]
+
+            records = list(self.provider._iter_records("123", RecordName="www.example.com"))
+
+            self.assertEqual(len(records), 501)
+            self.assertEqual(records[-1]["RecordId"], "last")
+            mock_request.assert_any_call(
+                method="GET", action="ListRecords", SiteId=123, PageSize=500, RecordName="www.example.com"
+            )
+            mock_request.assert_called_with(
+                method="GET", action="ListRecords", SiteId=123, PageSize=500, RecordName="www.example.com", PageNumber=2
+            )
+
+    def test_query_record_stops_after_first_match(self):
+        """Test _query_record does not request further pages once a record is found"""
+        with patch.object(self.provider, "_request") as mock_request:
+            mock_request.return_value = {"Records": [{"RecordId": "123456"}] * 500, "TotalCount": 1200}
+
+            record = self.provider._query_record("123", "www", "example.com", "A", None, {})
+
+            self.assertEqual(record["RecordId"], "123456")
+            mock_request.assert_called_once()
+
     def test_create_record_logic(self):
         """Test create record logic with various response formats"""
         # Test successful creation
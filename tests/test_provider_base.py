@@ -6,7 +6,7 @@ BaseProvider 单元测试
 """
 
 from base_test import BaseProviderTestCase, unittest
-from ddns.provider._base import BaseProvider, encode_params
+from ddns.provider._base import BaseProvider, _build_zone_trie, _match_zone_trie, encode_params
 
 
 class _TestProvider(BaseProvider):
@@ -53,6 +53,12 @@ class TestBaseProvider(BaseProviderTestCase):
         self.assertEqual(provider._proxy, None)  # proxy 初始化为 None
         self.assertEqual(provider._zone_map, {})
 
+    def test_init_name_defaults_to_class_name(self):
+        """测试未配置名称时由类名推导服务商名称"""
+        self.assertEqual(_TestProvider("test_id", "test_token").name, "_test")
+        provider = _TestProvider("test_id", "test_token", name="dnspod_com")
+        self.assertEqual(provider.name, "dnspod_com")
+
     def test_validate_missing_id(self):
         """测试缺少id的验证"""
         with self.assertRaises(ValueError) as cm:
@@ -125,6 +131,47 @@ class TestBaseProvider(BaseProviderTestCase):
         self.assertEqual(zone_id, "zone123")
         self.assertEqual(self.provider._zone_map["example.com"], "zone123")
 
+    def test_get_zone_id_coalesces_concurrent_queries(self):
+        """测试并发查询同一主域名时只发出一次 _query_zone_id"""
+        from threading import Event, Thread
+
+        started, release, calls = Event(), Event(), []
+
+        def slow_query(domain):
+            calls.append(domain)
+            started.set()
+            release.wait(5)
+            return "zone123"
+
+        self.provider._query_zone_id = slow_query
+        results = []
+        threads = [Thread(target=lambda: results.append(self.provider.get_zone_id("example.com"))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(calls, ["example.com"])
+        self.assertEqual(results, ["zone123"] * 5)
+
+    def test_set_record_reports_phase_timings(self):
+        """测试 set_record 记录 zone/query/create/update 阶段耗时"""
+        from ddns.util.timing import Stats, collect
+
+        stats = Stats()
+        with collect(stats, ["www.example.com[A]"]):
+            self.assertTrue(self.provider.set_record("www.example.com", "192.0.2.1"))
+            self.assertTrue(self.provider.set_record("www.example.com", "192.0.2.2"))
+
+        phases = stats.to_dict()["domains"]["www.example.com[A]"]["phases"]
+        self.assertEqual(phases["zone"]["count"], 2)
+        self.assertEqual(phases["query"]["count"], 2)
+        self.assertEqual(phases["create"]["count"], 1)
+        self.assertEqual(phases["update"]["count"], 1)
+
     def test_split_custom_domain_with_tilde(self):
         """测试用~分隔的自定义域名"""
         from ddns.provider._base import _split_custom_domain
@@ -221,6 +268,81 @@ class TestBaseProvider(BaseProviderTestCase):
         self.assertFalse(result)
 
 
+class _ListingProvider(_TestProvider):
+    """支持列出区域的测试 Provider"""
+
+    def __init__(self, *args, **options):
+        super(_ListingProvider, self).__init__(*args, **options)
+        self.listed = 0
+        self.queried = []
+
+    def _list_zones(self):
+        self.listed += 1
+        return dict(self._test_zone_data)
+
+    def _query_zone_id(self, domain):
+        self.queried.append(domain)
+        return super(_ListingProvider, self)._query_zone_id(domain)
+
+
+class TestZoneTrie(BaseProviderTestCase):
+    """区域列表后缀树测试"""
+
+    def test_match_longest_suffix(self):
+        trie = _build_zone_trie({"example.com.": "z1", "sub.example.com": "z2"})
+        self.assertEqual(_match_zone_trie(trie, "a.sub.example.com".split(".")), ("z2", 3))
+        self.assertEqual(_match_zone_trie(trie, "WWW.Example.com".split(".")), ("z1", 2))
+        self.assertIsNone(_match_zone_trie(trie, "example.org".split(".")))
+
+    def test_split_uses_listing_once(self):
+        provider = _ListingProvider(cache={})
+        self.assertEqual(provider._split_zone_and_sub("a.b.example.com"), ("zone123", "a.b", "example.com"))
+        self.assertEqual(provider._split_zone_and_sub("test.com"), ("zone456", "@", "test.com"))
+        self.assertEqual(provider.listed, 1)
+        self.assertEqual(provider.queried, [])
+
+    def test_unlisted_zone_falls_back_to_probe(self):
+        provider = _ListingProvider(cache={})
+        provider._test_zone_data["shared.net"] = "zone-shared"
+        provider._list_zones = lambda: {"example.com": "zone123"}  # 共享区域不在列表中
+        self.assertEqual(provider._split_zone_and_sub("www.shared.net"), ("zone-shared", "www", "shared.net"))
+        self.assertEqual(provider.queried, ["shared.net"])
+        self.assertEqual(provider._split_zone_and_sub("x.missing.org"), (None, None, "x.missing.org"))
+        self.assertEqual(provider.queried, ["shared.net", "missing.org", "x.missing.org"])
+
+    def test_cached_listing_reused_and_refreshed_on_miss(self):
+        cache = {}
+        _ListingProvider(cache=cache)._split_zone_and_sub("www.example.com")
+
+        provider = _ListingProvider(cache=cache)
+        self.assertEqual(provider._split_zone_and_sub("www.example.com")[0], "zone123")
+        self.assertEqual(provider.listed, 0)
+
+        provider._test_zone_data["new.net"] = "zone789"
+        self.assertEqual(provider._split_zone_and_sub("www.new.net"), ("zone789", "www", "new.net"))
+        self.assertEqual(provider.listed, 1)
+
+    def test_without_cache_or_listing_falls_back_to_probe(self):
+        provider = _ListingProvider()
+        self.assertEqual(provider._split_zone_and_sub("www.example.com")[0], "zone123")
+        self.assertEqual(provider.listed, 0)
+
+        provider = _TestProvider(cache={})
+        self.assertEqual(provider._split_zone_and_sub("www.example.com")[0], "zone123")
+
+    def test_probe_starts_at_registrable_domain(self):
+        provider = _ListingProvider()
+        provider._test_zone_data["example.com.cn"] = "zone-cn"
+        self.assertEqual(provider._split_zone_and_sub("a.www.example.com.cn"), ("zone-cn", "a.www", "example.com.cn"))
+        self.assertEqual(provider.queried, ["example.com.cn"])
+
+    def test_listing_error_falls_back_to_probe(self):
+        provider = _ListingProvider(cache={})
+        provider._list_zones = lambda: 1 / 0
+        self.assertEqual(provider._split_zone_and_sub("www.example.com")[0], "zone123")
+        self.assertEqual(provider.queried, ["example.com"])
+
+
 if __name__ == "__main__":
     # 运行测试
     unittest.main(verbosity=2)
@@ -271,6 +271,47 @@ class TestCallbackProvider(BaseProviderTestCase):
         with self.assertRaises(ValueError):
             provider.set_record("example.com", "192.168.1.1")
 
+    @patch("ddns.provider.callback.time")
+    @patch.object(CallbackProvider, "_http")
+    def test_set_records_batch_template(self, mock_http, mock_time):
+        """Test __RECORDS__ sends all domains in one POST request"""
+        mock_time.return_value = 1634567890
+        mock_http.return_value = "OK"
+        token = {"records": "__RECORDS__", "count": "__COUNT__", "ts": "__TIMESTAMP__"}
+        provider = CallbackProvider("https://example.com/hook", token)  # type: ignore
+
+        result = provider.set_records(["a.example.com", "b.example.com"], "192.168.1.1", "A", 300)
+
+        self.assertEqual(result, {"a.example.com": True, "b.example.com": True})
+        mock_http.assert_called_once()
+        args, kwargs = mock_http.call_args
+        self.assertEqual(args[0], "POST")
+        body = kwargs["body"]
+        self.assertEqual(body["count"], "2")
+        self.assertEqual(body["ts"], "1634567890")
+        self.assertEqual(
+            body["records"],
+            [
+                {"domain": "a.example.com", "value": "192.168.1.1", "type": "A", "ttl": 300, "line": None},
+                {"domain": "b.example.com", "value": "192.168.1.1", "type": "A", "ttl": 300, "line": None},
+            ],
+        )
+        self.assertEqual(token["records"], "__RECORDS__")
+
+    def test_batch_size_requires_records_template(self):
+        """Test batch mode is only enabled by the __RECORDS__ placeholder"""
+        self.assertEqual(CallbackProvider(self.id, "").batch_size, 1)
+        self.assertEqual(CallbackProvider(self.id, '{"list": "__RECORDS__"}').batch_size, 1000)
+
+    @patch.object(CallbackProvider, "_http")
+    def test_set_record_in_batch_mode(self, mock_http):
+        """Test a single domain still uses the batch template"""
+        mock_http.return_value = "OK"
+        provider = CallbackProvider(self.id, '{"list": "__RECORDS__"}')
+
+        self.assertTrue(provider.set_record("example.com", "192.168.1.1"))
+        self.assertEqual(mock_http.call_args[1]["body"]["list"][0]["domain"], "example.com")
+
 
 class TestCallbackProviderRealIntegration(BaseProviderTestCase):
     """Real integration tests for CallbackProvider using httpbin.org"""
@@ -8,6 +8,7 @@ Unit tests for CloudflareProvider
 from base_test import BaseProviderTestCase, patch, unittest
 
 from ddns.provider.cloudflare import CloudflareProvider
+from ddns.util.http import HttpResponse
 
 
 class TestCloudflareProvider(BaseProviderTestCase):
@@ -158,6 +159,21 @@ class TestCloudflareProvider(BaseProviderTestCase):
 
             self.assertIsNone(result)
 
+    def test_list_zones_paginates(self):
+        """Test _list_zones walks every page of the zone listing"""
+        provider = CloudflareProvider(self.id, self.token)
+        first_page = [{"id": "zone%d" % i, "name": "d%d.com" % i} for i in range(50)]
+
+        with patch.object(provider, "_request") as mock_request:
+            mock_request.side_effect = [first_page, [{"id": "zone-last", "name": "last.com"}]]
+
+            result = provider._list_zones()
+
+            self.assertEqual(mock_request.call_count, 2)
+            mock_request.assert_called_with("GET", "", per_page=50, page=2)
+            self.assertEqual(len(result), 51)
+            self.assertEqual(result["last.com"], "zone-last")
+
     def test_query_record_success(self):
         """Test _query_record method with successful response"""
         provider = CloudflareProvider(self.id, self.token)
@@ -174,7 +190,48 @@ class TestCloudflareProvider(BaseProviderTestCase):
             self.assertEqual(res["name"], "www.example.com")
 
             params = {"name.exact": "www.example.com"}
-            mock_request.assert_called_once_with("GET", "/zone123/dns_records", type="A", per_page=10000, **params)
+            mock_request.assert_called_once_with(
+                "GET", "/zone123/dns_records", stream=True, type="A", per_page=10000, **params
+            )
+
+    def test_query_record_streams_result_items(self):
+        """Test _query_record parses the record list incrementally and stops at the match"""
+        provider = CloudflareProvider(self.id, self.token)
+        consumed = []
+
+        def chunks():
+            parts = [
+                '{"result": [{"name": "a.example.com", "type": "A"},',
+                '{"name": "www.exam',
+                'ple.com", "type": "A", "id": "rec1"},',
+            ]
+            for text in parts:
+                consumed.append(text)
+                yield text
+            raise AssertionError("read past the matching record")
+
+        with patch("ddns.provider._base.request") as mock_request:
+            mock_request.return_value = HttpResponse(200, "OK", {}, None, chunks())
+
+            record = provider._query_record("zone123", "www", "example.com", "A", None, {})
+
+        self.assertEqual(record["id"], "rec1")
+        self.assertEqual(len(consumed), 3)
+        self.assertTrue(mock_request.call_args[1]["stream"])
+
+    def test_set_record_fails_when_streamed_query_fails(self):
+        """Test a failed streamed record listing fails the update instead of creating a duplicate"""
+        provider = CloudflareProvider(self.id, self.token)
+        body = '{"result": null, "success": false, "errors": [{"code": 7003, "message": "Not found"}]}'
+
+        with patch.object(provider, "_query_zone_id", return_value="zone123"), patch.object(
+            provider, "_create_record"
+        ) as mock_create, patch("ddns.provider._base.request") as mock_request:
+            mock_request.return_value = HttpResponse(404, "Not Found", {}, None, (text for text in [body]))
+
+            self.assertFalse(provider.set_record("www.example.com", "1.2.3.4", "A"))
+
+        mock_create.assert_not_called()
 
     def test_query_record_not_found(self):
         """Test _query_record method when no matching record is found"""
@@ -213,6 +270,7 @@ class TestCloudflareProvider(BaseProviderTestCase):
             mock_request.assert_called_once_with(
                 "GET",
                 "/zone123/dns_records",
+                stream=True,
                 type="A",
                 per_page=10000,
                 **{"name.exact": "www.example.com", "proxied": "true"}
@@ -242,6 +300,7 @@ class TestCloudflareProvider(BaseProviderTestCase):
             mock_request.assert_any_call(
                 "GET",
                 "/zone123/dns_records",
+                stream=True,
                 type="A",
                 per_page=10000,
                 **{"name.exact": "test.example.net", "proxied": "false"}
@@ -249,6 +308,7 @@ class TestCloudflareProvider(BaseProviderTestCase):
             mock_request.assert_any_call(
                 "GET",
                 "/zone123/dns_records",
+                stream=True,
                 type="A",
                 per_page=10000,
                 **{"name.exact": "test.example.net"}
@@ -525,9 +585,8 @@ class TestCloudflareProviderIntegration(BaseProviderTestCase):
             # Verify the actual API calls made
             self.assertEqual(mock_request.call_count, 3)
             mock_request.assert_any_call("GET", "", **{"name.exact": "example.com", "per_page": 50})
-            mock_request.assert_any_call(
-                "GET", "/zone123/dns_records", type="A", per_page=10000, **{"name.exact": "www.example.com"}
-            )
+            query = {"name.exact": "www.example.com", "per_page": 10000}
+            mock_request.assert_any_call("GET", "/zone123/dns_records", stream=True, type="A", **query)
             mock_request.assert_any_call(
                 "POST",
                 "/zone123/dns_records",
@@ -155,6 +155,22 @@ class TestDnscomProvider(BaseProviderTestCase):
                 self.assertEqual(result["recordID"], "123")
                 self.assertEqual(result["record"], "www")
 
+    def test_query_record_pages_until_match(self):
+        """Test _query_record requests later pages only while no match is found"""
+        provider = DnscomProvider(self.id, self.token)
+        first_page = [{"record": "www", "type": "AAAA", "recordID": str(i)} for i in range(500)]
+
+        with patch.object(provider, "_request") as mock_request:
+            mock_request.side_effect = [
+                {"data": first_page},
+                {"data": [{"record": "www", "type": "A", "recordID": "match"}]},
+            ]
+
+            result = provider._query_record("example.com", "www", "example.com", "A", None, {})
+
+            self.assertEqual(result["recordID"], "match")
+            mock_request.assert_called_with("record/list", domainID="example.com", host="www", pageSize=500, page=2)
+
     def test_query_record_with_line(self):
         """Test _query_record method with line parameter"""
         provider = DnscomProvider(self.id, self.token)
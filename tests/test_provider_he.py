@@ -314,6 +314,22 @@ class TestHeProvider(BaseProviderTestCase):
         # Verify logger.error was called with correct parameters
         provider.logger.error.assert_called_once_with("HE API error: %s", "badauth")
 
+    def test_set_records_batches_hostnames(self):
+        """Test set_records sends one request and maps per-host response codes"""
+        provider = HeProvider("", self.token)
+
+        with patch.object(provider, "_http") as mock_http:
+            mock_http.return_value = "nochg 192.168.1.1\nbadauth"
+
+            result = provider.set_records(["a.example.com", "b.example.com"], "192.168.1.1")
+
+            mock_http.assert_called_once_with(
+                "POST",
+                "/nic/update",
+                body={"hostname": "a.example.com,b.example.com", "myip": "192.168.1.1", "password": self.token},
+            )
+            self.assertEqual(result, {"a.example.com": True, "b.example.com": False})
+
 
 class TestHeProviderIntegration(BaseProviderTestCase):
     """Integration tests for HeProvider"""
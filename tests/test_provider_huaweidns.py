@@ -135,6 +135,21 @@ class TestHuaweiDNSProvider(BaseProviderTestCase):
                 self.assertEqual(result["id"], "rec123")
                 self.assertEqual(result["name"], "www.example.com.")
 
+    def test_query_record_stops_at_first_page_match(self):
+        """Test _iter_records pages by offset and stops once a match is consumed"""
+        full_page = [{"id": str(i), "name": "other.example.com.", "type": "A"} for i in range(500)]
+        with patch.object(self.provider, "_request") as mock_request:
+            mock_request.side_effect = [
+                {"recordsets": full_page},
+                {"recordsets": [{"id": "rec", "name": "www.example.com.", "type": "A"}]},
+            ]
+
+            result = self.provider._query_record("zone123", "www", "example.com", "A", None, {})
+
+            self.assertEqual(result["id"], "rec")
+            self.assertEqual(mock_request.call_count, 2)
+            self.assertEqual(mock_request.call_args[1]["offset"], 500)
+
     def test_query_record_with_line(self):
         """Test _query_record method with line parameter"""
         with patch.object(self.provider, "_request") as mock_request:
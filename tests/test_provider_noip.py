@@ -332,6 +332,30 @@ class TestNoipProvider(BaseProviderTestCase):
         # Verify logger.info was called for initial log
         provider.logger.info.assert_any_call("%s => %s(%s)", "example.com", "192.168.1.1", "A")
 
+    def test_set_records_batches_hostnames(self):
+        """Test set_records sends one request and maps per-host response codes"""
+        provider = NoipProvider(self.id, self.token)
+        domains = ["a.example.com", "b.example.com", "c.example.com"]
+
+        with patch.object(provider, "_http") as mock_http:
+            mock_http.return_value = "good 192.168.1.1\nnochg 192.168.1.1\nnohost"
+
+            result = provider.set_records(domains, "192.168.1.1")
+
+            mock_http.assert_called_once_with(
+                "GET", "/nic/update", queries={"hostname": ",".join(domains), "myip": "192.168.1.1"}
+            )
+            self.assertEqual(result, {"a.example.com": True, "b.example.com": True, "c.example.com": False})
+
+    def test_set_records_single_error_applies_to_all(self):
+        """Test a single badauth line fails every hostname in the batch"""
+        provider = NoipProvider(self.id, self.token)
+
+        with patch.object(provider, "_http", return_value="badauth"):
+            result = provider.set_records(["a.example.com", "b.example.com"], "192.168.1.1")
+
+        self.assertEqual(result, {"a.example.com": False, "b.example.com": False})
+
 
 class TestNoipProviderIntegration(BaseProviderTestCase):
     """Integration tests for NoipProvider"""
@@ -18,6 +18,13 @@ class TestCronScheduler(unittest.TestCase):
         """Set up test fixtures"""
         self.scheduler = CronScheduler()
 
+    def test_state_files_are_spool_directories(self):
+        """Test cron status is invalidated by the crontab spool directories"""
+        state_files = self.scheduler.state_files()
+
+        self.assertIn("/var/spool/cron/crontabs", state_files)
+        self.assertIn("/usr/lib/cron/tabs", state_files)
+
     @patch("ddns.scheduler._base.datetime")
     @patch("ddns.scheduler._base.version", "test-version")
     def test_install_with_version_and_date(self, mock_datetime):
@@ -28,6 +28,13 @@ class TestSystemdScheduler(unittest.TestCase):
         """Test timer name constant"""
         self.assertEqual(self.scheduler.TIMER_NAME, "ddns.timer")
 
+    def test_state_files_cover_units_and_enablement(self):
+        """Test state files include both units and the directory holding the enable link"""
+        self.assertEqual(
+            self.scheduler.state_files(),
+            [self.scheduler.SERVICE_PATH, self.scheduler.TIMER_PATH, "/etc/systemd/system/multi-user.target.wants"],
+        )
+
     @patch("os.path.exists")
     def test_is_installed_true(self, mock_exists):
         """Test is_installed returns True when service exists"""
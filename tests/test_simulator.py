@@ -0,0 +1,151 @@
+# coding=utf-8
+"""
+使用离线服务商模拟器的韧性与并发测试
+Resilience and concurrency tests against the offline provider simulator.
+"""
+
+from __init__ import unittest, patch
+import time
+
+from simulator import PROVIDERS, ProviderSimulator
+
+from ddns import __main__
+from ddns.config.config import Config
+from ddns.provider import get_provider_class
+from ddns.util import http, metrics
+from ddns.util.http import request
+
+CREDENTIALS = {
+    "cloudflare": ("user@example.com", "cf-token-0123456789"),
+    "dnspod": ("12345", "dnspod-token-0123456789"),
+    "alidns": ("LTAI0123456789", "ali-secret-0123456789"),
+    "tencentcloud": ("AKID0123456789", "tc-secret-0123456789"),
+}
+
+
+def make_provider(sim, **options):
+    provider_id, token = CREDENTIALS[sim.api.name]
+    return get_provider_class(sim.api.name)(provider_id, token, endpoint=sim.url, **options)
+
+
+class TestSimulatorProviders(unittest.TestCase):
+    """每个模拟的服务商都能完成创建、更新与无变化的流程"""
+
+    def test_create_update_and_unchanged_for_every_provider(self):
+        for name in PROVIDERS:
+            with ProviderSimulator(name) as sim:
+                provider = make_provider(sim)
+                self.assertTrue(provider.set_record("www.example.com", "192.0.2.1"), name)
+                self.assertTrue(provider.set_record("www.example.com", "192.0.2.2"), name)
+                self.assertTrue(provider.set_record("www.example.com", "192.0.2.2"), name)
+
+                record = {"id": "1", "name": "www.example.com", "type": "A", "value": "192.0.2.2"}
+                self.assertEqual(sim.api.find("www.example.com"), [record], name)
+
+
+@patch.object(http.time, "sleep")
+class TestSimulatorFaults(unittest.TestCase):
+    """RetryHandler、代理切换与超时在注入故障下的行为; 重试等待被替换, 测试保持快速"""
+
+    def setUp(self):
+        self.sim = ProviderSimulator("cloudflare").start()
+        self.addCleanup(self.sim.stop)
+
+    def test_retries_through_429_burst(self, mock_sleep):
+        self.sim.inject("GET dns_records", status=429, times=2, headers={"Retry-After": "1"})
+
+        self.assertTrue(make_provider(self.sim).set_record("www.example.com", "192.0.2.1"))
+
+        self.assertEqual(self.sim.count("GET dns_records"), 3)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [2, 4])
+        self.assertEqual(self.sim.api.value("www.example.com"), "192.0.2.1")
+
+    def test_requests_and_retries_are_exported_as_metrics(self, mock_sleep):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        self.sim.inject("GET dns_records", status=429, times=1)
+
+        self.assertTrue(make_provider(self.sim).set_record("www.example.com", "192.0.2.1"))
+
+        text = metrics.render()
+        self.assertIn('ddns_api_requests_total{action="zone",provider="cloudflare",status="200"} 1', text)
+        self.assertIn('ddns_api_requests_total{action="query",provider="cloudflare",status="200"} 1', text)
+        self.assertIn('ddns_api_requests_total{action="create",provider="cloudflare",status="200"} 1', text)
+        self.assertIn('ddns_api_request_duration_seconds_count{action="query",provider="cloudflare"} 1', text)
+        self.assertIn('ddns_http_retries_total{reason="429"} 1', text)
+
+    def test_5xx_burst_longer_than_retries_fails_without_writing(self, mock_sleep):
+        self.sim.inject("GET dns_records", status=503, times=10)
+
+        self.assertFalse(make_provider(self.sim).set_record("www.example.com", "192.0.2.1"))
+
+        self.assertEqual(self.sim.count("GET dns_records"), 3)  # 首次 + 2 次重试
+        self.assertEqual(self.sim.count("POST dns_records"), 0)
+        self.assertEqual(self.sim.api.records, {})
+
+    def test_read_timeout_is_retried(self, mock_sleep):
+        self.sim.inject("ip", latency=0.5, times=1)
+
+        response = request("GET", self.sim.url + "/ip", timeout=0.2, retries=1)
+
+        self.assertEqual(response.body, "192.0.2.1")
+        self.assertEqual(self.sim.count("ip"), 2)
+        mock_sleep.assert_called_once_with(2)
+
+    def test_slow_body_within_timeout(self, mock_sleep):
+        self.sim.inject("GET dns_records", slow_body=0.01, chunk=8)
+        self.sim.api.upsert("www.example.com", "A", "192.0.2.9")
+
+        self.assertTrue(make_provider(self.sim).set_record("www.example.com", "192.0.2.10"))
+
+        self.assertEqual(self.sim.count("POST dns_records"), 0)  # 慢速响应体被完整解析, 找到已有记录
+        self.assertEqual(self.sim.api.find("www.example.com")[0]["id"], "1")
+        self.assertEqual(self.sim.api.value("www.example.com"), "192.0.2.10")
+        mock_sleep.assert_not_called()
+
+    def test_proxy_failover_after_connection_reset(self, mock_sleep):
+        with ProviderSimulator("cloudflare") as proxy:
+            proxy.inject(reset=True)
+            provider = make_provider(self.sim, proxy=[proxy.url, "DIRECT"])
+
+            self.assertTrue(provider.set_record("www.example.com", "192.0.2.1"))
+
+            self.assertEqual(proxy.proxied, proxy.count())
+            self.assertGreater(proxy.count(), 0)
+        self.assertEqual(self.sim.proxied, 0)
+        self.assertEqual(self.sim.api.value("www.example.com"), "192.0.2.1")
+
+    def test_tls_failure_fails_fast(self, mock_sleep):
+        started = time.time()
+        with self.assertRaises(Exception):
+            request("GET", self.sim.tls_url + "/ip", verify=True, timeout=5, retries=2)
+
+        self.assertLess(time.time() - started, 2)
+        mock_sleep.assert_not_called()
+
+
+class TestSimulatorConcurrency(unittest.TestCase):
+    """并发更新在延迟与限流突发下仍然正确"""
+
+    @patch.object(http.time, "sleep")
+    def test_concurrent_update_ip_with_latency_and_throttling(self, mock_sleep):
+        domains = ["d{}.example.com".format(i) for i in range(8)]
+        config = Config(cli_config={"dns": "cloudflare"}, json_config={"extra": {"concurrency": 4}})
+        cache = {}
+        with ProviderSimulator("cloudflare") as sim:
+            sim.inject("POST dns_records", status=429, times=2)
+            sim.inject("*", latency=0.05)
+            provider = make_provider(sim)
+
+            result = __main__.update_ip(provider, cache, ["url:" + sim.url + "/ip"], domains, "A", config)
+
+            self.assertTrue(result)
+            self.assertGreater(sim.max_inflight, 1)
+            self.assertEqual(sim.count("zones"), 1)  # 相同区域查询被合并
+            self.assertEqual(sim.count("POST dns_records"), len(domains) + 2)
+            self.assertEqual([sim.api.value(d) for d in domains], ["192.0.2.1"] * len(domains))
+        self.assertEqual(cache, {d + ":A": "192.0.2.1" for d in domains})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,10 +10,13 @@ from __init__ import TEST_HTTP_TIMEOUT, is_network_error, patch, unittest, sys
 import errno
 import json
 import random
+import gzip
+import io
 import socket
 import ssl
+import zlib
 
-from ddns.util.http import HttpResponse, _decode_response_body, quote, USER_AGENT
+from ddns.util.http import HttpResponse, _decode_response_body, _iter_text, _read_body, quote, USER_AGENT
 
 try:
     from urllib.error import URLError
@@ -334,6 +337,82 @@ class TestDecodeResponseBody(unittest.TestCase):
         self.assertEqual(result, "test")
 
 
+class TestReadBody(unittest.TestCase):
+    """测试 _read_body 增量解压"""
+
+    payload = to_bytes('{"result": [' + ",".join(['{"name": "中文"}'] * 5000) + "]}")
+
+    def test_plain_body(self):
+        self.assertEqual(_read_body(io.BytesIO(self.payload), None), self.payload)
+
+    def test_gzip_body(self):
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as f:
+            f.write(self.payload)
+        buffer.seek(0)
+        self.assertEqual(_read_body(buffer, "gzip"), self.payload)
+
+    def test_zlib_and_raw_deflate_body(self):
+        self.assertEqual(_read_body(io.BytesIO(zlib.compress(self.payload)), "deflate"), self.payload)
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        raw = compressor.compress(self.payload) + compressor.flush()
+        self.assertEqual(_read_body(io.BytesIO(raw), "Deflate"), self.payload)
+
+    def test_corrupted_gzip_raises(self):
+        with self.assertRaises(zlib.error):
+            _read_body(io.BytesIO(b"not gzip data"), "gzip")
+
+    def test_iter_text_decodes_incrementally(self):
+        headers = {"Content-Encoding": "deflate", "Content-Type": "application/json; charset=utf-8"}
+        body = io.BytesIO(zlib.compress(self.payload))
+        self.assertEqual("".join(_iter_text(body, headers)), to_unicode(self.payload))
+        self.assertTrue(body.closed)
+
+    def test_iter_text_size_cap(self):
+        with self.assertRaises(ValueError):
+            list(_iter_text(io.BytesIO(self.payload), {}, max_size=1024))
+
+    def test_non_stream_response_iter_text(self):
+        self.assertEqual(list(HttpResponse(200, "OK", {}, "body").iter_text()), ["body"])
+
+
+class TestStreamHostSlot(unittest.TestCase):
+    """测试流式响应在读完或关闭前占用主机并发名额"""
+
+    def _open(self, url):
+        from ddns.util import http
+
+        body = io.BytesIO(to_bytes('{"result": [1, 2, 3]}'))
+        body.info = lambda: {"Content-Type": "application/json"}
+        body.getcode = lambda: 200
+        with patch.object(http, "build_opener") as build_opener, patch.object(http, "MAX_HOST_CONNECTIONS", 1):
+            build_opener.return_value.open.return_value = body
+            return http.request("GET", url, stream=True), http._host_slot(url)
+
+    def assertSlotFree(self, slot, free=True):
+        acquired = slot.acquire(False)
+        if acquired:
+            slot.release()
+        self.assertEqual(acquired, free)
+
+    def test_slot_held_until_stream_drained(self):
+        response, slot = self._open("https://drain.example.com/records")
+
+        self.assertSlotFree(slot, False)
+        self.assertEqual("".join(response.iter_text()), '{"result": [1, 2, 3]}')
+        self.assertSlotFree(slot)
+
+    def test_slot_released_on_close(self):
+        response, slot = self._open("https://close.example.com/records")
+        chunks = response.iter_text()
+        next(chunks)
+
+        self.assertSlotFree(slot, False)
+        response.close()
+        response.close()
+        self.assertSlotFree(slot)
+
+
 class TestSendHttpRequest(unittest.TestCase):
     """测试 request 函数"""
 
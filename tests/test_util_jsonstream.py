@@ -0,0 +1,67 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.jsonstream module
+"""
+
+from __future__ import unicode_literals
+from __init__ import unittest
+import json
+
+from ddns.util.jsonstream import iter_json_array
+
+
+def split(text, size):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+    """Test cases for the iterative JSON array item parser"""
+
+    document = {
+        "result": [
+            {"name": 'quote " and \\\\ backslash', "tags": [1, {"x": "]},["}]},
+            {"name": "中文"},
+            42,
+            "a,b",
+            None,
+        ],
+        "success": True,
+        "result_info": {"count": 5},
+    }
+
+    def test_items_across_any_chunk_boundary(self):
+        text = json.dumps(self.document, ensure_ascii=False)
+        for size in (1, 2, 3, 5, 64, len(text)):
+            self.assertEqual(list(iter_json_array(split(text, size), ("result",))), self.document["result"])
+
+    def test_root_and_nested_paths(self):
+        self.assertEqual(list(iter_json_array(['[1, 2 , {"a": []}]'])), [1, 2, {"a": []}])
+        self.assertEqual(list(iter_json_array(['{"a": {"b": [5, 6]}}'], ["a", "b"])), [5, 6])
+
+    def test_missing_or_empty_array(self):
+        self.assertEqual(list(iter_json_array(['{"result": []}'], ("result",))), [])
+        self.assertEqual(list(iter_json_array(['{"errors": [1], "result": null}'], ("result",))), [])
+        self.assertEqual(list(iter_json_array(['{"a": {"result": [1]}}'], ("result",))), [])
+
+    def test_stops_after_array_and_closes_source(self):
+        closed = []
+
+        def chunks():
+            try:
+                yield '{"result": [1, 2]'
+                raise AssertionError("read past the array")
+            finally:
+                closed.append(True)
+
+        items = iter_json_array(chunks(), ("result",))
+        self.assertEqual(next(items), 1)
+        items.close()
+        self.assertEqual(closed, [True])
+
+    def test_invalid_item_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(['{"result": [{"a": }]}'], ("result",)))
+
+
+if __name__ == "__main__":
+    unittest.main()
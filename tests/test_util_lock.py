@@ -0,0 +1,57 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.lock module
+"""
+
+from __init__ import unittest
+import os
+import shutil
+import tempfile
+
+from ddns.util.lock import FileLock
+
+
+class TestFileLock(unittest.TestCase):
+    """Test cases for the inter-process file lock"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "ddns.lock")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_acquire_writes_pid(self):
+        lock = FileLock(self.path)
+        self.assertTrue(lock.acquire())
+        self.assertEqual(lock.owner(), os.getpid())
+        lock.release()
+
+    def test_second_lock_fails_without_waiting(self):
+        first, second = FileLock(self.path), FileLock(self.path)
+        self.assertTrue(first.acquire())
+        try:
+            self.assertFalse(second.acquire(0))
+            self.assertFalse(second.acquire(0.3, interval=0.1))
+        finally:
+            first.release()
+        self.assertTrue(second.acquire(0))
+        second.release()
+
+    def test_release_is_idempotent(self):
+        lock = FileLock(self.path)
+        lock.release()
+        with lock:
+            self.assertTrue(lock.acquire())  # 已持有时直接返回
+        lock.release()
+        self.assertTrue(FileLock(self.path).acquire(0))
+
+    def test_unwritable_path_raises(self):
+        lock = FileLock(os.path.join(self.tmpdir, "missing", "ddns.lock"))
+        with self.assertRaises(OSError):
+            lock.acquire(0)
+        lock.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.metrics module
+"""
+
+from __init__ import unittest
+
+from ddns.util import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """Test counters, gauges and histograms in the Prometheus text format"""
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_render_is_empty_without_values(self):
+        self.assertEqual(metrics.render(), "")
+
+    def test_counters_and_gauges_with_labels(self):
+        metrics.inc("ddns_api_requests_total", {"provider": "cloudflare", "action": "query", "status": "200"})
+        metrics.inc("ddns_api_requests_total", {"status": "200", "action": "query", "provider": "cloudflare"}, 2)
+        metrics.set_gauge("ddns_sync_last_success_timestamp_seconds", {"provider": "debug"}, 1700000000.5)
+
+        lines = metrics.render().splitlines()
+
+        self.assertEqual(lines[0], "# HELP ddns_api_requests_total " + metrics.METRICS["ddns_api_requests_total"][1])
+        self.assertEqual(lines[1], "# TYPE ddns_api_requests_total counter")
+        self.assertEqual(lines[2], 'ddns_api_requests_total{action="query",provider="cloudflare",status="200"} 3')
+        self.assertIn("# TYPE ddns_sync_last_success_timestamp_seconds gauge", lines)
+        self.assertIn('ddns_sync_last_success_timestamp_seconds{provider="debug"} 1700000000.5', lines)
+
+    def test_histogram_buckets_are_cumulative(self):
+        labels = {"provider": "debug", "result": "succeeded"}
+        metrics.observe("ddns_sync_duration_seconds", labels, 0.2)
+        metrics.observe("ddns_sync_duration_seconds", labels, 0.25)
+        metrics.observe("ddns_sync_duration_seconds", labels, 90)
+
+        text = metrics.render()
+
+        self.assertIn("# TYPE ddns_sync_duration_seconds histogram", text)
+        self.assertIn('ddns_sync_duration_seconds_bucket{provider="debug",result="succeeded",le="0.1"} 0\n', text)
+        self.assertIn('ddns_sync_duration_seconds_bucket{provider="debug",result="succeeded",le="0.25"} 2\n', text)
+        self.assertIn('ddns_sync_duration_seconds_bucket{provider="debug",result="succeeded",le="60.0"} 2\n', text)
+        self.assertIn('ddns_sync_duration_seconds_bucket{provider="debug",result="succeeded",le="+Inf"} 3\n', text)
+        self.assertIn('ddns_sync_duration_seconds_sum{provider="debug",result="succeeded"} 90.45\n', text)
+        self.assertIn('ddns_sync_duration_seconds_count{provider="debug",result="succeeded"} 3\n', text)
+
+    def test_label_values_are_escaped(self):
+        metrics.inc("ddns_http_retries_total", {"reason": 'a"b\\c\nd'})
+
+        self.assertIn('ddns_http_retries_total{reason="a\\"b\\\\c\\nd"} 1', metrics.render())
+
+
+if __name__ == "__main__":
+    unittest.main()
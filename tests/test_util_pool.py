@@ -0,0 +1,56 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.pool module
+"""
+
+from __init__ import unittest
+from threading import Event, Lock, current_thread
+
+from ddns.util.pool import parallel_map
+
+
+class TestParallelMap(unittest.TestCase):
+    """Test cases for the bounded thread-based parallel map"""
+
+    def test_single_worker_runs_inline(self):
+        names = []
+        result = parallel_map(lambda x: names.append(current_thread().name) or x * 2, [1, 2, 3], 1)
+        self.assertEqual(result, [2, 4, 6])
+        self.assertEqual(set(names), {current_thread().name})
+
+    def test_results_keep_input_order(self):
+        result = parallel_map(lambda x: x * x, range(20), 4)
+        self.assertEqual(result, [x * x for x in range(20)])
+
+    def test_concurrency_is_bounded(self):
+        lock, running, peak = Lock(), [0], [0]
+        release = Event()
+
+        def task(_):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                if running[0] == 3:
+                    release.set()
+            release.wait(5)
+            with lock:
+                running[0] -= 1
+
+        parallel_map(task, range(10), 3)
+        self.assertEqual(peak[0], 3)
+
+    def test_first_error_is_raised(self):
+        def task(x):
+            if x == 2:
+                raise ValueError("bad item")
+            return x
+
+        with self.assertRaises(ValueError):
+            parallel_map(task, range(5), 2)
+
+    def test_empty_items(self):
+        self.assertEqual(parallel_map(lambda x: x, [], 4), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.profiler module
+"""
+
+from __init__ import unittest
+import os
+import pstats
+import shutil
+import tempfile
+import time
+
+from ddns.util.profiler import SamplingProfiler, profile_call, profile_format
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for the profiling helpers"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_profile_format(self):
+        self.assertEqual(profile_format("run.prof"), "pstats")
+        self.assertEqual(profile_format("/tmp/run.callgrind"), "callgrind")
+        self.assertEqual(profile_format("callgrind.out.1234"), "callgrind")
+        self.assertEqual(profile_format("web.folded"), "sample")
+
+    def test_pstats_output(self):
+        path = os.path.join(self.tmpdir, "run.prof")
+        self.assertEqual(profile_call(path, busy, 1000), busy(1000))
+        names = [func[2] for func in pstats.Stats(path).stats]
+        self.assertIn("busy", names)
+
+    def test_callgrind_output_written_on_exit(self):
+        path = os.path.join(self.tmpdir, "run.callgrind")
+
+        def exit_after_work():
+            busy(1000)
+            raise SystemExit(1)
+
+        with self.assertRaises(SystemExit):
+            profile_call(path, exit_after_work)
+        with open(path) as f:
+            content = f.read()
+        self.assertTrue(content.startswith("# callgrind format"))
+        self.assertIn("events: Microseconds", content)
+        self.assertIn("fn=busy:", content)
+        self.assertIn("cfn=busy:", content)
+
+    def test_sampling_profiler_records_folded_stacks(self):
+        path = os.path.join(self.tmpdir, "web.folded")
+        sampler = SamplingProfiler(path, interval=0.001)
+        sampler.start()
+        end = time.time() + 0.2
+        while time.time() < end:
+            busy(100)
+        sampler.stop()
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertTrue(int(count) > 0)
+        self.assertTrue(any("test_sampling_profiler_records_folded_stacks" in line for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
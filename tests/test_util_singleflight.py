@@ -0,0 +1,80 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.singleflight module
+"""
+
+from __init__ import unittest
+from threading import Event, Thread
+from time import sleep
+
+from ddns.util.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for coalescing identical in-flight calls"""
+
+    def run_concurrently(self, flight, key, func, count=4):
+        started, release, results, errors = Event(), Event(), [], []
+
+        def leader():
+            started.set()
+            release.wait(5)
+            return func()
+
+        def call(target):
+            try:
+                results.append(flight.do(key, target))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [Thread(target=call, args=(leader,))]
+        threads[0].start()
+        started.wait(5)
+        threads += [Thread(target=call, args=(func,)) for _ in range(count - 1)]
+        for thread in threads[1:]:
+            thread.start()
+        sleep(0.1)  # 等待其余调用方进入等待状态后再放行首个调用
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        return results, errors
+
+    def test_sequential_calls_are_not_cached(self):
+        flight, calls = SingleFlight(), []
+        self.assertEqual(flight.do("k", lambda: calls.append(1) or len(calls)), 1)
+        self.assertEqual(flight.do("k", lambda: calls.append(1) or len(calls)), 2)
+        self.assertEqual(len(flight), 0)
+
+    def test_concurrent_calls_share_result(self):
+        flight, calls = SingleFlight(), []
+
+        def query():
+            calls.append(1)
+            return {"id": "zone"}
+
+        results, errors = self.run_concurrently(flight, ("zone", "example.com"), query)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(r == {"id": "zone"} for r in results))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(flight), 0)
+
+    def test_error_is_shared_and_cleared(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        results, errors = self.run_concurrently(flight, "k", fail)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(flight.do("k", lambda: "ok"), "ok")
+
+    def test_different_keys_run_independently(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do("a", lambda: 1), 1)
+        self.assertEqual(flight.do("b", lambda: 2), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# coding=utf-8
+"""
+Unit tests for ddns.util.timing module
+"""
+
+from __init__ import unittest
+from threading import Thread
+
+from ddns.util import timing
+
+
+class TestTiming(unittest.TestCase):
+    """Test cases for phase timers and counters"""
+
+    def test_noop_without_collector(self):
+        self.assertIsNone(timing.current())
+        with timing.phase("zone"):
+            timing.count("api_calls")
+        self.assertIsNone(timing.current())
+
+    def test_phases_and_counters_are_attributed_to_domains(self):
+        stats = timing.Stats(index=1, dns="debug")
+        with timing.collect(stats):
+            with timing.phase("cache_load"):
+                pass
+            with timing.collect(stats, ["a.example.com[A]", "b.example.com[A]"]):
+                with timing.phase("query"):
+                    timing.count("api_calls", 2)
+            self.assertIs(timing.current(), stats)
+        self.assertIsNone(timing.current())
+
+        stats.note("a.example.com[A]", cache="miss", result="updated")
+        report = stats.to_dict()
+        self.assertEqual(report["index"], 1)
+        self.assertEqual(report["phases"]["cache_load"]["count"], 1)
+        self.assertEqual(report["phases"]["query"]["count"], 1)
+        self.assertEqual(report["counters"], {"api_calls": 2})
+        domain = report["domains"]["a.example.com[A]"]
+        self.assertEqual(domain["counters"], {"api_calls": 2})
+        self.assertEqual(domain["result"], "updated")
+        self.assertIn("query", report["domains"]["b.example.com[A]"]["phases"])
+
+    def test_current_phase_tracks_innermost_block(self):
+        self.assertIsNone(timing.current_phase())
+        with timing.phase("set_record"):
+            with timing.phase("zone"):
+                self.assertEqual(timing.current_phase(), "zone")
+            self.assertEqual(timing.current_phase(), "set_record")
+        self.assertIsNone(timing.current_phase())
+
+    def test_collectors_are_thread_local(self):
+        stats = timing.Stats()
+
+        def worker():
+            with timing.collect(stats, ["x[A]"]):
+                timing.count("retries")
+
+        with timing.collect(None):
+            threads = [Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            timing.count("retries")  # 当前线程未收集
+        self.assertEqual(stats.counters, {"retries": 4})
+        self.assertEqual(stats.domains["x[A]"]["counters"], {"retries": 4})
+
+
+if __name__ == "__main__":
+    unittest.main()
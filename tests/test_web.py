@@ -4,31 +4,38 @@
 from __future__ import unicode_literals
 
 import copy
+import gzip
 import io
 import json
 import logging
 import os
 import shutil
+import socket
 import sys
 import tempfile
 import threading
 import time
 
-from __init__ import MagicMock, patch, unittest
+from __init__ import MagicMock, call, patch, unittest
 
 try:
+    from http.client import HTTPConnection
     from urllib.error import HTTPError
     from urllib.request import Request, urlopen
 except ImportError:  # Python 2
+    from httplib import HTTPConnection
     from urllib2 import HTTPError, Request, urlopen
 
 from ddns.provider import get_provider_class
+from ddns.util import metrics
 from ddns.web.server import DashboardRequestHandler, _resource_bytes, _write_stdout, create_server, serve
 from ddns.web.scheduler import WebScheduler
 from ddns.web.service import (
     CONFIG_MODEL,
     ConfigValidationError,
+    DashboardNotFoundError,
     DashboardOperationError,
+    DashboardRequestError,
     DashboardService,
     _replace_file,
     resolve_config_path,
@@ -582,6 +589,28 @@ class TestDashboardService(unittest.TestCase):
         records = {(record["domain"], record["provider"]) for record in dashboard["records"]}
         self.assertEqual(records, {("first.example.com", "debug"), ("second.example.com", "callback")})
 
+    def test_dashboard_reports_backoff_state(self):
+        """Surface persistently failing records that are waiting for a retry."""
+        cache_path = os.path.join(self.temp_dir, "shared.cache")
+        config = _valid_config()
+        config["cache"] = cache_path
+        self.service.save(config)
+        now = time.time()
+        failures = {
+            "failure:debug:Home.Example.com:A": {"failures": 2, "last_failure": now, "retry_at": now + 600},
+            "failure:callback:home.example.com:A": {"failures": 1, "last_failure": now, "retry_at": now + 300},
+        }
+        with io.open(cache_path, "w", encoding="utf-8") as cache_file:
+            cache_file.write(json.dumps(failures))
+
+        dashboard = self.service.dashboard()
+
+        backoff = dashboard["providers"][0]["backoff"]
+        self.assertEqual(len(backoff), 1)
+        self.assertEqual(backoff[0]["domain"], "home.example.com")
+        self.assertEqual(backoff[0]["failures"], 2)
+        self.assertEqual(dashboard["records"], [])
+
     def test_dashboard_allows_small_cache_mtime_clock_skew(self):
         """Do not hide a freshly written cache when file mtime is slightly ahead."""
         cache_path = os.path.join(self.temp_dir, "shared.cache")
@@ -600,6 +629,150 @@ class TestDashboardService(unittest.TestCase):
         self.assertEqual(dashboard["records"][0]["domain"], "home.example.com")
         self.assertEqual(dashboard["records"][0]["updated"], now)
 
+    def test_dashboard_reuses_snapshot_until_files_change(self):
+        """Rebuild the file projection only when the config or a cache file changes."""
+        cache_path = os.path.join(self.temp_dir, "shared.cache")
+        config = _valid_config()
+        config["cache"] = cache_path
+        self.service.save(config)
+
+        with patch.object(self.service, "_build_snapshot", wraps=self.service._build_snapshot) as mock_build:
+            self.assertEqual(self.service.dashboard()["records"], [])
+            self.service.dashboard()
+            self.assertEqual(mock_build.call_count, 1)
+
+            with io.open(cache_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write(json.dumps({"home.example.com:A": "203.0.113.10"}))
+            dashboard = self.service.dashboard()
+
+        self.assertEqual(mock_build.call_count, 2)
+        self.assertEqual([record["value"] for record in dashboard["records"]], ["203.0.113.10"])
+
+    def _save_many_records(self, count):
+        """Save a configuration whose cache holds count IPv4 and one IPv6 record."""
+        cache_path = os.path.join(self.temp_dir, "many.cache")
+        config = _valid_config()
+        config["cache"] = cache_path
+        config["providers"][0]["ipv4"] = ["host{:04d}.example.com".format(index) for index in range(count)]
+        config["providers"][0]["ipv6"] = ["host0001.example.com"]
+        self.service.save(config)
+        cache = {
+            "host{:04d}.example.com:A".format(index): "198.51.100.{}".format(index % 250) for index in range(count)
+        }
+        cache["host0001.example.com:AAAA"] = "2001:db8::1"
+        with io.open(cache_path, "w", encoding="utf-8") as cache_file:
+            cache_file.write(json.dumps(cache))
+
+    def test_records_pages_with_stable_cursor(self):
+        """Walk every record once through keyset pages and cap the dashboard payload."""
+        self._save_many_records(450)
+
+        pages = [self.service.records(limit=200)]
+        while pages[-1]["next_cursor"]:
+            pages.append(self.service.records(cursor=pages[-1]["next_cursor"], limit=200))
+        domains = [record["domain"] for page in pages for record in page["records"]]
+        dashboard = self.service.dashboard()
+
+        self.assertEqual([len(page["records"]) for page in pages], [200, 200, 51])
+        self.assertEqual(pages[0]["total"], 451)
+        self.assertEqual(domains[:3], ["host0000.example.com", "host0001.example.com", "host0001.example.com"])
+        self.assertEqual(len(domains), 451)
+        self.assertEqual(dashboard["record_count"], 451)
+        self.assertEqual(len(dashboard["records"]), 200)
+
+    def test_records_filter_and_sort_on_server(self):
+        """Filter by provider, type and domain substring, and sort in either order."""
+        self._save_many_records(30)
+
+        ipv6 = self.service.records(record_type="aaaa")
+        matching = self.service.records(query="HOST002", sort="domain", order="desc", limit=4)
+        following = self.service.records(query="host002", order="desc", limit=4, cursor=matching["next_cursor"])
+        by_value = self.service.records(sort="value", limit=1)
+        other_provider = self.service.records(provider="cloudflare")
+
+        self.assertEqual([record["value"] for record in ipv6["records"]], ["2001:db8::1"])
+        self.assertEqual(ipv6["total"], 1)
+        self.assertEqual(matching["total"], 10)
+        self.assertEqual(
+            [record["domain"] for record in matching["records"]],
+            ["host0029.example.com", "host0028.example.com", "host0027.example.com", "host0026.example.com"],
+        )
+        self.assertEqual(following["records"][0]["domain"], "host0025.example.com")
+        self.assertEqual(by_value["records"][0]["value"], "198.51.100.0")
+        self.assertEqual(other_provider["records"], [])
+        for invalid in ({"sort": "ttl"}, {"order": "up"}, {"limit": 0}, {"limit": "many"}, {"cursor": "!!"}):
+            with self.assertRaises(DashboardRequestError):
+                self.service.records(**invalid)
+        with self.assertRaises(DashboardRequestError):
+            self.service.records(sort="type", cursor=matching["next_cursor"])
+
+    def test_dashboard_since_returns_only_changes(self):
+        """Answer a since version with changed fields, records and removals only."""
+        self._save_many_records(3)
+        cache_path = os.path.join(self.temp_dir, "many.cache")
+        mtime = os.path.getmtime(cache_path)
+        full = self.service.dashboard()
+        unchanged = self.service.dashboard(since=full["version"])
+
+        with io.open(cache_path, "w", encoding="utf-8") as cache_file:
+            cache_file.write(
+                json.dumps({"host0000.example.com:A": "198.51.100.0", "host0001.example.com:A": "203.0.113.1"})
+            )
+        os.utime(cache_path, (mtime, mtime))  # 保持更新时间不变, 只有改写的记录算作变化
+        delta = self.service.dashboard(since=str(full["version"]))
+
+        self.assertNotIn("delta", full)
+        self.assertEqual(unchanged["version"], full["version"])
+        self.assertEqual(unchanged["records"], [])
+        self.assertEqual(unchanged["removed_records"], [])
+        self.assertEqual(unchanged["scheduler"], {})
+        self.assertNotIn("providers", unchanged)
+        self.assertTrue(delta["delta"])
+        self.assertGreater(delta["version"], full["version"])
+        self.assertEqual([record["value"] for record in delta["records"]], ["203.0.113.1"])
+        self.assertEqual(
+            delta["removed_records"],
+            [
+                {"provider": "debug", "domain": "host0001.example.com", "type": "AAAA"},
+                {"provider": "debug", "domain": "host0002.example.com", "type": "A"},
+            ],
+        )
+        self.assertEqual(delta["record_count"], 2)
+        self.assertNotIn("config_path", delta)
+        self.assertEqual(self.service.dashboard(since=delta["version"])["records"], [])
+
+    def test_dashboard_since_falls_back_to_full_snapshot(self):
+        """Return the full dashboard for versions from another process and reject invalid ones."""
+        full = self.service.dashboard()
+
+        stale = self.service.dashboard(since=1)
+        future = self.service.dashboard(since=full["version"] + 10)
+
+        self.assertNotIn("delta", stale)
+        self.assertIn("config_path", stale)
+        self.assertNotIn("delta", future)
+        for invalid in (-1, "latest"):
+            with self.assertRaises(DashboardRequestError):
+                self.service.dashboard(since=invalid)
+
+    def test_dashboard_does_not_wait_for_sync_lock(self):
+        """Serve dashboard reads while another thread holds the synchronization lock."""
+        self.service.save(_valid_config())
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with self.service._lock:
+                locked.set()
+                release.wait(5)
+
+        worker = threading.Thread(target=hold_lock)
+        worker.start()
+        self.addCleanup(worker.join)
+        self.addCleanup(release.set)
+        locked.wait(5)
+
+        self.assertEqual(self.service.dashboard()["state"], "ready")
+
     def test_missing_file_projects_environment_only_configuration(self):
         """Expose an environment-only provider without persisting default fields."""
         self.mock_load_env_config.return_value = {
@@ -775,6 +948,175 @@ class TestDashboardService(unittest.TestCase):
         self.assertIn("cancelled", str(context.exception).lower())
         mock_run.assert_called_once()
 
+    @patch("ddns.__main__.run")
+    def test_start_sync_reports_progress_in_background(self, mock_run):
+        """Return a queued job immediately and expose per-provider progress."""
+        self.service.save(_valid_config())
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_run(_config):
+            started.set()
+            release.wait(5)
+            return True
+
+        mock_run.side_effect = blocking_run
+        self.addCleanup(release.set)
+
+        job = self.service.start_sync()
+        self.assertTrue(started.wait(5))
+        running = self.service.sync_job(job["id"])
+        duplicate = self.service.start_sync()
+        release.set()
+        deadline = time.time() + 5
+        while self.service.sync_job(job["id"])["status"] == "running" and time.time() < deadline:
+            time.sleep(0.01)
+        finished = self.service.sync_job(job["id"])
+
+        self.assertIn(job["status"], ("queued", "running"))
+        self.assertEqual(running["status"], "running")
+        self.assertEqual(running["providers"][0]["status"], "running")
+        self.assertEqual(running["providers"][0]["records"], 1)
+        self.assertEqual(duplicate["id"], job["id"])
+        self.assertEqual(finished["status"], "succeeded")
+        self.assertEqual(finished["providers"][0]["status"], "succeeded")
+        self.assertEqual([item["id"] for item in self.service.sync_jobs()], [job["id"]])
+        self.assertEqual(self.service.dashboard()["state"], "synced")
+        with self.assertRaises(DashboardNotFoundError):
+            self.service.sync_job("missing")
+
+    @patch("ddns.__main__.run")
+    def test_parallel_sync_runs_providers_concurrently(self, mock_run):
+        """Run independent providers at the same time when parallelism allows."""
+        config = _valid_config()
+        config["cache"] = False
+        second = copy.deepcopy(config["providers"][0])
+        second["ipv4"] = ["second.example.com"]
+        config["providers"].append(second)
+        self.service.save(config)
+        entered, both_running = [], threading.Event()
+
+        def concurrent_run(runtime_config):
+            entered.append(runtime_config.ipv4[0])
+            if len(entered) == 2:
+                both_running.set()
+            return both_running.wait(5)
+
+        mock_run.side_effect = concurrent_run
+
+        dashboard = self.service.sync(parallelism=2)
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(dashboard["state"], "synced")
+
+    @patch("ddns.__main__.run", return_value=True)
+    def test_sync_skips_configuration_locked_by_another_run(self, mock_run):
+        """Share the per-config lock with CLI runs instead of writing the same cache concurrently."""
+        from ddns.__main__ import config_lock
+
+        self.service.save(_valid_config())
+        holder = config_lock(self.service._sync_configs()[0][1])
+        self.assertTrue(holder.acquire())
+        try:
+            with self.assertRaises(DashboardOperationError):
+                self.service.sync()
+        finally:
+            holder.release()
+
+        mock_run.assert_not_called()
+        self.service.sync()
+        mock_run.assert_called_once()
+
+    @patch("ddns.__main__.run", return_value=True)
+    def test_sync_reports_unwritable_lock_path(self, mock_run):
+        """Fail the provider job with a clear error when the lock file cannot be opened."""
+        from ddns.util.lock import FileLock
+
+        self.service.save(_valid_config())
+        lock = FileLock(os.path.join(self.temp_dir, "missing", "ddns.lock"))
+        with patch("ddns.__main__.config_lock", return_value=lock):
+            with patch.object(self.service.logger, "warning") as mock_warning:
+                with self.assertRaises(DashboardOperationError):
+                    self.service.sync()
+
+        mock_run.assert_not_called()
+        self.assertIn("Cannot open lock file", mock_warning.call_args[0][2])
+
+    def test_wait_events_resumes_after_last_event_id(self):
+        """Replay missed events by id and ask stale clients to reload."""
+        first = self.service.latest_event_id()
+        self.service.save(_valid_config())
+
+        events = self.service.wait_events(first, 1)
+        started = time.time()
+        idle = self.service.wait_events(self.service.latest_event_id(), 0.05)
+        future = self.service.wait_events(self.service.latest_event_id() + 10, 1)
+
+        self.assertEqual([event["event"] for event in events], ["activity"])
+        self.assertEqual(events[0]["id"], first + 1)
+        self.assertEqual(events[0]["data"]["message"], "配置已保存")
+        self.assertEqual(idle, [])
+        self.assertLess(time.time() - started, 1)
+        self.assertEqual([event["event"] for event in future], ["reset"])
+        with patch("ddns.web.service.EVENT_HISTORY", 2):
+            for _ in range(3):
+                self.service._record_activity("INFO", "测试", "事件")
+            self.assertEqual([event["event"] for event in self.service.wait_events(first, 1)], ["reset"])
+
+    @patch("ddns.__main__.run", return_value=True)
+    def test_sync_publishes_job_and_record_events(self, mock_run):
+        """Push per-provider job progress and the records each provider wrote."""
+        config = _valid_config()
+        cache_path = os.path.join(self.temp_dir, "events.cache")
+        config["cache"] = cache_path
+        self.service.save(config)
+        first = self.service.latest_event_id()
+
+        def write_cache(_config):
+            with io.open(cache_path, "w", encoding="utf-8") as cache_file:
+                cache_file.write(json.dumps({"home.example.com:A": "203.0.113.10"}))
+            return True
+
+        mock_run.side_effect = write_cache
+        job = self.service.start_sync()
+        deadline = time.time() + 5
+        while self.service.sync_job(job["id"])["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.01)
+        events = self.service.wait_events(first, 1)
+
+        names = [event["event"] for event in events]
+        records = [event["data"] for event in events if event["event"] == "records"]
+        jobs = [event["data"]["status"] for event in events if event["event"] == "sync"]
+        self.assertIn("activity", names)
+        self.assertEqual(jobs[0], "running")
+        self.assertEqual(jobs[-1], "succeeded")
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["status"], "succeeded")
+        self.assertEqual([record["value"] for record in records[0]["records"]], ["203.0.113.10"])
+
+    def test_record_events_read_one_cache_and_cap_records(self):
+        """Publish a provider's records from its cache without rebuilding the dashboard snapshot."""
+        self._save_many_records(450)
+        first = self.service.latest_event_id()
+        config = self.service._sync_configs()[0][1]
+
+        with patch.object(self.service, "_build_snapshot") as mock_build:
+            self.service._publish_records(0, config, True)
+
+        mock_build.assert_not_called()
+        update = self.service.wait_events(first, 1)[-1]["data"]
+        self.assertEqual(update["record_count"], 451)
+        self.assertEqual(len(update["records"]), 200)
+        self.assertEqual(update["records"][0]["domain"], "host0000.example.com")
+
+    def test_start_sync_validates_parallelism(self):
+        """Reject parallelism outside the supported worker range."""
+        self.service.save(_valid_config())
+
+        for value in (0, 9, True, "2"):
+            with self.assertRaises(ConfigValidationError):
+                self.service.start_sync(parallelism=value)
+        self.assertEqual(self.service.sync_jobs(), [])
+
     def test_scheduler_action_uses_selected_interval(self):
         """Update the interval for the current web process."""
         result = self.service.configure_scheduler("configure", interval=12)
@@ -817,6 +1159,27 @@ class TestDashboardService(unittest.TestCase):
         self.assertFalse(status["enabled"])
         self.assertEqual(status["external_scheduler"], "test")
 
+    def test_external_scheduler_probes_are_cached(self):
+        """Probe platform schedulers once per TTL unless their state files change."""
+        unit_path = os.path.join(self.temp_dir, "ddns.timer")
+        self.mock_scheduler.state_files.return_value = [unit_path]
+
+        with patch("ddns.web.service.SCHEDULER_STATUS_TTL", 0):
+            self.service.dashboard()
+            self.service.dashboard()
+        expired_calls = self.mock_scheduler.get_status.call_count
+        self.service.dashboard()
+        self.service.dashboard()
+        self.service._scheduled_sync_guard()
+        cached_calls = self.mock_scheduler.get_status.call_count
+        with io.open(unit_path, "w", encoding="utf-8") as unit_file:
+            unit_file.write("[Timer]\n")
+        self.service.dashboard()
+
+        self.assertEqual(expired_calls, 2)
+        self.assertEqual(cached_calls, 3)
+        self.assertEqual(self.mock_scheduler.get_status.call_count, 4)
+
     def test_scheduler_takeover_disables_external_task(self):
         """Disable the old system task before enabling web scheduling."""
         self.mock_scheduler.get_status.side_effect = [
@@ -906,6 +1269,19 @@ class TestWebScheduler(unittest.TestCase):
         self.assertFalse(called.is_set())
         self.assertEqual(scheduler.status()["blocked_reason"], "external task")
 
+    def test_listener_observes_state_changes(self):
+        """Notify the listener outside the lock whenever scheduler state changes."""
+        seen = []
+        scheduler = WebScheduler(
+            lambda: None, interval=5, enabled=False, listener=lambda: seen.append(scheduler.status())
+        )
+
+        scheduler.configure(enabled=True, interval=7)
+
+        self.assertEqual(len(seen), 1)
+        self.assertTrue(seen[0]["enabled"])
+        self.assertEqual(seen[0]["interval"], 7)
+
 
 class TestDashboardStartup(unittest.TestCase):
     """Test safe dashboard process startup."""
@@ -1017,6 +1393,197 @@ class TestDashboardServer(unittest.TestCase):
         self.assertEqual(asset_status, 200)
         self.assertIn('api("/api/dashboard")', script)
 
+    def test_metrics_endpoint_serves_prometheus_text_without_token(self):
+        """Serve process metrics to a local scraper that cannot know the per-process token."""
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        metrics.inc("ddns_cache_lookups_total", {"provider": "debug", "result": "hit"})
+
+        status, headers, content = self._request("/metrics")
+        foreign_status, _, _ = self._request("/metrics", headers={"Host": "metrics.example.com"})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Type"], metrics.CONTENT_TYPE)
+        self.assertIn('ddns_cache_lookups_total{provider="debug",result="hit"} 1\n', content)
+        self.assertEqual(foreign_status, 421)
+
+    def test_dashboard_api_passes_since_version(self):
+        """Forward the since query parameter to the service for incremental dashboard updates."""
+        headers = {"X-DDNS-Token": self.token}
+        with patch.object(self.service, "dashboard", return_value={"version": 8, "delta": True}) as mock_dashboard:
+            status, _, content = self._request("/api/dashboard?since=7", headers=headers)
+            self._request("/api/dashboard", headers=headers)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(content), {"version": 8, "delta": True})
+        self.assertEqual(mock_dashboard.call_args_list, [call(since="7"), call(since=None)])
+
+    def test_records_api_passes_query_parameters(self):
+        """Expose paginated records with query-string filters and structured errors."""
+        headers = {"X-DDNS-Token": self.token}
+        with patch.object(self.service, "records", return_value={"records": [], "next_cursor": None}) as mock_records:
+            path = "/api/records?type=A&q=home&sort=value&order=desc&limit=5"
+            status, _, content = self._request(path, headers=headers)
+        invalid_status, _, invalid_content = self._request("/api/records?limit=0", headers=headers)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(content)["records"], [])
+        mock_records.assert_called_once_with(
+            provider=None, record_type="A", query="home", sort="value", order="desc", cursor=None, limit="5"
+        )
+        self.assertEqual(invalid_status, 400)
+        self.assertEqual(json.loads(invalid_content)["error"]["code"], "invalid_request")
+
+    @patch("ddns.__main__.run", return_value=True)
+    def test_sync_api_runs_background_job(self, mock_run):
+        """Accept a sync request with 202 and report the job until it finishes."""
+        headers = {"Content-Type": "application/json", "X-DDNS-Token": self.token}
+        self._request("/api/config", method="PUT", payload={"config": _valid_config()}, headers=headers)
+
+        status, _, content = self._request("/api/sync", method="POST", payload={"parallelism": 2}, headers=headers)
+        job_path = "/api/sync/" + json.loads(content)["job"]["id"]
+        deadline = time.time() + 5
+        while True:
+            job_status, _, job_content = self._request(job_path, headers=headers)
+            job = json.loads(job_content)["job"]
+            if job["status"] not in ("queued", "running") or time.time() > deadline:
+                break
+            time.sleep(0.01)
+        list_status, _, list_content = self._request("/api/sync", headers=headers)
+        missing_status, _, _ = self._request("/api/sync/missing", headers=headers)
+        invalid_status, _, _ = self._request("/api/sync", method="POST", payload={"parallelism": 0}, headers=headers)
+
+        self.assertEqual(status, 202)
+        self.assertEqual(job_status, 200)
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["parallelism"], 2)
+        self.assertEqual(list_status, 200)
+        self.assertEqual([item["id"] for item in json.loads(list_content)["jobs"]], [job["id"]])
+        self.assertEqual(missing_status, 404)
+        self.assertEqual(invalid_status, 400)
+        mock_run.assert_called_once()
+
+    def test_static_assets_use_gzip_etag_and_keep_alive(self):
+        """Serve cached compressed assets, revalidate with 304, and reuse the connection."""
+        connection = HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        self.addCleanup(connection.close)
+
+        def fetch(headers):
+            connection.request("GET", "/assets/dashboard.js", headers=headers)
+            response = connection.getresponse()
+            return response, response.read()
+
+        plain, plain_body = fetch({})
+        compressed, compressed_body = fetch({"Accept-Encoding": "br, gzip;q=0.8"})
+        etag = compressed.getheader("ETag")
+        revalidated, revalidated_body = fetch({"Accept-Encoding": "gzip", "If-None-Match": etag})
+        refused, _ = fetch({"Accept-Encoding": "gzip;q=0"})
+
+        self.assertEqual(plain.status, 200)
+        self.assertIsNone(plain.getheader("Content-Encoding"))
+        self.assertEqual(plain.getheader("Cache-Control"), "no-cache")
+        self.assertEqual(plain.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(compressed.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(gzip.GzipFile(fileobj=io.BytesIO(compressed_body)).read(), plain_body)
+        self.assertLess(len(compressed_body), len(plain_body))
+        self.assertNotEqual(compressed.getheader("ETag"), plain.getheader("ETag"))
+        self.assertEqual(revalidated.status, 304)
+        self.assertEqual(revalidated_body, b"")
+        self.assertEqual(revalidated.getheader("ETag"), compressed.getheader("ETag"))
+        self.assertIsNone(refused.getheader("Content-Encoding"))
+
+    def test_unread_request_body_closes_connection(self):
+        """Close keep-alive connections when a rejected request body was never read."""
+        connection = HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=5)
+        self.addCleanup(connection.close)
+        connection.request("POST", "/api/sync", body=b"{}", headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+
+        self.assertEqual(response.status, 403)
+        self.assertEqual(response.getheader("Connection"), "close")
+
+    def _event_ticket(self):
+        """Exchange the access token for a single-use event stream ticket."""
+        headers = {"Content-Type": "application/json", "X-DDNS-Token": self.token}
+        status, _, content = self._request("/api/events/ticket", method="POST", payload={}, headers=headers)
+        self.assertEqual(status, 200)
+        return json.loads(content)["ticket"]
+
+    def _open_events(self, query="", headers=None):
+        """Open the event stream and return the live response."""
+        path = "/api/events?ticket={}{}".format(self._event_ticket(), query)
+        response = urlopen(Request(self.base_url + path, headers=headers or {}), timeout=5)
+        self.addCleanup(response.close)
+        return response
+
+    def _read_event(self, response, name):
+        """Read stream lines until an event with the given name arrives."""
+        event = {}
+        while True:
+            line = response.readline().decode("utf-8").rstrip("\n")
+            if not line:
+                if event.get("event") == name:
+                    return event
+                event = {}
+                continue
+            field, _, value = line.partition(": ")
+            event[field] = value
+
+    def test_event_stream_pushes_activities_and_resumes(self):
+        """Stream activity events and replay them after the Last-Event-ID."""
+        response = self._open_events()
+        headers = {"Content-Type": "application/json", "X-DDNS-Token": self.token}
+        self._request("/api/config", method="PUT", payload={"config": _valid_config()}, headers=headers)
+
+        live = self._read_event(response, "activity")
+        resumed = self._open_events(headers={"Last-Event-ID": str(int(live["id"]) - 1)})
+        replayed = self._read_event(resumed, "activity")
+        unauthorized, _, _ = self._request("/api/events")
+
+        self.assertEqual(response.headers.get("Content-Type"), "text/event-stream; charset=utf-8")
+        self.assertEqual(json.loads(live["data"])["message"], "配置已保存")
+        self.assertEqual(replayed, live)
+        self.assertEqual(unauthorized, 403)
+
+    def test_event_stream_requires_single_use_ticket(self):
+        """Authorize event streams with one-time tickets instead of the access token in the URL."""
+        ticket = self._event_ticket()
+        response = urlopen(self.base_url + "/api/events?ticket=" + ticket, timeout=5)
+        self.addCleanup(response.close)
+        response.readline()
+
+        reused, _, _ = self._request("/api/events?ticket=" + ticket)
+        query_token, _, _ = self._request("/api/events?token=" + self.token)
+        with patch("ddns.web.server.EVENT_TICKET_TTL", -1):
+            expired, _, _ = self._request("/api/events?ticket=" + self._event_ticket())
+        unauthenticated, _, _ = self._request(
+            "/api/events/ticket", method="POST", payload={}, headers={"Content-Type": "application/json"}
+        )
+
+        self.assertEqual(response.getcode(), 200)
+        self.assertEqual((reused, query_token, expired, unauthenticated), (403, 403, 403, 403))
+
+    def test_access_log_omits_query_string(self):
+        """Keep event stream tickets and other query values out of the request log."""
+        self._open_events(query="&last_event_id=0").readline()
+        self._request("/api/records?q=secret-domain")
+        time.sleep(0.1)
+
+        logged = " ".join(str(args) for args, _ in self.server.logger.info.call_args_list)
+        self.assertIn("/api/events", logged)
+        self.assertNotIn("ticket=", logged)
+        self.assertNotIn("secret-domain", logged)
+
+    @patch("ddns.web.server.EVENT_HEARTBEAT_SECONDS", 0.05)
+    def test_event_stream_sends_heartbeat(self):
+        """Keep idle streams alive with comment heartbeats."""
+        response = self._open_events()
+
+        lines = [response.readline().decode("utf-8") for _ in range(3)]
+
+        self.assertEqual(lines, ["retry: 3000\n", "\n", ": heartbeat\n"])
+
     def test_read_api_requires_launch_token(self):
         """Protect status and credentials from other loopback users."""
         status, _, content = self._request("/api/config")
@@ -1085,5 +1652,94 @@ class TestDashboardServer(unittest.TestCase):
         self.assertEqual(get_payload["model"]["defaults"]["provider"], "debug")
 
 
+class TestDashboardWorkerPool(unittest.TestCase):
+    """Test the bounded worker pool, connection timeouts and fast rejection."""
+
+    def _start(self, workers):
+        """Start a dashboard server with the given pool size."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        with patch("ddns.web.service.get_schedulers", return_value=[]):
+            service = DashboardService(config_path=os.path.join(temp_dir, "config.json"))
+        server = create_server(service=service, host="127.0.0.1", port=0, logger=MagicMock(), workers=workers)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(thread.join, 2)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def _connect(self, server):
+        """Open an idle client connection that occupies a worker or a queue slot."""
+        client = socket.create_connection(server.server_address[:2], timeout=5)
+        self.addCleanup(client.close)
+        return client
+
+    def _wait_until(self, condition):
+        """Poll a condition for up to five seconds."""
+        deadline = time.time() + 5
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_saturated_pool_rejects_with_503(self):
+        """Answer at once with 503 when every worker is busy and the queue is full."""
+        server = self._start(workers=1)
+        self.assertEqual(len(server._worker_threads), 1)
+        self._connect(server)
+        self._wait_until(lambda: server.busy_workers == 1)
+        for _ in range(4):
+            self._connect(server)
+        self._wait_until(lambda: server._pending.qsize() == 4)
+
+        rejected = self._connect(server)
+        rejected.sendall(b"GET / HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n")
+        response = b""
+        while True:
+            chunk = rejected.recv(4096)
+            if not chunk:
+                break
+            response += chunk
+
+        self.assertTrue(response.startswith(b"HTTP/1.1 503 "), response)
+        self.assertIn(b"Retry-After: 1", response)
+        self.assertIn(b'"code":"server_busy"', response)
+
+    @patch.object(DashboardRequestHandler, "timeout", 0.2)
+    def test_idle_connection_releases_worker(self):
+        """Time out idle keep-alive connections so queued requests get served."""
+        server = self._start(workers=1)
+        self._connect(server)
+        base_url = "http://127.0.0.1:{}".format(server.server_address[1])
+
+        started = time.time()
+        response = urlopen(base_url + "/", timeout=5)
+
+        self.assertEqual(response.getcode(), 200)
+        self.assertLess(time.time() - started, 3)
+
+    def test_event_streams_use_at_most_half_the_workers(self):
+        """Refuse extra event streams so ordinary requests keep a free worker."""
+        server = self._start(workers=2)
+        events_url = "http://127.0.0.1:{}/api/events?ticket=".format(server.server_address[1])
+        stream = urlopen(events_url + server.issue_event_ticket(), timeout=5)
+        self.addCleanup(stream.close)
+        stream.readline()
+
+        with self.assertRaises(HTTPError) as context:
+            urlopen(events_url + server.issue_event_ticket(), timeout=5)
+        page = urlopen("http://127.0.0.1:{}/".format(server.server_address[1]), timeout=5)
+
+        self.assertEqual(context.exception.code, 503)
+        self.assertEqual(page.getcode(), 200)
+
+    def test_create_server_validates_worker_count(self):
+        """Reject pool sizes outside the supported range."""
+        for workers in (0, 65, True):
+            with self.assertRaises(ValueError):
+                create_server(service=MagicMock(), host="127.0.0.1", port=0, workers=workers)
+
+
 if __name__ == "__main__":
     unittest.main()
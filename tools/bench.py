@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""Benchmark ddns end-to-end against local stand-in provider APIs.
+
+Small HTTP servers imitate the Cloudflare, DNSPod, AliDNS and Tencent Cloud
+APIs (zone lookup, record query, create and update) with a configurable
+latency, so whole runs can be timed offline and repeatably:
+
+- cold:      empty servers and cache, every record is created
+- update:    the IP changes and the cache is dropped, every record is updated
+- cache_hit: a second run with a warm cache, no API call is expected
+- startup:   ``python -m ddns --version``
+
+Hot helpers are also timed in-process: encode_params,
+hmac_sha256_authorization, remove_comment and _mask_sensitive_data.
+Results are written as JSON so two commits can be compared.
+
+Usage:
+    python3 tools/bench.py [--domains 20] [--latency 20] [--repeat 3] [--output bench.json]
+    python3 tools/bench.py --compare base.json --output head.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ZONE = "example.com"
+ZONE_ID = "1001"
+PROVIDERS = ("cloudflare", "dnspod", "alidns", "tencentcloud")
+PROXY_ENV = ("http_proxy", "https_proxy", "all_proxy", "no_proxy")
+
+
+class StandIn:
+    """In-memory DNS records of one provider, keyed by (fqdn, type)."""
+
+    def __init__(self, name: str, latency: float) -> None:
+        self.name = name
+        self.latency = latency
+        self.ip = "192.0.2.1"
+        self.records: dict[tuple[str, str], dict[str, str]] = {}
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.records.clear()
+            self.calls = 0
+
+    def find(self, fqdn: str, record_type: str | None) -> list[dict[str, str]]:
+        with self.lock:
+            return [
+                dict(r, fqdn=name, type=t)
+                for (name, t), r in sorted(self.records.items())
+                if name == fqdn and (not record_type or t == record_type)
+            ]
+
+    def upsert(self, fqdn: str, record_type: str, value: str, record_id: str | None = None) -> str:
+        with self.lock:
+            key = (fqdn, record_type)
+            if record_id is None:
+                record_id = str(len(self.records) + 1)
+            else:  # 按 ID 修改时允许更换记录名
+                for old_key, old in list(self.records.items()):
+                    if old["id"] == str(record_id):
+                        del self.records[old_key]
+            self.records[key] = {"id": str(record_id), "value": value}
+            return str(record_id)
+
+    def stale(self, domains: int) -> bool:
+        """Whether any benchmark record is missing or does not hold the current IP."""
+        with self.lock:
+            return len(self.records) != domains or any(r["value"] != self.ip for r in self.records.values())
+
+    # ---- request handlers: (method, path, query, body, headers) -> response body ----
+
+    def handle(self, method: str, path: str, query: dict, body: dict, headers: Any) -> dict:
+        return getattr(self, "_" + self.name)(method, path, query, body, headers)
+
+    def _cloudflare(self, method: str, path: str, query: dict, body: dict, headers: Any) -> dict:
+        parts = path.strip("/").split("/")[2:]  # client/v4/...
+        if parts == ["zones"]:
+            name = query.get("name.exact", query.get("name"))
+            page = int(query.get("page", 1))
+            zones = [{"id": ZONE_ID, "name": ZONE}] if page == 1 and name in (None, ZONE) else []
+            return {"success": True, "result": zones}
+        if len(parts) >= 3 and parts[2] == "dns_records":
+            if method == "GET":
+                if int(query.get("page", 1)) > 1:
+                    return {"success": True, "result": []}
+                found = self.find(query.get("name.exact", query.get("name", "")), query.get("type"))
+                result = [{"id": r["id"], "name": r["fqdn"], "type": r["type"], "content": r["value"]} for r in found]
+                return {"success": True, "result": result}
+            record_id = parts[3] if len(parts) > 3 else None
+            record_id = self.upsert(body["name"], body["type"], body["content"], record_id)
+            return {"success": True, "result": dict(body, id=record_id)}
+        return {"success": False, "errors": [{"message": "unknown path " + path}]}
+
+    def _dnspod(self, method: str, path: str, query: dict, body: dict, headers: Any) -> dict:
+        action = path.strip("/")
+        ok = {"code": "1", "message": "Action completed successful"}
+        if action == "Domain.Info":
+            if body.get("domain") != ZONE:
+                return {"status": {"code": "6", "message": "Domain not found"}}
+            return {"status": ok, "domain": {"id": ZONE_ID, "name": ZONE}}
+        if action == "Domain.List":
+            return {"status": ok, "domains": [{"id": ZONE_ID, "name": ZONE}]}
+        if action == "Record.List":
+            sub = body.get("sub_domain", "@")
+            found = self.find(sub + "." + ZONE if sub != "@" else ZONE, body.get("record_type"))
+            if not found:
+                return {"status": {"code": "10", "message": "No records"}}
+            records = [
+                {"id": r["id"], "name": sub, "type": r["type"], "value": r["value"], "line": "默认"} for r in found
+            ]
+            return {"status": ok, "records": records}
+        if action in ("Record.Create", "Record.Modify"):
+            sub = body.get("sub_domain", "@")
+            fqdn = sub + "." + ZONE if sub != "@" else ZONE
+            record_id = self.upsert(fqdn, body["record_type"], body["value"], body.get("record_id"))
+            return {"status": ok, "record": {"id": record_id, "name": sub, "value": body["value"]}}
+        return {"status": {"code": "-1", "message": "unknown action " + action}}
+
+    def _alidns(self, method: str, path: str, query: dict, body: dict, headers: Any) -> dict:
+        action = headers.get("x-acs-action", "")
+        params = dict(query, **body)
+        if action == "GetMainDomainName":
+            name = params.get("InputString", "")
+            rr = name[: -len(ZONE) - 1] if name.endswith("." + ZONE) else "@"
+            return {"RR": rr, "DomainName": ZONE}
+        if action == "DescribeSubDomainRecords":
+            found = self.find(params.get("SubDomain", ""), params.get("Type"))
+            records = [
+                {
+                    "RecordId": r["id"],
+                    "RR": r["fqdn"][: -len(ZONE) - 1] or "@",
+                    "DomainName": ZONE,
+                    "Type": r["type"],
+                    "Value": r["value"],
+                    "Line": "default",
+                    "TTL": 600,
+                }
+                for r in found
+            ]
+            return {"TotalCount": len(records), "DomainRecords": {"Record": records}}
+        if action in ("AddDomainRecord", "UpdateDomainRecord"):
+            rr = params.get("RR", "@")
+            fqdn = rr + "." + ZONE if rr != "@" else ZONE
+            record_id = self.upsert(fqdn, params["Type"], params["Value"], params.get("RecordId"))
+            return {"RecordId": record_id}
+        return {"Code": "InvalidAction", "Message": "unknown action " + action}
+
+    def _tencentcloud(self, method: str, path: str, query: dict, body: dict, headers: Any) -> dict:
+        action = headers.get("X-TC-Action", "")
+        if action == "DescribeDomain":
+            return {"Response": {"DomainInfo": {"DomainId": int(ZONE_ID), "Domain": ZONE}}}
+        if action == "DescribeDomainList":
+            return {"Response": {"DomainList": [{"DomainId": int(ZONE_ID), "Name": ZONE}]}}
+        if action == "DescribeRecordList":
+            sub = body.get("Subdomain", "@")
+            found = self.find(sub + "." + ZONE if sub != "@" else ZONE, body.get("RecordType"))
+            if not found:
+                error = {"Code": "ResourceNotFound.NoDataOfRecord", "Message": "No records"}
+                return {"Response": {"Error": error}}
+            records = [
+                {"RecordId": int(r["id"]), "Name": sub, "Type": r["type"], "Value": r["value"], "Line": "默认"}
+                for r in found
+            ]
+            return {"Response": {"RecordList": records}}
+        if action in ("CreateRecord", "ModifyRecord"):
+            sub = body.get("SubDomain", "@")
+            fqdn = sub + "." + ZONE if sub != "@" else ZONE
+            record_id = None if body.get("RecordId") is None else str(body["RecordId"])
+            record_id = self.upsert(fqdn, body["RecordType"], body["Value"], record_id)
+            return {"Response": {"RecordId": int(record_id)}}
+        return {"Response": {"Error": {"Code": "InvalidAction", "Message": "unknown action " + action}}}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: Server
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def _reply(self) -> None:
+        standin = self.server.standin
+        url = urlsplit(self.path)
+        if url.path == "/ip":  # 公网 IP 探测, 不计入 API 调用也不加延迟
+            return self._send(standin.ip.encode(), "text/plain")
+
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if raw.lstrip().startswith("{"):
+            body = json.loads(raw)
+        else:
+            body = {k: v[-1] for k, v in parse_qs(raw).items()}
+        with standin.lock:
+            standin.calls += 1
+        if standin.latency:
+            time.sleep(standin.latency)
+        result = standin.handle(self.command, url.path, query, body, self.headers)
+        self._send(json.dumps(result).encode("utf-8"), "application/json")
+
+    def _send(self, data: bytes, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = _reply
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, standin: StandIn) -> None:
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.standin = standin
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self.server_address[1])
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def write_config(path: Path, servers: dict[str, Server], domains: int, workdir: Path) -> None:
+    names = ["d{}.{}".format(i, ZONE) for i in range(domains)]
+    providers = []
+    for name, server in servers.items():
+        providers.append(
+            {
+                "provider": name,
+                "id": "bench@example.com" if name == "cloudflare" else "bench-id",
+                "token": "bench-token-0123456789",
+                "endpoint": server.url,
+                "ipv4": names,
+                "ipv6": [],
+                "index4": ["url:" + server.url + "/ip"],
+                "index6": False,
+                "cache": str(workdir / (name + ".cache")),
+                "ssl": False,
+            }
+        )
+    config = {
+        "$schema": "https://ddns.newfuture.cc/schema/v4.1.json",
+        "providers": providers,
+        "log": {"level": "ERROR"},
+    }
+    path.write_text(json.dumps(config, indent=2), encoding="utf-8")
+
+
+def run_ddns(args: list[str], cwd: Path) -> tuple[float, int]:
+    env = {k: v for k, v in os.environ.items() if k.lower() not in PROXY_ENV and not k.startswith("DDNS_")}
+    env["PYTHONPATH"] = str(REPO_ROOT)
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "ddns"] + args, cwd=cwd, env=env, capture_output=True, text=True, timeout=600
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0 and "--version" not in args:
+        sys.stderr.write(proc.stdout + proc.stderr)
+    return elapsed, proc.returncode
+
+
+def api_calls(report: Path) -> int:
+    data = json.loads(report.read_text(encoding="utf-8"))
+    return sum(c.get("counters", {}).get("api_calls", 0) for c in data.get("configs", []))
+
+
+def summary(samples: list[float], **extra: Any) -> dict[str, Any]:
+    return dict(
+        extra,
+        median=round(statistics.median(samples), 4),
+        min=round(min(samples), 4),
+        runs=[round(s, 4) for s in samples],
+    )
+
+
+def bench_e2e(providers: list[str], domains: int, latency_ms: float, repeat: int) -> dict[str, Any]:
+    standins = {name: StandIn(name, latency_ms / 1000.0) for name in providers}
+    servers = {name: Server(standin) for name, standin in standins.items()}
+    workdir = Path(tempfile.mkdtemp(prefix="ddns-bench-"))
+    config, report = workdir / "config.json", workdir / "report.json"
+    write_config(config, servers, domains, workdir)
+    args = ["-c", str(config), "--report-file", str(report)]
+    samples: dict[str, list[float]] = {"cold": [], "update": [], "cache_hit": [], "startup": []}
+    calls: dict[str, int] = {}
+    failures = 0
+    try:
+        for i in range(repeat):
+            for standin in standins.values():
+                standin.reset()
+                standin.ip = "192.0.2.{}".format(1 + i % 200)
+            for cache in workdir.glob("*.cache"):
+                cache.unlink()
+
+            for phase in ("cold", "update", "cache_hit"):
+                if phase == "update":  # IP 变化且缓存失效, 走查询+修改路径
+                    for standin in standins.values():
+                        standin.ip = "198.51.100.{}".format(1 + i % 200)
+                    for cache in workdir.glob("*.cache"):
+                        cache.unlink()
+                elapsed, code = run_ddns(args, workdir)
+                failures += code != 0 or any(s.stale(domains) for s in standins.values())
+                samples[phase].append(elapsed)
+                calls[phase] = api_calls(report)
+
+            samples["startup"].append(run_ddns(["--version"], workdir)[0])
+
+        records = sum(len(s.records) for s in standins.values())
+    finally:
+        for server in servers.values():
+            server.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {name: summary(values, api_calls=calls.get(name, 0)) for name, values in samples.items()}
+    results["records"] = records
+    results["failures"] = failures
+    return results
+
+
+def bench_micro(number: int) -> dict[str, Any]:
+    sys.path.insert(0, str(REPO_ROOT))
+    from ddns.provider._base import encode_params
+    from ddns.provider._signature import hmac_sha256_authorization, sha256_hash
+    from ddns.provider.cloudflare import CloudflareProvider
+    from ddns.util.comment import remove_comment
+
+    params = {"Action": "DescribeRecordList", "Domain": ZONE, "Subdomain": "www", "RecordType": "A", "Limit": 100}
+    headers = {"content-type": "application/json", "host": "dnspod.tencentcloudapi.com", "x-tc-action": "modifyrecord"}
+    body_hash = sha256_hash(json.dumps(params))
+    commented = "\n".join(
+        '  "key{0}": "value // {0}", // comment {0}\n  # line comment {0}\n  /* block {0} */'.format(i)
+        for i in range(50)
+    )
+    provider = CloudflareProvider("bench@example.com", "bench-token-0123456789")
+    url = "https://api.example.com/zones?token=bench-token-0123456789&id=bench%40example.com&page=1"
+
+    cases: dict[str, Callable[[], Any]] = {
+        "encode_params": lambda: encode_params(params),
+        "hmac_sha256_authorization": lambda: hmac_sha256_authorization(
+            secret_key="bench-secret",
+            method="POST",
+            path="/",
+            query="",
+            headers=headers,
+            body_hash=body_hash,
+            signing_string_format="TC3-HMAC-SHA256\n1700000000\n2023-11-14/dnspod/tc3_request\n"
+            "{HashedCanonicalRequest}",
+            authorization_format="TC3-HMAC-SHA256 SignedHeaders={SignedHeaders}, Signature={Signature}",
+        ),
+        "remove_comment": lambda: remove_comment(commented),
+        "mask_sensitive_data": lambda: provider._mask_sensitive_data(url),
+    }
+    results = {}
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        results[name] = {"usec_per_call": round(best / number * 1e6, 3), "number": number}
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    """Comparable metrics: e2e medians, API call counts and micro-benchmark timings."""
+    metrics = {}
+    for key, value in results.items():
+        name = prefix + key
+        if isinstance(value, dict):
+            if "median" in value:
+                metrics[name + ".median"] = value["median"]
+                metrics[name + ".api_calls"] = value.get("api_calls", 0)
+            elif "usec_per_call" in value:
+                metrics[name + ".usec_per_call"] = value["usec_per_call"]
+            else:
+                metrics.update(flatten(value, name + "."))
+    return metrics
+
+
+def compare(base: dict[str, Any], head: dict[str, Any]) -> list[str]:
+    old, new = flatten(base["results"]), flatten(head["results"])
+    lines = ["{:<48} {:>12} {:>12} {:>9}".format("metric", "base", "head", "change")]
+    for name in sorted(set(old) & set(new)):
+        change = "" if not old[name] else "{:+.1f}%".format((new[name] - old[name]) / old[name] * 100)
+        lines.append("{:<48} {:>12} {:>12} {:>9}".format(name, old[name], new[name], change))
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--domains", type=int, default=20, help="domains per provider (default: 20)")
+    parser.add_argument("--providers", default=",".join(PROVIDERS), help="comma-separated stand-in providers")
+    parser.add_argument("--latency", type=float, default=20, help="simulated API latency in ms (default: 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="end-to-end repetitions (default: 3)")
+    parser.add_argument("--number", type=int, default=2000, help="calls per micro-benchmark sample")
+    parser.add_argument("--skip-e2e", action="store_true", help="only run the micro-benchmarks")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", metavar="BASE", help="print changes against an earlier JSON result")
+    args = parser.parse_args(argv)
+
+    providers = [p.strip() for p in args.providers.split(",") if p.strip()]
+    unknown = sorted(set(providers) - set(PROVIDERS))
+    if unknown:
+        parser.error("unknown providers: " + ", ".join(unknown))
+
+    results: dict[str, Any] = {"micro": bench_micro(args.number)}
+    if not args.skip_e2e:
+        results["e2e"] = bench_e2e(providers, args.domains, args.latency, args.repeat)
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "domains": args.domains,
+            "providers": providers,
+            "latency_ms": args.latency,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(output, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        base = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print("\n".join(compare(base, output)), file=sys.stderr)
+    return 1 if results.get("e2e", {}).get("failures") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""Smoke tests for the benchmark harness and its stand-in provider APIs."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import bench  # noqa: E402
+
+
+class StandInTests(unittest.TestCase):
+    def test_every_stand_in_creates_updates_and_caches(self) -> None:
+        results = bench.bench_e2e(list(bench.PROVIDERS), domains=2, latency_ms=0, repeat=1)
+
+        self.assertEqual(results["failures"], 0)
+        self.assertEqual(results["records"], 2 * len(bench.PROVIDERS))
+        self.assertGreater(results["cold"]["api_calls"], 0)
+        self.assertGreater(results["update"]["api_calls"], 0)
+        self.assertEqual(results["cache_hit"]["api_calls"], 0)
+
+
+class CompareTests(unittest.TestCase):
+    def test_compare_reports_relative_change_of_shared_metrics(self) -> None:
+        base = {"results": {"micro": {"encode_params": {"usec_per_call": 10.0}}, "e2e": {"cold": {"median": 2.0}}}}
+        head = {"results": {"micro": {"encode_params": {"usec_per_call": 12.0}}}}
+
+        lines = bench.compare(base, head)
+
+        self.assertEqual(len(lines), 2)
+        self.assertIn("micro.encode_params.usec_per_call", lines[1])
+        self.assertTrue(lines[1].endswith("+20.0%"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Regenerate the embedded Public Suffix List index in ddns/provider/_psl.py.
+
+Only ICANN rules spanning more than one label (plus wildcard and exception
+rules) are kept: a single-label suffix is already the default for the zone
+probing loop. Rules are grouped by top-level domain and IDN labels are stored
+in punycode so the module stays ASCII.
+
+Usage:
+    python3 tools/update_psl.py [public_suffix_list.dat | URL]
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from urllib.request import urlopen
+
+PSL_URL = "https://publicsuffix.org/list/public_suffix_list.dat"
+TARGET = Path(__file__).resolve().parents[1] / "ddns" / "provider" / "_psl.py"
+LINE_LIMIT = 118
+
+
+def read_source(source: str) -> str:
+    if re.match(r"^https?://", source):
+        with urlopen(source) as response:
+            return response.read().decode("utf-8")
+    return Path(source).read_text(encoding="utf-8")
+
+
+def to_ascii(rule: str) -> str:
+    prefix = "!" if rule.startswith("!") else ""
+    labels = rule.lstrip("!").split(".")
+    return prefix + ".".join(label if label == "*" else label.encode("idna").decode("ascii") for label in labels)
+
+
+def icann_rules(text: str) -> list[str]:
+    rules, icann = [], False
+    for line in text.splitlines():
+        line = line.strip()
+        if "===BEGIN ICANN DOMAINS===" in line:
+            icann = True
+        elif "===END ICANN DOMAINS===" in line:
+            icann = False
+        elif icann and line and not line.startswith("//"):
+            rule = line.split()[0].lower()
+            if "." in rule or rule.startswith(("*", "!")):
+                rules.append(to_ascii(rule))
+    return rules
+
+
+def render(rules: list[str]) -> str:
+    groups = defaultdict(list)  # type: dict[str, list[str]]
+    for rule in rules:
+        head, _, tld = rule.rpartition(".")
+        groups[tld].append(head)
+    lines = []
+    for tld in sorted(groups):
+        line = tld
+        for head in sorted(set(groups[tld])):
+            if len(line) + len(head) + 1 > LINE_LIMIT:
+                lines.append(line)
+                line = tld
+            line += " " + head
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> int:
+    source = argv[1] if len(argv) > 1 else PSL_URL
+    data = render(icann_rules(read_source(source)))
+    module = TARGET.read_text(encoding="utf-8")
+    start = module.index('_RULES = """\\\n') + len('_RULES = """\\\n')
+    end = module.index('"""', start)
+    TARGET.write_text(module[:start] + data + "\n" + module[end:], encoding="utf-8")
+    print("Updated {} with {} rules".format(TARGET, data.count(" ")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
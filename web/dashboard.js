@@ -55,6 +55,8 @@
     window.history.replaceState(null, "", fragmentForView(initialView, token));
   }
   var app = document.getElementById("app");
+  var RECORD_PAGE = 200;
+  var RECORD_OVERSCAN = 10;
   var state = {
     dashboard: null,
     configModel: null,
@@ -72,6 +74,7 @@
     saving: false,
     activityFilter: "all",
     recordQuery: "",
+    recordView: { key: "", items: [], total: 0, nextCursor: null, loading: false, remote: false, rowHeight: 68 },
     toastTimer: null,
     toastExitTimer: null,
     restoreTimer: null,
@@ -81,6 +84,10 @@
     setupOpened: false,
     sectionFingerprints: null,
     dashboardRefreshTimer: null,
+    eventSource: null,
+    eventStreamPending: false,
+    lastEventId: "",
+    syncWaiters: {},
     schedulerIntervalDirty: false,
   };
 
@@ -586,14 +593,25 @@
     providers.forEach(function (provider) {
       var failed = provider.status === "error";
       var synced = provider.status === "synced";
+      var backoff = provider.backoff || [];
+      var subtitle = provider.records + " 条已配置记录";
+      if (backoff.length) {
+        var nextRetry = Math.min.apply(
+          null,
+          backoff.map(function (item) {
+            return Number(item.retry_at || 0);
+          }),
+        );
+        subtitle += " · " + backoff.length + " 条连续失败，" + formatTime(nextRetry) + " 后重试";
+      }
       list.appendChild(
         makeSettingsRow({
           badge: String(provider.label || provider.id).slice(0, 3).toUpperCase(),
           title: provider.label || provider.id,
-          subtitle: provider.records + " 条已配置记录",
+          subtitle: subtitle,
           value: provider.id,
-          status: failed ? "同步失败" : synced ? "已同步" : "已配置",
-          statusTone: failed ? "error" : synced ? "" : "attention",
+          status: failed ? "同步失败" : backoff.length ? "暂停重试" : synced ? "已同步" : "已配置",
+          statusTone: failed ? "error" : backoff.length || !synced ? "attention" : "",
         }),
       );
     });
@@ -626,35 +644,129 @@
     return row;
   }
 
+  function recordViewKey() {
+    var dashboard = state.dashboard || {};
+    return [state.recordQuery, dashboard.record_count, dashboard.last_sync || ""].join("|");
+  }
+
+  function recordsPath(cursor) {
+    var path = "/api/records?limit=" + RECORD_PAGE + "&q=" + encodeURIComponent(state.recordQuery);
+    return cursor ? path + "&cursor=" + encodeURIComponent(cursor) : path;
+  }
+
+  function loadRecordPage(reset) {
+    var view = state.recordView;
+    var key = view.key;
+    view.loading = true;
+    return api(recordsPath(reset ? null : view.nextCursor))
+      .then(function (page) {
+        if (view.key !== key) {
+          return;
+        }
+        view.items = reset ? page.records : view.items.concat(page.records);
+        view.total = page.total;
+        view.nextCursor = page.next_cursor;
+        view.loading = false;
+        renderRecordWindow();
+      })
+      .catch(function (error) {
+        view.loading = false;
+        showToast(errorMessage(error), "error");
+      });
+  }
+
   function renderRecords() {
-    var list = byId("record-list");
-    var records = (state.dashboard && state.dashboard.records) || [];
+    var dashboard = state.dashboard || {};
+    var records = dashboard.records || [];
+    var recordCount = Number(dashboard.record_count || records.length);
     var search = byId("record-search");
-    var searchable = records.length > 5;
+    var searchable = recordCount > 5;
+    var view = state.recordView;
     byId("record-search-field").hidden = !searchable;
     if (!searchable) {
       state.recordQuery = "";
       search.value = "";
     }
-    var query = state.recordQuery.toLowerCase();
-    var filtered = records.filter(function (record) {
-      return !query || (record.domain + " " + record.value + " " + record.provider).toLowerCase().indexOf(query) >= 0;
-    });
+    setText("record-count", recordCount + " 条");
+
+    // 控制台只携带前几百条记录，更多记录时改由服务端分页、筛选
+    view.remote = recordCount > records.length;
+    if (!view.remote) {
+      var query = state.recordQuery.toLowerCase();
+      view.key = "";
+      view.items = records.filter(function (record) {
+        return !query || (record.domain + " " + record.value + " " + record.provider).toLowerCase().indexOf(query) >= 0;
+      });
+      view.total = view.items.length;
+      view.nextCursor = null;
+      renderRecordWindow();
+      return;
+    }
+    var key = recordViewKey();
+    if (view.key !== key) {
+      view.key = key;
+      view.items = [];
+      view.total = 0;
+      view.nextCursor = null;
+      byId("record-list").scrollTop = 0;
+      loadRecordPage(true);
+    }
+    renderRecordWindow();
+  }
+
+  function renderRecordWindow() {
+    var list = byId("record-list");
+    var view = state.recordView;
+    var items = view.items;
     clear(list);
-    setText("record-count", records.length + " 条");
 
-    if (!filtered.length) {
+    if (!items.length) {
+      list.classList.remove("virtual");
       var empty = make("div", "native-empty");
-      empty.appendChild(make("strong", "", query ? "没有匹配的解析记录" : "暂无解析记录"));
-      empty.appendChild(
-        make("span", "", query ? "尝试更短的域名或地址关键词" : "完成一次同步后会显示本机缓存结果"),
-      );
+      if (view.loading) {
+        empty.appendChild(make("strong", "", "正在加载解析记录"));
+        empty.appendChild(make("span", "", "记录较多，将分页显示"));
+      } else {
+        empty.appendChild(make("strong", "", state.recordQuery ? "没有匹配的解析记录" : "暂无解析记录"));
+        empty.appendChild(
+          make("span", "", state.recordQuery ? "尝试更短的域名或地址关键词" : "完成一次同步后会显示本机缓存结果"),
+        );
+      }
       list.appendChild(empty);
       return;
     }
-    filtered.forEach(function (record) {
+
+    var virtual = items.length > RECORD_PAGE || Boolean(view.nextCursor);
+    list.classList.toggle("virtual", virtual);
+    if (!virtual) {
+      items.forEach(function (record) {
+        list.appendChild(makeRecordRow(record));
+      });
+      return;
+    }
+
+    // 只渲染可视区域附近的行，上下用占位块撑开滚动高度
+    var rowHeight = view.rowHeight;
+    var first = Math.max(0, Math.floor(list.scrollTop / rowHeight) - RECORD_OVERSCAN);
+    var visible = Math.ceil((list.clientHeight || rowHeight * 10) / rowHeight) + RECORD_OVERSCAN * 2;
+    var last = Math.min(items.length, first + visible);
+    var top = make("div", "record-spacer");
+    var bottom = make("div", "record-spacer");
+    top.style.height = first * rowHeight + "px";
+    bottom.style.height = (Math.max(view.total, items.length) - last) * rowHeight + "px";
+    list.appendChild(top);
+    items.slice(first, last).forEach(function (record) {
       list.appendChild(makeRecordRow(record));
     });
+    list.appendChild(bottom);
+
+    var row = list.querySelector(".record-row");
+    if (row && row.offsetHeight && row.offsetHeight !== rowHeight) {
+      view.rowHeight = row.offsetHeight;
+    }
+    if (view.remote && view.nextCursor && !view.loading && last + RECORD_OVERSCAN >= items.length) {
+      loadRecordPage(false);
+    }
   }
 
   function isAttentionActivity(activity) {
@@ -1218,9 +1330,15 @@
     if (document.hidden || state.saving || app.classList.contains("busy")) {
       return Promise.resolve();
     }
-    return api("/api/dashboard")
+    var current = state.dashboard;
+    var path = current && current.version ? "/api/dashboard?since=" + current.version : "/api/dashboard";
+    return api(path)
       .then(function (dashboard) {
-        state.dashboard = dashboard;
+        // 增量响应只包含变化的字段，合并时需确认基准仍是发起请求时的状态
+        if (dashboard.delta && state.dashboard !== current) {
+          return;
+        }
+        state.dashboard = dashboard.delta ? mergeDashboard(current, dashboard) : dashboard;
         renderDashboard();
       })
       .catch(function (error) {
@@ -1231,13 +1349,178 @@
       });
   }
 
+  function applyLiveUpdate(update) {
+    if (!state.dashboard) {
+      return;
+    }
+    update(state.dashboard);
+    if (!state.saving && !app.classList.contains("busy")) {
+      renderDashboard();
+    }
+  }
+
+  function compareRecords(left, right) {
+    var leftKey = [left.domain, left.type, left.provider].join("\u0000");
+    var rightKey = [right.domain, right.type, right.provider].join("\u0000");
+    return leftKey < rightKey ? -1 : leftKey > rightKey ? 1 : 0;
+  }
+
+  function mergeDashboard(dashboard, delta) {
+    var merged = clone(dashboard);
+    var replaced = {};
+    Object.keys(delta).forEach(function (key) {
+      if (["delta", "since", "scheduler", "records", "removed_records"].indexOf(key) < 0) {
+        merged[key] = delta[key];
+      }
+    });
+    Object.keys(delta.scheduler).forEach(function (name) {
+      if (delta.scheduler[name] === null) {
+        delete merged.scheduler[name];
+      } else {
+        merged.scheduler[name] = delta.scheduler[name];
+      }
+    });
+    delta.removed_records.concat(delta.records).forEach(function (record) {
+      replaced[record.provider + ":" + record.domain + ":" + record.type] = true;
+    });
+    merged.records = (merged.records || [])
+      .filter(function (record) {
+        return !replaced[record.provider + ":" + record.domain + ":" + record.type];
+      })
+      .concat(delta.records)
+      .sort(compareRecords)
+      .slice(0, RECORD_PAGE);
+    return merged;
+  }
+
+  function mergeRecords(dashboard, update) {
+    var records = dashboard.records || [];
+    var updated = {};
+    update.records.forEach(function (record) {
+      updated[record.domain + ":" + record.type] = record;
+    });
+    function current(record) {
+      return record.provider === update.provider ? updated[record.domain + ":" + record.type] : null;
+    }
+    if (Number(dashboard.record_count || records.length) > records.length) {
+      // 本地只有服务端分页的首屏窗口，仅更新已有条目，总数与其余记录由分页查询获取
+      dashboard.records = records.map(function (record) {
+        return current(record) || record;
+      });
+      return;
+    }
+    var merged = records
+      .filter(function (record) {
+        return !current(record);
+      })
+      .concat(update.records)
+      .sort(compareRecords);
+    // 事件最多携带一页记录，被截断的部分计入总数以切换为服务端分页
+    var truncated = Number(update.record_count || update.records.length) - update.records.length;
+    dashboard.record_count = merged.length + truncated;
+    dashboard.records = merged.slice(0, RECORD_PAGE);
+  }
+
+  function listen(source, name, handler) {
+    source.addEventListener(name, function (event) {
+      var data;
+      if (event.lastEventId) {
+        state.lastEventId = event.lastEventId;
+      }
+      try {
+        data = JSON.parse(event.data);
+      } catch (parseError) {
+        return;
+      }
+      handler(data);
+    });
+  }
+
+  function pollDashboard() {
+    state.eventSource = null;
+    if (!state.dashboardRefreshTimer) {
+      state.dashboardRefreshTimer = setInterval(refreshDashboard, 15000);
+    }
+  }
+
+  function startEventStream() {
+    // EventSource 无法设置请求头，先用访问令牌换取一次性票据，令牌不会出现在 URL 与访问日志中
+    state.eventStreamPending = true;
+    api("/api/events/ticket", { method: "POST" })
+      .then(function (result) {
+        openEventStream(result.ticket);
+      }, pollDashboard)
+      .then(function () {
+        state.eventStreamPending = false;
+      });
+  }
+
+  function openEventStream(ticket) {
+    var url = "/api/events?ticket=" + encodeURIComponent(ticket);
+    if (state.lastEventId) {
+      url += "&last_event_id=" + encodeURIComponent(state.lastEventId);
+    }
+    var source = new window.EventSource(url);
+    var opened = false;
+    state.eventSource = source;
+    source.addEventListener("open", function () {
+      opened = true;
+    });
+    listen(source, "activity", function (activity) {
+      applyLiveUpdate(function (dashboard) {
+        dashboard.activities = [activity].concat(dashboard.activities || []).slice(0, 50);
+      });
+    });
+    listen(source, "scheduler", function (scheduler) {
+      applyLiveUpdate(function (dashboard) {
+        dashboard.scheduler = scheduler;
+      });
+    });
+    listen(source, "records", function (update) {
+      applyLiveUpdate(function (dashboard) {
+        mergeRecords(dashboard, update);
+        // 分页模式下本地只有部分记录，丢弃已加载的页并重新向服务端查询
+        state.recordView.key = "";
+      });
+    });
+    listen(source, "sync", function (job) {
+      var waiter = state.syncWaiters[job.id];
+      if (waiter) {
+        waiter(job);
+      } else if (job.status === "succeeded" || job.status === "failed") {
+        refreshDashboard();
+      }
+    });
+    listen(source, "reset", function () {
+      refreshDashboard();
+    });
+    source.addEventListener("error", function () {
+      if (state.eventSource !== source) {
+        return;
+      }
+      // 票据只能使用一次，浏览器自动重连会被拒绝；已建立的连接断开后换取新票据并从上次事件继续
+      source.close();
+      state.eventSource = null;
+      if (opened) {
+        setTimeout(startEventStream, 3000);
+      } else {
+        // 服务端拒绝事件流（如工作线程繁忙）时改为定时刷新
+        pollDashboard();
+      }
+    });
+  }
+
   function startDashboardRefresh() {
-    if (state.dashboardRefreshTimer) {
+    if (state.dashboardRefreshTimer || state.eventSource || state.eventStreamPending) {
       return;
     }
-    state.dashboardRefreshTimer = setInterval(refreshDashboard, 15000);
+    if (window.EventSource) {
+      startEventStream();
+    } else {
+      state.dashboardRefreshTimer = setInterval(refreshDashboard, 15000);
+    }
     document.addEventListener("visibilitychange", function () {
-      if (!document.hidden) {
+      if (!document.hidden && !state.eventSource) {
         refreshDashboard();
       }
     });
@@ -1516,6 +1799,53 @@
     markDirty();
   }
 
+  function syncProgress(job) {
+    var providers = job.providers || [];
+    var finished = providers.filter(function (provider) {
+      return provider.status === "succeeded" || provider.status === "failed";
+    }).length;
+    return "已完成 " + finished + "/" + providers.length + " 个服务商。";
+  }
+
+  function waitForSyncJob(job) {
+    if (job.status === "succeeded") {
+      return Promise.resolve(job);
+    }
+    if (job.status === "failed") {
+      var jobError = new Error(job.error || "同步失败，请查看最近活动。");
+      jobError.code = "operation_failed";
+      return Promise.reject(jobError);
+    }
+    setText("status-summary", "正在同步解析记录，" + syncProgress(job));
+    return nextSyncJob(job).then(waitForSyncJob);
+  }
+
+  function nextSyncJob(job) {
+    var streaming = state.eventSource && state.eventSource.readyState === 1;
+    return new Promise(function (resolve) {
+      // 事件流推送进度；未连接时退回短轮询，连接时仅作兜底
+      var timer = setTimeout(
+        function () {
+          delete state.syncWaiters[job.id];
+          resolve(null);
+        },
+        streaming ? 5000 : 500,
+      );
+      state.syncWaiters[job.id] = function (update) {
+        clearTimeout(timer);
+        delete state.syncWaiters[job.id];
+        resolve(update);
+      };
+    }).then(function (update) {
+      return (
+        update ||
+        api("/api/sync/" + encodeURIComponent(job.id)).then(function (payload) {
+          return payload.job;
+        })
+      );
+    });
+  }
+
   function runSync() {
     if (isFirstRun()) {
       setView("config", true);
@@ -1547,14 +1877,21 @@
     hero.classList.add("syncing");
     hero.setAttribute("aria-busy", "true");
     setBusy(true);
-    var syncResult = api("/api/sync", { method: "POST", body: {} }).then(
-      function (dashboard) {
-        return { dashboard: dashboard };
-      },
-      function (error) {
-        return { error: error };
-      },
-    );
+    var syncResult = api("/api/sync", { method: "POST", body: {} })
+      .then(function (payload) {
+        return waitForSyncJob(payload.job);
+      })
+      .then(function () {
+        return api("/api/dashboard");
+      })
+      .then(
+        function (dashboard) {
+          return { dashboard: dashboard };
+        },
+        function (error) {
+          return { error: error };
+        },
+      );
     Promise.all([
       syncResult,
       new Promise(function (resolve) {
@@ -1882,6 +2219,15 @@
       state.recordQuery = event.target.value.trim();
       renderRecords();
     });
+    var recordFrame = null;
+    byId("record-list").addEventListener("scroll", function () {
+      if (recordFrame === null && byId("record-list").classList.contains("virtual")) {
+        recordFrame = window.requestAnimationFrame(function () {
+          recordFrame = null;
+          renderRecordWindow();
+        });
+      }
+    });
     document.querySelectorAll("[data-activity-filter]").forEach(function (button) {
       button.addEventListener("click", function () {
         state.activityFilter = button.getAttribute("data-activity-filter");